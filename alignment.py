@@ -0,0 +1,378 @@
+'''
+Sentence alignment of parallel statements, and in-process streaming of aligned segments.
+
+Function align_statement(lines_sl, lines_tl) turns the lines of a statement in source and target language (see function
+read_statements() of module statement_list) into aligned lists of sentences, using the Gale-Church algorithm. It is used by
+extract.py to write TAB and TMX files, and by function iter_parallel_segments(), which yields aligned segment pairs directly
+from the EuroParl source files, without writing any output files:
+
+Usage:
+
+  from alignment import iter_parallel_segments
+  for statement_id, metadata, sl_sentence, tl_sentence in iter_parallel_segments('txt/', 'DE', 'EN', 'out/europarl_statements.csv'):
+    ...
+
+Function align_statement_batch() aligns many statements (e.g. all statements of a session) at once, which allows the batch engine
+of the Gale-Church algorithm to align all of their paragraphs together.
+
+Function merge_alignments() combines the alignments of a statement with several target languages into N-way aligned rows.
+
+The statement source can be the path of a statement list in any format written by extract.py, a StatementStore,
+a statement list data frame, or a dictionary of session identifiers and speaker IDs.
+
+'''
+
+import os
+import re
+from gale_church import gale_church_alignments, MAX_COST_ERROR
+from statement_list import StatementStore, SpeakerTurnIndex, read_statements, assemble_statement, select_from_statement_list, load_statement_list, detect_statement_list_format, langcode, langcode_exception
+from tag_scanner import is_xml_line
+
+
+
+def clean_line(txt, clean_output):
+  """ Remove XML metadata tag and/or additional language tag from current txt.
+    
+  Arguments:
+    txt (str) -- Text to be cleaned.
+    clean_output (str) -- What to remove: 'lang' (additional language tags), 'speaker' (XML metadata tags) or 'both';
+      any other value only normalises whitespace.
+
+  Returns:
+    txt(str) -- The cleaned text.
+  """
+  if clean_output == "lang" or clean_output == "both":
+    if langcode.search(txt) and not langcode_exception.search(txt):
+      txt = re.sub(langcode, '', txt)
+  if clean_output == "speaker" or clean_output == "both":
+    if is_xml_line(txt):
+      txt = ""
+  txt = re.sub('\s{2,}', ' ', txt)    
+  return(txt.strip())
+##### END OF FUNCTION DECLARATION
+
+
+def postprocess_alignments(sl_sents, tl_sents):
+  """ Merge adjacent sentences at beginning/end of paragraph if corresponding aligned counterpart is empty.
+  The two input lists must be equal in length and have paragraph marks (<P>) in exactly the same positions.
+    
+  Arguments:
+    sl_sents (list) -- Source language sentences, including, paragraph markers.
+    tl_sents (list) -- Source language sentences, including, paragraph markers.
+
+  Returns:
+    sl_sents (list) -- Postprecessed list of source language sentences, including paragraph markers.
+    tl_sents (list) -- Postprecessed list of target language sentences, including paragraph markers.
+
+  """
+  # Iterate over list of source language sentences using while; for each SL sentence check if corresponding TL sentence
+  # at same position is empty. If either SL or corresponding TL sentence at given position is empty AND the SL-TL sentence pair is at paragraph BEGINNING (i.e. if previous list item == "<P>")
+  # then concatenate current sentence with next sentence in both SL and TL as well as remove the next sentence from the list. Subsequently, go back two positions in list and continue iteration.
+  # Example:
+  # SL = ['<P>', 'a', 'b', 'c', 'd', '<P>'] => becomes    ['<P>', 'a b c', 'd', <P>]
+  # TL = ['<P>', 'A B C', '', '', 'D', '<P>'] => becomes  ['<P>', 'A B C', 'd', <P>]
+  i = 0
+  while i < len(sl_sents)-1:
+    if (len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0) and prevIsParagraph == True:
+      sl_sents[i] = (sl_sents[i] + " " + sl_sents[i+1]).strip()
+      sl_sents.pop(i+1)
+      tl_sents[i] = (tl_sents[i] + " " + tl_sents[i+1]).strip()
+      tl_sents.pop(i+1)
+      i -= 1
+    if sl_sents[i] == "<P>":
+      lastparindex = i
+      prevIsParagraph = True
+    else:
+      prevIsParagraph = False
+    i += 1
+
+  # Now the same for sentences directly BEFORE paragraph ends:
+  # Iterate over list of source language sentences using while and for each SL sentence check if corresponding TL sentence
+  # at same position is empty. If either SL or corresponding TL sentence at given position is empty AND the SL-TL sentence pair is at paragraph END (i.e. if previous list item == "<P>")
+  # then concatenate previous sentence with current sentence in both SL and TL as well as remove the current sentence from the list. Subsequently, go back two positions in list and continue iteration over list.
+  # Example:
+  # SL = ['<P>', 'a', 'b', 'c', '<P>'] => becomes    ['<P>', 'a', 'b c', <P>]
+  # TL = ['<P>', 'A', 'B C', '', '<P>'] => becomes   ['<P>', 'A', 'B C', <P>]
+  i = 0
+  while i < len(sl_sents) - 1:
+    if sl_sents[i+1] == "<P>":
+      nextIsParagraph = True
+    else:
+      nextIsParagraph = False
+    if (len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0) and nextIsParagraph == True:
+      sl_sents[i-1] = (sl_sents[i-1] + " " + sl_sents[i]).strip()
+      sl_sents.pop(i)
+      tl_sents[i-1] = (tl_sents[i-1] + " " + tl_sents[i]).strip()
+      tl_sents.pop(i)
+      i -= 2
+    i += 1
+  return sl_sents, tl_sents
+##### END OF FUNCTION DECLARATION
+
+
+
+def remove_unevenly_long_segments(sl_sents, tl_sents):
+  """Remove entire segment between two <P> markers if segment length difference across SL/TL above certain threshold,
+  i.e. if either the SL or TL segment consists of much more sentences than its counterpart in the other language.  
+  
+  Arguments:
+    sl_sents (dict) -- Source language sentences, represented as strings.
+      Keys: names of output file
+      Values: List of the sentences
+    tl_sents (dict) -- Target language sentences, represented as strings.
+      Keys: names of output file
+      Values: List of the sentences
+
+  Returns:
+    sl_sents (dict) -- SL sentences, with unevenly long segments removed.
+    tl_sents (dict) -- TL sentences, with unevenly long segments removed.
+
+  """
+  p_positions_sl = [i for i, n in enumerate(sl_sents) if n == "<P>"] # Determine index positions of <P> markers
+  p_positions_tl = [i for i, n in enumerate(tl_sents) if n == "<P>"] # Determine index positions of <P> markers
+
+  for i in reversed(range(len(p_positions_sl)-1)): # Iterate by index over reversed list of <P> indices, i.e. from last segment to 1st    
+    segmentStart_sl = p_positions_sl[i] # Determine start index of given SL segment
+    segmentEnd_sl = p_positions_sl[i+1] # Determine end index of given SL segment
+
+    segmentStart_tl = p_positions_tl[i] # Determine start index of given TL segment
+    segmentEnd_tl = p_positions_tl[i+1] # Determine end index of given TL segment
+
+    segmentLength_sl = abs(segmentStart_sl - segmentEnd_sl) - 1 # Get SL segment length (nr. of sentences) from start/end positions of segment
+    segmentLength_tl = abs(segmentStart_tl - segmentEnd_tl) - 1 # Get TL segment length (nr. of sentences) from start/end positions of segment
+
+    lengthRatio_sl_tl = max(segmentLength_sl, segmentLength_tl) / min(segmentLength_sl, segmentLength_tl) # Calculate ratio of length of SL segment to length of TL segment irrespective of which segment is longer
+
+    if lengthRatio_sl_tl > 2: # If SL segment has at least 3x more sentences than TL segment, or vice versa:
+      del sl_sents[segmentStart_sl : segmentEnd_sl] # Delete entire segment from list of SL segments
+      del tl_sents[segmentStart_tl : segmentEnd_tl] # Delete entire segment from list of TL segments
+
+  if len(sl_sents) == 1 and sl_sents[0] == "<P>": # If SL segment has no sentences, i.e. only one <P> mark:
+    sl_sents.append("<P>") # Append final <P> mark
+  if len(tl_sents) == 1 and tl_sents[0] == "<P>": # If TL segment has no sentences, i.e. only one <P> mark:
+      tl_sents.append("<P>") # Append final <P> mark
+
+  return sl_sents, tl_sents
+##### END OF FUNCTION DECLARATION
+
+
+def align_statement(lines_sl, lines_tl, clean_output=False, engine='python', band=None, statistics=None, max_cost_error=MAX_COST_ERROR):
+  """ Align the sentences of a statement in source and target language.
+
+  Arguments:
+    lines_sl (list) -- Lines of SL statement, starting with its speaker tag (see function read_statements() of module statement_list).
+    lines_tl (list) -- Lines of TL statement, starting with its speaker tag.
+    clean_output (str) -- Optional cleaning of aligned sentences (see function clean_line()).
+    engine (str) -- Engine of the Gale-Church algorithm, one of ENGINES of module gale_church (all yield the same alignments
+      if max_cost_error is None; see function gale_church_alignment()).
+    band (int) -- Optional width of the band to which the Gale-Church search is restricted (see function gale_church_alignment()).
+    statistics (:obj: 'BandStatistics') -- Optional counts of widenings of the band, updated in place.
+    max_cost_error (float) -- Bound of the error of tabulated length costs, or None for exact length costs (see function gale_church_alignment()).
+
+  Returns:
+    alignment (tuple) -- 3-tuple (metadata, sl_sents, tl_sents) of the SL speaker tag and the aligned SL and TL sentences,
+      equal in length and including paragraph marks <P> between segments; or None if the statement cannot be aligned
+      (e.g. if the numbers of paragraphs differ across SL and TL).
+
+  """
+  return align_statement_batch([(lines_sl, lines_tl)], clean_output, engine, band, statistics, max_cost_error)[0]
+##### END OF FUNCTION DECLARATION
+
+
+
+def prepare_statement(lines_sl, lines_tl):
+  """ Assemble the SL and TL sentences of a statement for alignment (see function align_statement()).
+
+  Arguments:
+    lines_sl (list) -- Lines of SL statement, starting with its speaker tag.
+    lines_tl (list) -- Lines of TL statement, starting with its speaker tag.
+
+  Returns:
+    statement (tuple) -- 3-tuple (metadata, sentences_sl, sentences_tl) of the SL speaker tag and the SL and TL sentences enclosed in
+      paragraph marks <P>; or None if the statement cannot be aligned.
+
+  """
+  # Retrieve metadata about speaker turn and sentences of statement, enclosed in paragraph marks <P>
+  metadata, sentences_sl, paragraphs_sl = assemble_statement(lines_sl)
+  _, sentences_tl, paragraphs_tl = assemble_statement(lines_tl)
+      
+  # Do not align statement if number of paragraphs in speaker turn differs across SL and TL
+  if paragraphs_sl != paragraphs_tl:
+    return None
+    
+  sentences_sl, sentences_tl = remove_unevenly_long_segments(sentences_sl, sentences_tl)
+    
+  # Do not align statement if sentence list consists only of one beginning and one end paragraph mark (i.e. if length of sentene list < 3)
+  if len(sentences_sl) < 3:
+    return None
+  return metadata, sentences_sl, sentences_tl
+##### END OF FUNCTION DECLARATION
+
+
+
+def align_statement_batch(statements, clean_output=False, engine='python', band=None, statistics=None, max_cost_error=MAX_COST_ERROR):
+  """ Align the sentences of many statements in source and target language, e.g. of all statements of a session.
+
+  The statements are aligned together by function gale_church_alignments() of module gale_church, i.e. the batch engine aligns
+  all of their paragraphs at once (and the auto engine does so where this pays off).
+
+  Arguments:
+    statements (list) -- 2-tuples (lines_sl, lines_tl) of the lines of SL and TL statements (see function align_statement()).
+    Further arguments as of function align_statement().
+
+  Returns:
+    alignments (list) -- One 3-tuple (metadata, sl_sents, tl_sents) or None per statement (see function align_statement()).
+
+  """
+  prepared = [prepare_statement(lines_sl, lines_tl) for lines_sl, lines_tl in statements]
+  # Run Gale-Church alignment algorithm to align SL sentences with TL sentences
+  sentences = [(sentences_sl, sentences_tl) for metadata, sentences_sl, sentences_tl in filter(None, prepared)]
+  aligned = iter(gale_church_alignments(sentences, engine=engine, band=band, statistics=statistics, max_cost_error=max_cost_error))
+
+  alignments = []
+  for statement in prepared:
+    if statement is None:
+      alignments.append(None)
+      continue
+    sl_sents, tl_sents = next(aligned)
+    # Merge adjacent empty alignments at segment beginning/end to avoid zero-alignments
+    sl_sents, tl_sents = postprocess_alignments(sl_sents, tl_sents)
+    
+    sl_sents = sl_sents[1:-1] # Remove first and last element, i.e. <P> marks
+    tl_sents = tl_sents[1:-1] # Remove first and last element, i.e. <P> marks
+    
+    if clean_output:
+      for i in range(len(sl_sents)):
+        sl_sents[i] = clean_line(sl_sents[i], clean_output)
+        tl_sents[i] = clean_line(tl_sents[i], clean_output)
+    alignments.append((statement[0], sl_sents, tl_sents))
+  return alignments
+##### END OF FUNCTION DECLARATION
+
+
+
+def align_session(filename_in_sl, filename_in_tl, ids, clean_output=False, turn_index=None, cache=None, engine='python'):
+  """ Align the statements ids of a session, read from the EuroParl source files in source and target language.
+
+  Arguments:
+    filename_in_sl (str) -- Name of EuroParl source language input file.
+    filename_in_tl (str) -- Name of EuroParl target language input file.
+    ids (list) -- Speaker IDs (e.g. 158) identifying the statements.
+    clean_output (str) -- Optional cleaning of aligned sentences (see function clean_line()).
+    turn_index (:obj: 'SpeakerTurnIndex') -- Optional index of byte offsets of speaker turns.
+    cache (:obj: 'StatementCache') -- Optional cache of statements read from source files.
+    engine (str) -- Engine of the Gale-Church algorithm (see function align_statement()).
+
+  Yields:
+    alignment (tuple) -- 4-tuple (speaker ID, metadata, sl_sents, tl_sents) per aligned statement (see function align_statement()).
+
+  """
+  if cache is not None:
+    statements_sl, statements_tl = cache.get(filename_in_sl, ids), cache.get(filename_in_tl, ids)
+  else:
+    statements_sl, statements_tl = read_statements(filename_in_sl, ids, turn_index), read_statements(filename_in_tl, ids, turn_index)
+  lines_sl = {statementID: lines for statementID, lines, end in statements_sl}
+  lines_tl = {statementID: lines for statementID, lines, end in statements_tl}
+  # Skip statement if it is missing in TL or SL/TL statement consists of speaker tag only
+  statementIDs = [statementID for statementID in lines_sl.keys()
+                  if statementID in lines_tl.keys() and len(lines_sl[statementID]) > 1 and len(lines_tl[statementID]) > 1]
+  alignments = align_statement_batch([(lines_sl[statementID], lines_tl[statementID]) for statementID in statementIDs], clean_output, engine)
+  for statementID, alignment in zip(statementIDs, alignments):
+    if alignment is not None:
+      yield (statementID,) + alignment
+##### END OF FUNCTION DECLARATION
+
+
+
+def merge_alignments(alignments):
+  """ Merge the alignments of a statement with its translations into several target languages into N-way aligned rows.
+
+  The source language serves as pivot: since each target language is aligned separately against the sentences of the
+  source language statement, segments of the source language may be split or merged differently across target languages.
+  Rows are therefore only built from source language segments that are aligned as the same segment with all target languages
+  (matched in order). Paragraph marks and zero alignments (i.e. empty segments) are skipped.
+
+  Arguments:
+    alignments (list) -- 2-tuples (sl_sents, tl_sents) returned by function align_statement(), one per target language.
+
+  Returns:
+    rows (list) -- Lists [sl_segment, tl_segment_1, ..., tl_segment_n], with target language segments in the order of alignments.
+
+  """
+  rows = None
+  for sl_sents, tl_sents in alignments:
+    pairs = [(sl_sentence, tl_sentence) for sl_sentence, tl_sentence in zip(sl_sents, tl_sents)
+             if sl_sentence != "<P>" and len(sl_sentence) > 0 and len(tl_sentence) > 0]
+    if rows is None:
+      rows = [[sl_sentence, tl_sentence] for sl_sentence, tl_sentence in pairs]
+      continue
+    merged = []
+    position = 0
+    for row in rows:
+      match = position
+      while match < len(pairs) and pairs[match][0] != row[0]:
+        match += 1
+      if match < len(pairs):
+        merged.append(row + [pairs[match][1]])
+        position = match + 1
+    rows = merged
+  return rows or []
+##### END OF FUNCTION DECLARATION
+
+
+
+def iter_parallel_segments(in_dir, sl, tl, statement_source, clean_output=False, session_filter=None, engine='auto'):
+  """ Align the statements originally uttered in sl with their translations into tl and yield the aligned segments lazily.
+
+  Source files are read and aligned one session at a time; no output files are written. The same segments are written to
+  TAB and TMX files by extract.py parallel (except for zero alignments and paragraph marks, which are skipped here).
+
+  Arguments:
+    in_dir (str) -- Folder of EuroParl source files, with one subfolder per language (e.g. txt/de/).
+    sl (str) -- Two-letter source language identifier.
+    tl (str) -- Two-letter target language identifier.
+    statement_source -- Statements to be aligned: path of a statement list (CSV, Parquet, Pickle or SQLite; byte offsets of speaker turns
+      are used if found next to it), StatementStore, statement list data frame, or dictionary of session identifiers (e.g. 11-04-06-009)
+      and lists of speaker IDs.
+    clean_output (str) -- Optional cleaning of aligned sentences (see function clean_line()).
+    session_filter (:obj: 'SessionFilter') -- Optional selection of sessions by date range and/or source files.
+    engine (str) -- Engine of the Gale-Church algorithm (see function align_statement()).
+
+  Yields:
+    segment (tuple) -- 4-tuple (statement_id, metadata, sl_sentence, tl_sentence), where statement_id consists of session identifier
+      and speaker ID (e.g. 11-04-06-009_158) and metadata is the speaker tag of the statement.
+
+  """
+  sl, tl = sl.upper(), tl.upper()
+  turn_index = None
+  if isinstance(statement_source, str):
+    turn_index_path = os.path.splitext(statement_source)[0] + '.offsets'
+    if os.path.exists(turn_index_path):
+      turn_index = SpeakerTurnIndex.load(turn_index_path)
+    if detect_statement_list_format(statement_source) == 'sqlite':
+      store = StatementStore(statement_source)
+      try:
+        statement_source = store.select(sl, session_filter)
+      finally:
+        store.close()
+    else:
+      statement_source = load_statement_list(statement_source, columns=['NAMES_MATCHING', 'SL'])
+  if isinstance(statement_source, StatementStore):
+    statements = statement_source.select(sl, session_filter)
+  elif isinstance(statement_source, dict):
+    statements = {identifier: ids for identifier, ids in statement_source.items() if not session_filter or identifier in session_filter}
+  else:
+    statements = select_from_statement_list(statement_source, sl, session_filter)
+
+  for identifier, ids in statements.items():
+    filename_in_sl = os.path.join(in_dir, sl.lower(), "ep-" + identifier + ".txt")
+    filename_in_tl = os.path.join(in_dir, tl.lower(), "ep-" + identifier + ".txt")
+    if not (os.path.exists(filename_in_sl) and os.path.exists(filename_in_tl)):
+      continue
+    for statementID, metadata, sl_sents, tl_sents in align_session(filename_in_sl, filename_in_tl, ids, clean_output, turn_index, engine=engine):
+      for sl_sentence, tl_sentence in zip(sl_sents, tl_sents):
+        # Skip paragraph marks and zero alignments (i.e. if aligned segment is empty in either SL or TL)
+        if sl_sentence == "<P>" or len(sl_sentence) == 0 or len(tl_sentence) == 0:
+          continue
+        yield (identifier + "_" + statementID, metadata, sl_sentence, tl_sentence)
+##### END OF FUNCTION DECLARATION
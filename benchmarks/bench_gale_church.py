@@ -0,0 +1,195 @@
+'''
+Benchmark of the engines filling the dynamic-programming table of the Gale-Church algorithm (module gale_church).
+
+For paragraph pairs of increasing numbers of sentences, the alignment is computed (a) by the reference engine, function _align(),
+which fills a dictionary cell by cell with exact length costs, (b) by the same engine with length costs looked up in a table
+(class LengthCostTable) and bead lengths taken from prefix sums, (c) by the vectorised engine, function _align_numpy(), which fills
+the table by anti-diagonals with numpy, and (d) by banded search with tabulated length costs, function _align_banded(), which only
+computes the cells within a band around the diagonal and widens the band where the best alignment touches its edge. Sentence lengths
+are drawn from EuroParl-like distributions, with translations deviating by up to 20% and occasionally split or merged. The vectorised
+engine is checked to yield the same alignments as the reference engine; for tabulated length costs and banded search, whether their
+alignments equal those of the reference engine (and the number of widenings of the band) is reported.
+
+The peak memory allocated per alignment (according to module tracemalloc) is reported for each engine, and for the dictionary of
+(cost, di, dj) tuples per cell that served as dynamic-programming table prior to the compact tables of function _dp_table().
+
+Finally, sessions of increasing numbers of mostly short paragraphs (as in EuroParl, where most paragraphs have 1-5 sentences) are
+aligned (a) one paragraph at a time with exact and with tabulated length costs, (b) by the batch engine, function align_batch(),
+which fills the tables of paragraphs of similar size together (for groups of tables with at least BATCH_MIN_CELLS cells, aligning the
+paragraphs of smaller groups one at a time with exact length costs), and (c) by the auto engine, which does the same with tabulated
+length costs for the smaller groups. Speed-ups are given relative to (a) with the same length costs. The batch engine is checked to
+yield the alignments of the reference engine.
+
+Usage:
+
+$ python3 benchmarks/bench_gale_church.py
+$ python3 benchmarks/bench_gale_church.py --sentences 10 100 500 --repeat 3 --band 3
+$ python3 benchmarks/bench_gale_church.py --sentences --paragraphs 100 1000 5000
+
+'''
+
+import os
+import sys
+import timeit
+import tracemalloc
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gale_church import _align, _align_numpy, _align_banded, align_batch, length_cost, length_cost_table, BandStatistics, BEAD_COSTS, MAX_COST_ERROR
+
+
+
+def generate_paragraph_pair(n_sentences, rnd):
+  """ Return sentence lengths (without spaces) of a source paragraph with n_sentences sentences and of its translation. """
+  x, y = [], []
+  for _ in range(n_sentences):
+    length = max(1, int(rnd.lognormvariate(4.6, 0.6)))
+    x.append(length)
+    translation = max(1, int(length * rnd.uniform(0.8, 1.2)))
+    if rnd.random() < 0.05 and translation > 1: # Sentence split in translation
+      y.extend([translation // 2, translation - translation // 2])
+    elif rnd.random() < 0.05 and y: # Sentence merged with previous one in translation
+      y[-1] += translation
+    else:
+      y.append(translation)
+  return x, y
+
+
+
+def generate_session(n_paragraphs, rnd):
+  """ Return sentence lengths of n_paragraphs paragraph pairs with 1 + geometrically distributed numbers of sentences (mean 3). """
+  paragraphs = []
+  for _ in range(n_paragraphs):
+    n = 1
+    while n < 40 and rnd.random() < 2 / 3.0:
+      n += 1
+    paragraphs.append(generate_paragraph_pair(n, rnd))
+  return paragraphs
+
+
+
+def align_dict(x, y):
+  """ Align as done by function _align() prior to compact tables, i.e. with a dictionary of (cost, di, dj) tuples per cell. """
+  m = {}
+  for i in range(len(x) + 1):
+    for j in range(len(y) + 1):
+      if i == j == 0:
+        m[0, 0] = (0, 0, 0)
+      else:
+        m[i, j] = min((m[i-di, j-dj][0] + length_cost(x[i-di:i], y[j-dj:j], 1.0, 6.8) + bead_cost, di, dj)
+                      for (di, dj), bead_cost in BEAD_COSTS.items() if i-di>=0 and j-dj>=0)
+  path = []
+  i, j = len(x), len(y)
+  while i > 0 or j > 0:
+    (c, di, dj) = m[i, j]
+    path.append(((i-di, i), (j-dj, j)))
+    i -= di
+    j -= dj
+  path.reverse()
+  return path
+
+
+
+def peak_memory(function):
+  """ Return peak memory (in bytes) allocated by calling function, according to module tracemalloc. """
+  tracemalloc.start()
+  try:
+    function()
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+
+
+def align_python(x, y):
+  return list(reversed(list(_align(x, y, 1.0, 6.8, BEAD_COSTS))))
+
+
+
+def align_tabulated(x, y, table):
+  return list(reversed(list(_align(x, y, 1.0, 6.8, BEAD_COSTS, None, table))))
+
+
+
+def align_numpy(x, y):
+  return _align_numpy(x, y, 1.0, 6.8, BEAD_COSTS)
+
+
+
+def align_banded(x, y, width, table, statistics=None):
+  return _align_banded(x, y, 1.0, 6.8, BEAD_COSTS, width, statistics, table)
+
+
+
+def benchmark(sentence_counts, repeat, seed, width, max_cost_error):
+  rnd = random.Random(seed)
+  table = length_cost_table(max_cost_error)
+  print("Length cost table: %d entries, error <= %g\n" %(len(table.values), max_cost_error))
+  print("%10s %10s %12s %12s %12s %12s %10s %12s %12s" %("sentences", "cells", "exact [ms]", "table [ms]", "numpy [ms]", "banded [ms]",
+                                                        "widenings", "table=exact", "banded=exact"))
+  memory = []
+  for n in sentence_counts:
+    x, y = generate_paragraph_pair(n, rnd)
+    path_python = align_python(x, y)
+    path_tabulated = align_tabulated(x, y, table)
+    path_numpy = align_numpy(x, y)
+    assert path_numpy is None or path_numpy == path_python, "Engines disagree"
+    statistics = BandStatistics()
+    path_banded = align_banded(x, y, width, table, statistics)
+    seconds_python = min(timeit.repeat(lambda: align_python(x, y), number=1, repeat=repeat))
+    seconds_tabulated = min(timeit.repeat(lambda: align_tabulated(x, y, table), number=1, repeat=repeat))
+    seconds_numpy = min(timeit.repeat(lambda: align_numpy(x, y), number=1, repeat=repeat))
+    seconds_banded = min(timeit.repeat(lambda: align_banded(x, y, width, table), number=1, repeat=repeat))
+    print("%10d %10d %12.2f %12.2f %12.2f %12.2f %10d %12s %12s%s" %(n, (len(x) + 1) * (len(y) + 1), seconds_python * 1000,
+                                                                   seconds_tabulated * 1000, seconds_numpy * 1000, seconds_banded * 1000,
+                                                                   statistics.widenings, "yes" if path_tabulated == path_python else "no",
+                                                                   "yes" if path_banded == path_python else "no",
+                                                                   "" if path_numpy is not None else " (numpy: fallback to python engine)"))
+    assert align_dict(x, y) == path_python, "Compact and dictionary tables disagree"
+    memory.append((n, [peak_memory(function) for function in (lambda: align_dict(x, y), lambda: align_python(x, y),
+                   lambda: align_tabulated(x, y, table), lambda: align_numpy(x, y), lambda: align_banded(x, y, width, table))]))
+
+  if memory:
+    print("\nPeak memory per alignment [KiB]\n")
+    print("%10s %12s %12s %12s %12s %12s" %("sentences", "dict", "exact", "table", "numpy", "banded"))
+    for n, peaks in memory:
+      print("%10d %12.1f %12.1f %12.1f %12.1f %12.1f" %tuple([n] + [peak / 1024.0 for peak in peaks]))
+
+
+
+def benchmark_batch(paragraph_counts, repeat, seed, max_cost_error):
+  rnd = random.Random(seed)
+  table = length_cost_table(max_cost_error)
+  print("\nSessions of short paragraphs: one paragraph at a time with exact or tabulated length costs, and by engines batch and auto\n")
+  print("%10s %12s %12s %12s %12s %12s %10s %10s" %("paragraphs", "sentences", "exact [ms]", "table [ms]", "batch [ms]", "auto [ms]",
+                                                   "batch", "auto"))
+  for n in paragraph_counts:
+    paragraphs = generate_session(n, rnd)
+    assert align_batch(paragraphs, 1.0, 6.8, BEAD_COSTS) == [align_python(x, y) for x, y in paragraphs], "Batch engine disagrees"
+    seconds_exact = min(timeit.repeat(lambda: [align_python(x, y) for x, y in paragraphs], number=1, repeat=repeat))
+    seconds_tabulated = min(timeit.repeat(lambda: [align_tabulated(x, y, table) for x, y in paragraphs], number=1, repeat=repeat))
+    seconds_batch = min(timeit.repeat(lambda: align_batch(paragraphs, 1.0, 6.8, BEAD_COSTS), number=1, repeat=repeat))
+    seconds_auto = min(timeit.repeat(lambda: align_batch(paragraphs, 1.0, 6.8, BEAD_COSTS, 'auto', max_cost_error), number=1, repeat=repeat))
+    # Speed-ups over aligning one paragraph at a time with the same length costs (exact for batch, tabulated for auto)
+    print("%10d %12d %12.2f %12.2f %12.2f %12.2f %9.2fx %9.2fx" %(n, sum(len(x) for x, y in paragraphs), seconds_exact * 1000,
+                                                              seconds_tabulated * 1000, seconds_batch * 1000, seconds_auto * 1000,
+                                                              seconds_exact / seconds_batch, seconds_tabulated / seconds_auto))
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Benchmark of the engines of the Gale-Church algorithm")
+  parser.add_argument("--sentences", type=int, nargs='*', default=[5, 20, 50, 100, 200, 400], help="Numbers of sentences per paragraph")
+  parser.add_argument("--paragraphs", type=int, nargs='*', default=[10, 100, 1000, 5000], help="Numbers of paragraphs per session")
+  parser.add_argument("--repeat", type=int, default=3, help="Number of repetitions (the fastest is reported)")
+  parser.add_argument("--seed", type=int, default=1, help="Seed of random sentence lengths")
+  parser.add_argument("--band", type=int, default=5, help="Initial width of the band of banded search")
+  parser.add_argument("--costError", type=float, default=MAX_COST_ERROR, help="Maximum error of tabulated length costs")
+  args = parser.parse_args()
+
+  if args.sentences:
+    benchmark(args.sentences, args.repeat, args.seed, args.band, args.costError)
+  if args.paragraphs:
+    benchmark_batch(args.paragraphs, args.repeat, args.seed, args.costError)
@@ -0,0 +1,82 @@
+'''
+Micro-benchmark of the matching of wanted speaker turns by the extraction functions.
+
+Each line of a session file is checked (a) with a regex pattern built from the alternation of all wanted speaker IDs,
+searched twice on matching lines as done previously by the extraction functions, and (b) by retrieving the speaker ID
+once with pattern speakerTurnPattern of module tag_scanner and looking it up in a frozenset of wanted IDs.
+Both approaches are checked to match the same speaker turns, for sessions with few and with many wanted IDs.
+
+Usage:
+
+$ python3 benchmarks/bench_speaker_matching.py txt/de/ep-09-10-22-009.txt
+$ python3 benchmarks/bench_speaker_matching.py --turns 800 # Synthetic session file
+
+'''
+
+import os
+import re
+import sys
+import timeit
+import random
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_corpus import generate_corpus
+from tag_scanner import speakerTurnPattern
+
+
+
+def match_regex(lines, ids):
+  speakerID_pattern = re.compile(r'<SPEAKER ID="?(' + '|'.join(ids) +')"? ')
+  matches = []
+  for line in lines:
+    if speakerID_pattern.search(line):
+      matches.append(speakerID_pattern.search(line).group(1))
+  return matches
+
+
+
+def match_set(lines, ids):
+  wanted_IDs = frozenset(ids)
+  search_speaker_turn = speakerTurnPattern.search
+  matches = []
+  for line in lines:
+    turnMatch = search_speaker_turn(line)
+    statementID = turnMatch.group(1) if turnMatch is not None else None
+    if statementID in wanted_IDs:
+      matches.append(statementID)
+  return matches
+
+
+
+def benchmark(path, id_counts, repeat):
+  with open(path, 'rt', encoding='utf-8', errors='ignore') as fl:
+    lines = [line.strip() for line in fl]
+  all_IDs = [turnMatch.group(1) for turnMatch in map(speakerTurnPattern.search, lines) if turnMatch is not None]
+  print("%s: %d lines, %d speaker turns" %(path, len(lines), len(all_IDs)))
+  print("%8s %12s %12s %10s" %("IDs", "regex [ms]", "set [ms]", "speed-up"))
+  rnd = random.Random(1)
+  for n in id_counts:
+    ids = rnd.sample(all_IDs, min(n, len(all_IDs)))
+    assert match_regex(lines, ids) == match_set(lines, ids), "Regex alternation and set lookup disagree"
+    seconds_regex = min(timeit.repeat(lambda: match_regex(lines, ids), number=1, repeat=repeat))
+    seconds_set = min(timeit.repeat(lambda: match_set(lines, ids), number=1, repeat=repeat))
+    print("%8d %12.3f %12.3f %9.1fx" %(len(ids), seconds_regex * 1000, seconds_set * 1000, seconds_regex / seconds_set))
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Micro-benchmark of speaker ID matching in the extraction functions")
+  parser.add_argument("sessionFile", nargs='?', help="EuroParl source file; if omitted, a synthetic session file is generated")
+  parser.add_argument("--ids", type=int, nargs='+', default=[1, 5, 50, 500], help="Numbers of wanted speaker IDs")
+  parser.add_argument("--turns", type=int, default=500, help="Number of speaker turns of synthetic session file")
+  parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions (the fastest is reported)")
+  args = parser.parse_args()
+
+  if args.sessionFile:
+    benchmark(args.sessionFile, args.ids, args.repeat)
+  else:
+    with tempfile.TemporaryDirectory() as tmp:
+      benchmark(generate_corpus(tmp, 1, languages=['en'], turns_per_session=args.turns)[0], args.ids, args.repeat)
@@ -0,0 +1,77 @@
+'''
+Benchmark of the startup time of extract.py.
+
+Two invocations are timed as separate processes: (a) extract.py --help and (b) the extraction of a single language pair with
+a pre-compiled statement list supplied via -s, which need not import pandas (or numpy and unidecode), since these packages are
+only imported on the code paths that generate, post-process or load statement lists as data frames.
+For each invocation, the fastest wall-clock time and whether pandas was imported (according to python -X importtime) are reported.
+
+Usage:
+
+$ python3 benchmarks/bench_startup.py
+$ python3 benchmarks/bench_startup.py --inputFolder txt/ --statementList corpora/europarl_statements.csv -sl DE -tl EN
+
+'''
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_corpus import generate_corpus
+
+EXTRACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'extract.py')
+
+
+
+def time_invocation(arguments, repeat):
+  """ Return fastest wall-clock time of running extract.py with arguments and whether pandas was imported. """
+  seconds = []
+  for _ in range(repeat):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, EXTRACT] + arguments, stdout=subprocess.DEVNULL, check=True)
+    seconds.append(time.perf_counter() - start)
+  imports = subprocess.run([sys.executable, '-X', 'importtime', EXTRACT] + arguments, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+  return min(seconds), any(line.rstrip().endswith('| pandas') for line in imports.splitlines())
+
+
+
+def benchmark(in_dir, statement_list, sl, tl, out_dir, repeat):
+  invocations = [("--help", ['--help']),
+                 ("-s %s>%s" %(sl, tl), ['parallel', '-sl', sl, '-tl', tl, '-i', in_dir, '-o', out_dir, '-f', 'tab', '-s', statement_list])]
+  print("%16s %12s %16s" %("", "[ms]", "pandas imported"))
+  for label, arguments in invocations:
+    seconds, pandas_imported = time_invocation(arguments, repeat)
+    print("%16s %12.1f %16s" %(label, seconds * 1000, "yes" if pandas_imported else "no"))
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Benchmark of the startup time of extract.py")
+  parser.add_argument("--inputFolder", help="Folder of EuroParl source files; if omitted, a synthetic corpus is generated")
+  parser.add_argument("--statementList", help="Statement list supplied via -s; if omitted, it is generated from the input folder")
+  parser.add_argument("-sl", default='DE', help="Source language of the extracted language pair")
+  parser.add_argument("-tl", default='EN', help="Target language of the extracted language pair")
+  parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions (the fastest is reported)")
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    in_dir = args.inputFolder
+    if in_dir is None:
+      in_dir = os.path.join(tmp, 'txt') + '/'
+      generate_corpus(in_dir, 20, languages=[args.sl.lower(), args.tl.lower()])
+    statement_list = args.statementList
+    if statement_list is None:
+      list_dir = os.path.join(tmp, 'list') + '/'
+      os.makedirs(list_dir)
+      subprocess.run([sys.executable, EXTRACT, 'parallel', '-sl', args.sl, '-tl', args.tl, '-i', in_dir, '-o', list_dir, '-f', 'tab'],
+                     stdout=subprocess.DEVNULL, check=True)
+      statement_list = list_dir + 'europarl_statements.csv'
+    out_dir = os.path.join(tmp, 'out') + '/'
+    os.makedirs(out_dir)
+    benchmark(in_dir, statement_list, args.sl, args.tl, out_dir, args.repeat)
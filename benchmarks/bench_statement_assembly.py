@@ -0,0 +1,109 @@
+'''
+Micro-benchmark of the assembly of statements for sentence alignment on long speeches.
+
+The sentence lists of the longest speaker turns of a session file are built (a) as done previously by function align_statements()
+of extract.py, i.e. by inserting each line before the closing paragraph mark (insert(-1)), searching the regex alternation of all
+wanted speaker IDs up to three times per line and removing adjacent paragraph marks with a zip-based list comprehension, and
+(b) with functions read_statements() and assemble_statement() of module statement_list, which build them in a single linear pass.
+Both approaches are checked to yield the same metadata, sentences and numbers of paragraph marks.
+
+Usage:
+
+$ python3 benchmarks/bench_statement_assembly.py txt/de/ep-09-10-22-009.txt --longest 5
+$ python3 benchmarks/bench_statement_assembly.py --paragraphs 300 # Synthetic session file with multi-thousand-sentence speeches
+
+'''
+
+import os
+import re
+import sys
+import timeit
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_corpus import generate_corpus
+from statement_list import read_statements, assemble_statement
+from tag_scanner import speakerTurnPattern
+
+
+# Regex pattern for XML metadata tags used prior to function is_metadata_tag() of module tag_scanner
+xmlTag = re.compile(r'^<[^P].*>$')
+
+
+
+def assemble_legacy(path, ids):
+  """ Build sentence lists as done by function align_statements() prior to linear statement assembly. """
+  speakerID_pattern = re.compile(r'<SPEAKER ID="?(' + '|'.join(ids) +')"? ')
+  sentences = {}
+  with open(path, 'rt', encoding='utf-8', errors='ignore') as fl_in:
+    prev_line = None
+    do_extraction = False
+    for line in fl_in:
+      if not prev_line == None:
+        current_line = prev_line.strip()
+        next_line = line.strip()
+        if speakerID_pattern.search(current_line):
+          statementID = speakerID_pattern.search(current_line).group(1)
+          sentences[statementID] = ['<P>', current_line, '<P>']
+          do_extraction = True
+        if do_extraction == True and not speakerID_pattern.search(current_line):
+          sentences[statementID].insert(-1, current_line)
+        if do_extraction == True and xmlTag.search(next_line):
+          do_extraction = False
+      prev_line = line.strip()
+    current_line = prev_line
+    if do_extraction == True:
+      sentences[statementID].insert(-1, current_line)
+  statements = {}
+  for statementID, sents in sentences.items():
+    metadata = sents.pop(1)
+    sents = [a for a,b in zip(sents, sents[1:]+[not sents[-1]]) if a != b or a != "<P>"]
+    statements[statementID] = (metadata, sents, sents.count("<P>"))
+  return statements
+
+
+
+def assemble_linear(path, ids):
+  """ Build sentence lists as done by function align_statements() with linear statement assembly. """
+  return {statementID: assemble_statement(lines) for statementID, lines, end in read_statements(path, ids)}
+
+
+
+def benchmark(path, longest, repeat):
+  all_IDs = []
+  with open(path, 'rt', encoding='utf-8', errors='ignore') as fl:
+    for line in fl:
+      turnMatch = speakerTurnPattern.search(line)
+      if turnMatch is not None:
+        all_IDs.append(turnMatch.group(1))
+  lengths = {statementID: len(lines) for statementID, lines, end in read_statements(path, all_IDs)}
+  ids = sorted(lengths, key=lengths.get, reverse=True)[:longest]
+  legacy, linear = assemble_legacy(path, ids), assemble_linear(path, ids)
+  assert legacy == linear, "Legacy and linear statement assembly disagree"
+  seconds_legacy = min(timeit.repeat(lambda: assemble_legacy(path, ids), number=1, repeat=repeat))
+  seconds_linear = min(timeit.repeat(lambda: assemble_linear(path, ids), number=1, repeat=repeat))
+  print("%s: %d speaker turns, %d longest with %s lines" %(path, len(all_IDs), len(ids), " ".join(str(lengths[i]) for i in ids)))
+  print("%12s %12s" %("", "[ms/file]"))
+  for label, seconds in (("legacy", seconds_legacy), ("linear", seconds_linear)):
+    print("%12s %12.3f" %(label, seconds * 1000))
+  print("Speed-up: %.2fx" %(seconds_legacy / seconds_linear))
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Micro-benchmark of statement assembly for sentence alignment")
+  parser.add_argument("sessionFile", nargs='?', help="EuroParl source file; if omitted, a synthetic session file is generated")
+  parser.add_argument("--longest", type=int, default=5, help="Number of longest speaker turns to be assembled")
+  parser.add_argument("--turns", type=int, default=20, help="Number of speaker turns of synthetic session file")
+  parser.add_argument("--paragraphs", type=int, default=300, help="Maximum number of paragraphs per speaker turn of synthetic session file")
+  parser.add_argument("--repeat", type=int, default=5, help="Number of repetitions (the fastest is reported)")
+  args = parser.parse_args()
+
+  if args.sessionFile:
+    benchmark(args.sessionFile, args.longest, args.repeat)
+  else:
+    with tempfile.TemporaryDirectory() as tmp:
+      sourcefile = generate_corpus(tmp, 1, languages=['en'], turns_per_session=args.turns, max_paragraphs=args.paragraphs, max_sentences=20)[0]
+      benchmark(sourcefile, args.longest, args.repeat)
@@ -0,0 +1,95 @@
+'''
+Benchmark of the generation of the statement list from EuroParl source files.
+
+Synthetic corpora of increasing size are scanned with StatementListBuilder; the time per file should stay
+roughly constant, i.e. the scan scales linearly with the number of files. With --legacy, the previous approach
+of growing data frame speaker_list row by row is timed as well for comparison.
+
+Usage:
+
+$ python3 benchmarks/bench_statement_list.py --sizes 10 20 40 80 --legacy
+
+'''
+
+import os
+import sys
+import re
+import time
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pandas as pd
+from synthetic_corpus import generate_corpus
+from statement_list import StatementListBuilder, analyse_sourcefile, langcode, langcode_exception, STATEMENT_LIST_COLUMNS
+
+
+# Per-tag regex patterns used prior to the fused tag scanner (see module tag_scanner)
+speakerTag = re.compile(r'<SPEAKER ID="?(x?\d+(_\d{3})?)"?')
+languageTag = re.compile(r'LANGUAGE="(\w{2})"')
+nameTag = re.compile(r'NAME="([^"]*)"')
+
+
+
+def scan_with_builder(sourcefiles):
+  builder = StatementListBuilder()
+  for inputfile in sourcefiles:
+    analyse_sourcefile(inputfile, builder)
+  return builder.to_dataframe()
+
+
+
+def scan_legacy(sourcefiles):
+  """ Scan source files by inserting each new speaker turn into a growing data frame (approach prior to StatementListBuilder). """
+  speaker_list = pd.DataFrame(columns=STATEMENT_LIST_COLUMNS)
+  for inputfile in sourcefiles:
+    filename_base = inputfile.split("/")[-1].split(".txt")[0].split("ep-")[1]
+    with open(inputfile, 'rt', encoding='utf-8', errors='ignore') as fl:
+      lines = [line.strip() for line in fl] + ['']
+    for line, nextline in zip(lines, lines[1:]):
+      speakerMatch = speakerTag.search(line)
+      if not speakerMatch:
+        continue
+      unique_file_id = filename_base + "|" + speakerMatch.group(1)
+      nameMatch = nameTag.search(line)
+      languageMatch = languageTag.search(line)
+      additional = langcode.search(nextline)
+      counts = {'NAMES_FULL_COUNT': nameMatch.group(1).partition('(')[0].strip() if nameMatch else '',
+                'ORIGINAL_LANGUAGE': languageMatch.group(1) if languageMatch else '',
+                'ADDITIONAL_LANGUAGE': additional.group(1) if additional and not langcode_exception.search(nextline) else ''}
+      if unique_file_id not in speaker_list.index:
+        speaker_list.loc[unique_file_id] = [{}, {}, '', {}, '', {}]
+      for column, key in counts.items():
+        if len(key) > 0:
+          counter = speaker_list.at[unique_file_id, column]
+          counter[key] = counter.get(key, 0) + 1
+  return speaker_list
+
+
+
+def timed(function, *arguments):
+  start = time.perf_counter()
+  result = function(*arguments)
+  return time.perf_counter() - start, result
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Benchmark generation of the statement list")
+  parser.add_argument("--sizes", type=int, nargs='+', default=[10, 20, 40, 80, 160], help="Numbers of sessions per language")
+  parser.add_argument("--turns", type=int, default=40, help="Number of speaker turns per session")
+  parser.add_argument("--legacy", action="store_true", help="Also time the row-by-row data frame approach")
+  args = parser.parse_args()
+
+  print("%8s %8s %12s %14s %14s" %("files", "turns", "builder [s]", "builder [ms/f]", "legacy [ms/f]"))
+  with tempfile.TemporaryDirectory() as tmp:
+    for n in args.sizes:
+      sourcefiles = generate_corpus(os.path.join(tmp, str(n)), n, turns_per_session=args.turns)
+      seconds, speaker_list = timed(scan_with_builder, sourcefiles)
+      legacy = ""
+      if args.legacy:
+        legacy_seconds, legacy_list = timed(scan_legacy, sourcefiles)
+        assert len(legacy_list) == len(speaker_list)
+        legacy = "%.2f" %(legacy_seconds * 1000 / len(sourcefiles))
+      print("%8d %8d %12.3f %14.2f %14s" %(len(sourcefiles), len(speaker_list), seconds, seconds * 1000 / len(sourcefiles), legacy))
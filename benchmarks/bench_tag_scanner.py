@@ -0,0 +1,96 @@
+'''
+Micro-benchmark of the detection of XML metadata tags in EuroParl source files.
+
+Each line of a session file is analysed (a) with the per-tag regex patterns used previously (xmlTag, speakerTurnTag,
+chapterTag and speakerTag searched on every line, nameTag and languageTag on speaker tags) and (b) with function
+scan_tag(line) of module tag_scanner, which matches one combined pattern on lines starting with '<' only.
+Both approaches are checked to yield the same tag metadata.
+
+Usage:
+
+$ python3 benchmarks/bench_tag_scanner.py txt/de/ep-09-10-22-009.txt
+$ python3 benchmarks/bench_tag_scanner.py --repeat 20 # Synthetic session file
+
+'''
+
+import os
+import re
+import sys
+import timeit
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from synthetic_corpus import generate_corpus
+from tag_scanner import scan_tag, is_metadata_tag
+
+
+# Per-tag regex patterns used prior to the fused tag scanner
+chapterTag = re.compile(r'<CHAPTER ID="?([\d_]+)"?')
+speakerTag = re.compile(r'<SPEAKER ID="?(x?\d+(_\d{3})?)"?')
+languageTag = re.compile(r'LANGUAGE="(\w{2})"')
+nameTag = re.compile(r'NAME="([^"]*)"')
+speakerTurnTag = re.compile(r'<SPEAKER ID="?(x?\d+(?:_\d{3})?)"? ')
+xmlTag = re.compile(r'^<[^P].*>$')
+
+
+
+def scan_per_regex(lines):
+  """ Search every line with all per-tag patterns, as done by the metadata scan prior to the fused tag scanner. """
+  tags = []
+  for line in lines:
+    xmlTag.search(line)
+    turnMatch = speakerTurnTag.search(line)
+    chapterMatch = chapterTag.search(line)
+    if chapterMatch:
+      tags.append(('CHAPTER', chapterMatch.group(1), None, None, False))
+    speakerMatch = speakerTag.search(line)
+    if speakerMatch:
+      nameMatch = nameTag.search(line)
+      languageMatch = languageTag.search(line)
+      tags.append(('SPEAKER', speakerMatch.group(1), nameMatch.group(1) if nameMatch else None,
+                   languageMatch.group(1) if languageMatch else None, turnMatch is not None))
+  return tags
+
+
+
+def scan_fused(lines):
+  """ Match the combined tag pattern on lines starting with '<' only, as done by function analyse_sourcefile(). """
+  tags = []
+  for line in lines:
+    if line[:1] == '<':
+      is_metadata_tag(line)
+      tag = scan_tag(line)
+      if tag is not None:
+        tags.append(tuple(tag))
+  return tags
+
+
+
+def benchmark(path, repeat):
+  with open(path, 'rt', encoding='utf-8', errors='ignore') as fl:
+    lines = [line.strip() for line in fl]
+  per_regex, fused = scan_per_regex(lines), scan_fused(lines)
+  assert per_regex == fused, "Tag scanner and per-tag regex patterns disagree"
+  seconds_per_regex = min(timeit.repeat(lambda: scan_per_regex(lines), number=1, repeat=repeat))
+  seconds_fused = min(timeit.repeat(lambda: scan_fused(lines), number=1, repeat=repeat))
+  print("%s: %d lines, %d tags" %(path, len(lines), len(fused)))
+  print("%12s %12s %12s" %("", "[ms/file]", "[ns/line]"))
+  for label, seconds in (("per-regex", seconds_per_regex), ("fused", seconds_fused)):
+    print("%12s %12.3f %12.1f" %(label, seconds * 1000, seconds * 1e9 / max(1, len(lines))))
+  print("Speed-up: %.2fx" %(seconds_per_regex / seconds_fused))
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Micro-benchmark of XML metadata tag detection")
+  parser.add_argument("sessionFile", nargs='?', help="EuroParl source file; if omitted, a synthetic session file is generated")
+  parser.add_argument("--repeat", type=int, default=10, help="Number of repetitions (the fastest is reported)")
+  args = parser.parse_args()
+
+  if args.sessionFile:
+    benchmark(args.sessionFile, args.repeat)
+  else:
+    with tempfile.TemporaryDirectory() as tmp:
+      benchmark(generate_corpus(tmp, 1, languages=['en'], turns_per_session=400)[0], args.repeat)
@@ -0,0 +1,155 @@
+'''
+Check that the engines of the Gale-Church algorithm (module gale_church) yield the alignments of the reference engine.
+
+Random paragraph pairs are aligned by the reference engine, function _align(), with exact length costs, and by function align() with
+each of the engines in ENGINES, by function align_batch() and by function gale_church_alignments(). With exact length costs
+(max_cost_error None), all engines have to yield the alignments of the reference engine. The numpy and batch engines always compute
+length costs exactly, so they are also checked with the default max_cost_error. With tabulated length costs, the python and auto
+engines may choose another alignment where the costs of alternative beads (nearly) tie; such alignments are only accepted if their
+exact cost exceeds that of the reference alignment by no more than the error bound of the tabulated costs, and they are counted.
+
+Besides sentence lengths drawn from EuroParl-like distributions (see benchmarks/bench_gale_church.py), some with an empty sentence, paragraphs are built from a
+few lengths only (10, 20 and 30 characters) and aligned with a mean of 1.1, where exact ties between alternative beads are frequent.
+If numpy is not installed, only the python and auto engines are checked.
+
+The script exits with status 1 if any engine yields an alignment other than those accepted.
+
+Usage:
+
+$ python3 benchmarks/check_gale_church_engines.py
+$ python3 benchmarks/check_gale_church_engines.py --paragraphs 2000 --seed 7
+
+'''
+
+import os
+import sys
+import random
+import argparse
+import importlib.util
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from gale_church import _align, align, align_batch, gale_church_alignments, length_cost, length_cost_table, BEAD_COSTS, ENGINES, MAX_COST_ERROR
+from bench_gale_church import generate_paragraph_pair
+
+VARIANCE = 6.8
+TIE_LENGTHS = (10, 20, 30)
+
+
+
+def generate_paragraphs(n_paragraphs, rnd):
+  """ Return n_paragraphs 3-tuples (x, y, mean) of sentence lengths and mean, alternating EuroParl-like lengths and tie cases. """
+  paragraphs = [([10], [10, 10, 10, 10], 1.1)] # Exact tie between alternative beads
+  while len(paragraphs) < n_paragraphs:
+    n = rnd.choice([1, 1, 2, 2, 3, 4, 5, 8, 12, 20])
+    if len(paragraphs) % 2:
+      x, y = generate_paragraph_pair(n, rnd)
+      if len(paragraphs) % 25 == 1: # Empty sentence, e.g. left over from cleaning
+        x[rnd.randrange(len(x))] = 0
+      paragraphs.append((x, y, 1.0))
+    else:
+      x = [rnd.choice(TIE_LENGTHS) for _ in range(n)]
+      y = [rnd.choice(TIE_LENGTHS) for _ in range(max(1, n + rnd.randint(-2, 2)))]
+      paragraphs.append((x, y, 1.1))
+  return paragraphs
+
+
+
+def sentences(lengths, tag):
+  """ Return sentences of the given lengths (without spaces), each made of a character of its own so that alignments are distinct. """
+  return [chr(tag + k) * length for k, length in enumerate(lengths)]
+
+
+
+def segments(path, sx, sy):
+  return [(' '.join(sx[i1:i2]), ' '.join(sy[j1:j2])) for (i1, i2), (j1, j2) in path]
+
+
+
+def path_cost(path, x, y, mean_xy):
+  """ Return the exact cost of an alignment (beads in forward order). """
+  return sum(length_cost(x[i1:i2], y[j1:j2], mean_xy, VARIANCE) + BEAD_COSTS[i2-i1, j2-j1] for (i1, i2), (j1, j2) in path)
+
+
+
+def check(n_paragraphs, seed):
+  """ Align random paragraphs with all engines and return the number of alignments other than those accepted. """
+  rnd = random.Random(seed)
+  paragraphs = generate_paragraphs(n_paragraphs, rnd)
+  engines = ENGINES if importlib.util.find_spec('numpy') is not None else ('python', 'auto')
+  if engines != ENGINES:
+    print("Package numpy not installed, checking engines %s only\n" %(', '.join(engines)))
+  mismatches = {}
+  near_ties = {}
+
+  def compare(name, result, expected, near_tie=None):
+    """ Count result as mismatch if it differs from expected, unless near_tie() holds. """
+    mismatches.setdefault(name, 0)
+    near_ties.setdefault(name, 0)
+    if result == expected:
+      return
+    if near_tie is not None and near_tie():
+      near_ties[name] += 1
+    else:
+      mismatches[name] += 1
+
+  table = length_cost_table(MAX_COST_ERROR)
+  reference = []
+  for x, y, mean_xy in paragraphs:
+    path = list(reversed(list(_align(x, y, mean_xy, VARIANCE, BEAD_COSTS))))
+    reference.append(path)
+    sx, sy = sentences(x, 0x4e00), sentences(y, 0x5e00)
+    expected = segments(path, sx, sy)
+    # Alignment with tabulated length costs, accepted if it is the one of align() and its exact cost is within the error bound
+    tabulated = list(reversed(list(_align(x, y, mean_xy, VARIANCE, BEAD_COSTS, None, table))))
+    tolerance = 2 * MAX_COST_ERROR * (len(x) + len(y))
+    for engine in engines:
+      result = list(align(sx, sy, mean_xy, VARIANCE, BEAD_COSTS, engine, max_cost_error=None))
+      compare("align %s exact" %(engine), result, expected)
+      result = list(align(sx, sy, mean_xy, VARIANCE, BEAD_COSTS, engine))
+      if engine in ('numpy', 'batch'):
+        compare("align %s" %(engine), result, expected)
+      else:
+        compare("align %s tabulated" %(engine), result, expected,
+                lambda: result == segments(tabulated, sx, sy) and
+                        path_cost(tabulated, x, y, mean_xy) <= path_cost(path, x, y, mean_xy) + tolerance)
+
+  for engine in engines:
+    if engine in ('batch', 'auto'):
+      for mean_xy in (1.0, 1.1):
+        members = [k for k, paragraph in enumerate(paragraphs) if paragraph[2] == mean_xy]
+        paths = align_batch([paragraphs[k][:2] for k in members], mean_xy, VARIANCE, BEAD_COSTS, engine, None)
+        for k, path in zip(members, paths):
+          compare("align_batch %s exact" %(engine), path, reference[k])
+
+  # Texts of several paragraphs with markers, as aligned per session; sentences of length 0 are not valid in texts
+  texts = []
+  for start in range(0, len(paragraphs), 5):
+    sl_sentences, tl_sentences = [], []
+    for x, y, mean_xy in paragraphs[start:start+5]:
+      if mean_xy != 1.0 or 0 in x or 0 in y:
+        continue
+      sl_sentences += ["<P>"] + sentences(x, 0x4e00)
+      tl_sentences += ["<P>"] + sentences(y, 0x5e00)
+    if sl_sentences:
+      texts.append((sl_sentences, tl_sentences))
+  expected = gale_church_alignments(texts, 1.0, VARIANCE, BEAD_COSTS, 'python', max_cost_error=None)
+  for engine in engines:
+    for text, result in zip(expected, gale_church_alignments(texts, 1.0, VARIANCE, BEAD_COSTS, engine, max_cost_error=None)):
+      compare("gale_church_alignments %s exact" %(engine), result, text)
+
+  print("%-36s %12s %12s" %("engine", "mismatches", "near ties"))
+  for name in mismatches:
+    print("%-36s %12d %12d" %(name, mismatches[name], near_ties[name]))
+  print("\n%d paragraphs checked" %(len(paragraphs)))
+  return sum(mismatches.values())
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Check that the engines of the Gale-Church algorithm yield the alignments of the reference engine")
+  parser.add_argument("--paragraphs", type=int, default=600, help="Number of random paragraphs")
+  parser.add_argument("--seed", type=int, default=1, help="Seed of random sentence lengths")
+  args = parser.parse_args()
+
+  sys.exit(1 if check(args.paragraphs, args.seed) else 0)
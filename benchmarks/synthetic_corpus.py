@@ -0,0 +1,120 @@
+'''
+Generation of synthetic EuroParl source files for benchmarking.
+
+The generated files follow the layout of preprocessed EuroParl source files (one folder per language,
+one sentence per line, <CHAPTER>, <SPEAKER> and <P> markup), so that all stages of EuroParlExtract can be
+run on them. Sentences consist of random letters; only their lengths are kept roughly parallel across languages.
+
+Usage:
+
+$ python3 benchmarks/synthetic_corpus.py txt_synthetic/ -n 200
+
+'''
+
+import os
+import random
+import argparse
+
+LANGUAGES = ['de', 'en', 'fr', 'pl', 'bg', 'es', 'el']
+ALPHABETS = {'de': 'abcdeghiklmnorstuwäöü', 'en': 'abcdefghilmnoprstuwy', 'fr': 'abcdeéèfilmnoprstu',
+             'pl': 'acdeęiklmnoprsstwyzż', 'bg': 'абвгдежзиклмнопрст', 'es': 'abcdeilmnoprstuñ', 'el': 'αβγδεζηικλμνοπρστ'}
+PRESIDENT = {'de': 'Präsident', 'en': 'President', 'fr': 'Président', 'pl': 'Przewodniczący',
+             'bg': 'Председател', 'es': 'Presidente', 'el': 'Πρόεδρος'}
+SPEAKERS = ['Hans Müller', 'Jim Higgins', 'Anna Kowalska', 'José Manuel Barroso', 'Marie Dupont',
+            'Olli Rehn', 'Maria García', 'Petra Schmidt', 'Kyriacos Triantaphyllides']
+
+
+
+def sentence(rnd, lang, word_lengths):
+  """ Generate a random sentence with words of approximately the given lengths. """
+  words = [''.join(rnd.choice(ALPHABETS[lang]) for _ in range(max(1, n + rnd.randint(-1, 2)))) for n in word_lengths]
+  return ' '.join(words).capitalize() + '.'
+##### END OF FUNCTION DECLARATION
+
+
+
+def generate_session(rnd, turns_per_session, max_paragraphs=5, max_sentences=6):
+  """ Generate the language-independent structure of one parliamentary session.
+
+  Returns:
+    turns (list) -- Chapters as ('CH', chapter_id) and speaker turns as ('SP', speaker_id, original_language, speaker, paragraphs),
+      where paragraphs is a list of lists of word lengths.
+
+  """
+  turns = [('CH', 1)]
+  for sid in range(1, turns_per_session + 1):
+    if sid % 8 == 0:
+      turns.append(('CH', len(turns)))
+    speaker = 'PRES' if rnd.random() < 0.25 else rnd.choice(SPEAKERS)
+    paragraphs = [[[rnd.randint(1, 9) for _ in range(rnd.randint(3, 18))] for _ in range(rnd.randint(1, max_sentences))]
+                  for _ in range(rnd.randint(1, max_paragraphs))]
+    turns.append(('SP', sid, rnd.choice(LANGUAGES), speaker, paragraphs))
+  return turns
+##### END OF FUNCTION DECLARATION
+
+
+
+def write_session(rnd, path, lang, turns):
+  """ Write one language version of a session to path. """
+  with open(path, 'w', encoding='utf-8') as fl:
+    for turn in turns:
+      if turn[0] == 'CH':
+        fl.write('<CHAPTER ID="%d">\n%s\n' %(turn[1], sentence(rnd, lang, [5, 7, 3])))
+        continue
+      _, sid, original_language, speaker, paragraphs = turn
+      name = PRESIDENT[lang] if speaker == 'PRES' else speaker
+      attributes = 'ID="%d"' %(sid)
+      if rnd.random() < 0.4:
+        attributes += ' LANGUAGE="%s"' %(original_language.upper())
+      fl.write('<SPEAKER %s NAME="%s">\n' %(attributes, name))
+      for i, paragraph in enumerate(paragraphs):
+        if i > 0:
+          fl.write('<P>\n')
+        for j, word_lengths in enumerate(paragraph):
+          line = sentence(rnd, lang, word_lengths)
+          if i == j == 0 and lang != original_language and rnd.random() < 0.5:
+            line = '(%s) %s' %(original_language.upper(), line)
+          fl.write(line + '\n')
+##### END OF FUNCTION DECLARATION
+
+
+
+def generate_corpus(out_dir, n_sessions, languages=LANGUAGES, turns_per_session=40, seed=1, **session_options):
+  """ Generate n_sessions synthetic sessions in each language of languages.
+
+  Arguments:
+    out_dir (str) -- Output folder; one subfolder per language is created.
+    n_sessions (int) -- Number of sessions.
+    languages (list) -- Two-letter language codes (lower case).
+    turns_per_session (int) -- Number of speaker turns per session.
+    seed (int) -- Seed of random number generator.
+
+  Returns:
+    sourcefiles (list) -- Paths of all generated source files.
+
+  """
+  rnd = random.Random(seed)
+  sourcefiles = []
+  for lang in languages:
+    os.makedirs(os.path.join(out_dir, lang), exist_ok=True)
+  for s in range(n_sessions):
+    filename = 'ep-%02d-%02d-%02d-%03d.txt' %(s // 336 % 100, s // 28 % 12 + 1, s % 28 + 1, s % 1000)
+    turns = generate_session(rnd, turns_per_session, **session_options)
+    for lang in languages:
+      path = os.path.join(out_dir, lang, filename)
+      write_session(rnd, path, lang, turns)
+      sourcefiles.append(path)
+  return sourcefiles
+##### END OF FUNCTION DECLARATION
+
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description="Generate synthetic EuroParl source files for benchmarking")
+  parser.add_argument("outputFolder", help="Output folder, one subfolder per language will be created")
+  parser.add_argument("-n", "--sessions", type=int, default=100, help="Number of sessions per language")
+  parser.add_argument("-t", "--turns", type=int, default=40, help="Number of speaker turns per session")
+  parser.add_argument("--seed", type=int, default=1, help="Seed of random number generator")
+  args = parser.parse_args()
+  files = generate_corpus(args.outputFolder, args.sessions, turns_per_session=args.turns, seed=args.seed)
+  print("%s source files written to %s" %(len(files), args.outputFolder))
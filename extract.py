@@ -18,17 +18,30 @@ Prior to running this script, do the following (TODO: PREPARE .sh SCRIPT TO RUN
 4) Extract multilingual speaker turns:
 4.1) For extraction of comparable corpora do:
   $ python3 europarl_extract/extract.py comparable -sl PL ES -tl DE -i txt/ -o output_folder/ -s statementList_full_beta.csv -al -c both
+
+The module can also be imported without side effects (the command line is only parsed by function main()), e.g.:
+  import extract
+  extract.main(['comparable', '-sl', 'PL', 'ES', '-tl', 'DE', '-i', 'txt/', '-o', 'output_folder/'])
+Settings are passed to the extraction functions in an Extraction object, so that these can also be called directly, e.g.:
+  extraction = extract.Extraction(extract.build_parser().parse_args(['comparable', '-sl', 'PL', '-tl', 'DE', '-i', 'txt/', '-o', 'output_folder/']))
+  extract.prepare_statement_list(extraction)
+  extract.extract_comparable_corpora(extraction)
+  extraction.close()
+Packages pandas, numpy and unidecode are imported on first use only.
 '''
 
 import sys
 import os.path
-import re
-import pandas as pd
+import json
+import time
 import argparse
-from unidecode import unidecode
-from string import punctuation
+import multiprocessing
 from datetime import datetime
-from gale_church import gale_church_alignment
+from alignment import align_statement_batch, merge_alignments, clean_line
+from gale_church import BandStatistics, ENGINES, MAX_COST_ERROR
+from name_normaliser import NameNormaliser
+from statement_list import StatementListBuilder, SourceFileCache, SpeakerTurnIndex, StatementStore, CSVStatementStore, StatementCache, SessionFilter, scan_sourcefiles, read_statements, select_from_statement_list, save_statement_list, load_statement_list, detect_statement_list_format, STATEMENT_LIST_EXTENSIONS
+from output_sink import create_output_sink, OUTPUT_SINKS
 
 ''' # Function not required
 def get_sourcefile(path):
@@ -67,51 +80,6 @@ def get_sourcefiles_from_folder(path):
 
 
 
-def analyse_sourcefile(inputfile):
-  """ Extract metadata from EuroParl source file and pass it to function write_metadata_to_df(current_line, next_line, speakerMatch, filename_base).
-    
-  Arguments:
-    inputfile (str) -- Path to input file.
-
-  Returns:
-    Nothing; instead, it calls function write_metadata_to_df(current_line, next_line, speakerMatch, filename_base) to write metadata to data frame.
-    
-  """
-  filename_base = inputfile.split("/")[-1].split(".txt")[0].split("ep-")[1] # basename of the input file, i.e. truncate folder path and prefix 'ep' and suffix '.txt' from filename
-  
-  # Loop over input file line-by-line and match regex patterns indicating speaker turn metadata
-  # To avoid EOF errors, reading file line by line looks behind instead of looking ahead
-  # This means that after reading a line it will be stored as prev_line (in for-loop renamed to current_line for verbosity)
-  prev_line = None
-  
-  with open(inputfile, 'rt', encoding='utf-8', errors='ignore') as fl: # flag errors='ignore' is used in order to prevent program terminating upon encoding errors (one such error can be found in file /txt/pl/ep-09-10-22-009.txt)
-    # Loop over entire input file, extract chapterIDs, SpeakerIDs and language codes (the latter happens in write_metadata_to_df)
-    for line in fl:
-      if not prev_line == None:
-        current_line = prev_line.strip()
-        next_line = line.strip()
-        chapterMatch = chapterTag.search(current_line)
-        if chapterMatch:
-          chapter_ID = chapterMatch.group(1)
-        speakerMatch = speakerTag.search(current_line)
-        if speakerMatch:
-          write_metadata_to_df(current_line, next_line, speakerMatch, filename_base)
-      prev_line = line.strip()
-    
-    # After reaching the last line of file (stored as prev_line), check once again whether there is a language tag in last line.
-    # This time, next_line is empty because it is the end of file, therefore we pass '' to function write_metadata_to_df().
-    if prev_line == None:
-      prev_line = ''
-    chapterMatch = chapterTag.search(prev_line)
-    if chapterMatch:
-      chapter_ID = chapterMatch.group(1)
-    speakerMatch = speakerTag.search(prev_line)
-    if speakerMatch:
-      write_metadata_to_df(prev_line, '', speakerMatch, filename_base) # Here prev_line is the last line of input file and next_line is '' because of EOF
-##### END OF FUNCTION DECLARATION
-
-
-
 def group_speakers(all_name_forms):
   """ Apply a simple heuristic to group speaker names irrespective of discrepancies in writing, i.e. identify "John Doe" and "Doe John" as same speaker.
   The function creates for each statement a dictionary that contains short forms of normalised names (4 characters long) as keys and the respective counts as values.
@@ -129,7 +97,7 @@ def group_speakers(all_name_forms):
 
   if len(all_name_forms) == 1:
     for k, v in all_name_forms.items():
-      speakers_summary[normalise_name(k)[0:4]] = v #[0:3] to change length of normalised name tag to 4 instead of 3
+      speakers_summary[name_normaliser.normalise(k)[0:4]] = v #[0:3] to change length of normalised name tag to 4 instead of 3
   elif len(all_name_forms) < 1:
     speakers_summary = {}
 
@@ -137,7 +105,7 @@ def group_speakers(all_name_forms):
     pairwise_name_matches = [] # this list stores pairwise tuples that indicate which two normalised short names belong together 
     names = list(all_name_forms.items()) # list of tuples containing speakername and count
     for i in range(len(names)):
-      names[i] = (normalise_name(names[i][0]), names[i][1])
+      names[i] = (name_normaliser.normalise(names[i][0]), names[i][1])
       if names[i][0][0:4] not in speakers_summary: #[0:3] to change length of normalised name tag to 4 instead of 3
         speakers_summary[names[i][0][0:4]] = int(names[i][1]) #[0:3] to change length of normalised name tag to 4 instead of 3
       else:
@@ -213,79 +181,6 @@ def group_speakers(all_name_forms):
 
 
 
-def normalise_name(name):
-  """ Normalise speaker name by latinising Cyrillic/Greek characters and unifying multilingual denominations of 'president'.
-    
-  Arguments:
-    name (str) -- The name of the speaker.
-
-  Returns:
-    norm (str) -- The normalised form of the name.
-    
-  """
-  if exceptions_nonroman.search(name):
-    name = latinise_name(name)
-  if president.search(name):
-    norm = "prsd"
-  else:
-    norm = unidecode(name).lower().translate(str.maketrans({a:None for a in punctuation})).replace(' ','')
-  if len(norm) < 1:
-    norm = "xxxx"
-  return(norm)
-##### END OF FUNCTION DECLARATION
-
-def latinise_name(name):
-  """ Convert Cyrillic/Greek names to Latin alphabet form.
-    
-  Arguments:
-    name (str) -- Name of speaker.
-
-  Returns:
-    name_latinised (str) -- Latinised form of the name.
-    
-  """
-  replacements = {
-  'Жозе Мануел Барозу':'José Manuel Barroso',
-  'Сесилия Малмстрьом' : 'Cecilia Malmström',
-  'Катрин Аштън' : 'Catherine Ashton',
-  'Κυριάκος' : 'Kyriacos',
-  'Мишел' : 'Michel',
-  'Гюнтер' : 'Günther',
-  'Жак' : 'jacques',
-  'Δημήτρ' : 'Dimitr',
-  'Оли Рен' : 'Olli Rehn',
-  'Χαρ' : 'Char',
-  'Ευαγγελία' : 'Evangelia',
-  'Συλβάνα' : 'Sylvana',
-  'Χρ' : 'Chr',
-  'Щефан' : 'Stefan',
-  'Μπ' : 'B',
-  'Σπύρος' : 'Spyros',
-  'Хосе' : 'Jose',
-  'Хоакин' : 'Joaquin',
-  'Йоханес' : 'Johannes',
-  'Ян' : 'Jan',
-  'Джо' : 'Joe',
-  'Нели' : 'Neelie',
-  'Сесилия': 'Cecilia',
-  'Σηφουνάκης' : 'Sifunakis',
-  'Παφίλης' : 'Pafilis',
-  'Φώλιας' : 'Folias',
-  'Джон' : 'John',
-  'Петя' : 'Petya',
-  'Кони' : 'Connie',
-  'Мойра' : 'Máire',
-  'Ив ' : 'Yves',
-  'Жан-Клод Трише' : 'Jean-Claude Trichet',
-  'Филип ' : 'Philippe', 
-  }
-  pattern = re.compile('|'.join(replacements.keys()))
-  name_latinised = pattern.sub(lambda x: replacements[x.group()], name)
-  return(name_latinised)
-##### END OF FUNCTION DECLARATION
-
-
-
 def match_speakers(all_names_normalised):
   """ Determine whether speaker names for each statement ate matching or contradictory. If contradictory,
     the speaker names are regarded as umbiguous if one of the name IDs accounts for at least 70% of all name IDs for given speaker turn.
@@ -338,7 +233,7 @@ def string_difference(s1, s2):
 
 
 
-def language_vote(originalLanguages, additionalLanguages):
+def language_vote(originalLanguages, additionalLanguages, additionalLanguageTags=False):
   """ Determine language of speaker turn by voting among multiple language tags found in source files.
     
   Arguments:
@@ -346,6 +241,7 @@ def language_vote(originalLanguages, additionalLanguages):
       Dictionary keys represent language codes, values represent number of occurrences of each language code.
     additionalLanguages (dict) -- Dictionary storing language codes identified from language codes in lines following XML metadata tags across all source files.
       Dictionary keys represent language codes, values represent number of occurrences of each language code.
+    additionalLanguageTags (bool) -- Whether to vote among additionalLanguages if originalLanguages is empty (-al); default = False.
 
   Returns:
     vote (str) -- Language code determined by voting procedure.
@@ -376,7 +272,7 @@ def language_vote(originalLanguages, additionalLanguages):
     vote = str(x)
 
   else:
-    if args.additionalLanguageTags:
+    if additionalLanguageTags:
       if len(additionalLanguages) == 0:
         vote = "zNAN"
       elif len(additionalLanguages) == 1:
@@ -396,107 +292,227 @@ def language_vote(originalLanguages, additionalLanguages):
 
 
 
-def write_metadata_to_df(line, nextline, speakerMatch, filename_base):
-  """ Write metadata identified within function analyse_sourcefile(fn) to data frame spaker_list.
-    
+def postprocess_statement_list(speaker_list, additionalLanguageTags=False):
+  """ Determine speaker (NAMES_MATCHING) and source language (SL) of each statement in speaker_list.
+  Most statements share identical counters (e.g. {'prsd': 21}), so rows are grouped by a hashable signature of their counters:
+  functions group_speakers() and match_speakers() are called once per distinct signature of NAMES_FULL_COUNT, function language_vote()
+  once per distinct signature of ORIGINAL_LANGUAGE and ADDITIONAL_LANGUAGE, and the results are broadcast back to all rows.
+
   Arguments:
-    line (str) -- Current line of EuroParl source file being read by function analyse_sourcefile(fn).
-    nextline (str) -- Next line of EuroParl source file being read by function analyse_sourcefile(fn).
-    speakerMatch (:obj: 'SRE_Match object) -- Regex match object that stores XML metadata about speaker turn.
-    filename_base (str) -- Basename of EuroParl source file.
+    speaker_list (:obj: 'pandas.DataFrame') -- Statement list with counters of names and language codes.
+    additionalLanguageTags (bool) -- Passed to function language_vote() (-al); default = False.
 
   Returns:
-    Nothing; instead, it writes metadata directly to data frame speaker_list.
-    
+    stats (dict) -- Number of statements ('statements'), distinct name and language signatures ('name_signatures', 'language_signatures'),
+      seconds spent on computing the distinct signatures ('seconds') and estimated seconds saved compared to computing each row ('seconds_saved').
+      Columns NAMES_NORMALISED_SUMMARY, NAMES_MATCHING and SL of speaker_list are updated in place.
+
   """
-  speaker_ID = speakerMatch.group(1)
-  unique_file_id = filename_base + "|" + speaker_ID
-  nameMatch = nameTag.search(line)
-  # If speaker name is found in XML tag, retrieve it from regex pattern and pass it to function normalise(name(name).
-  if nameMatch:
-    name = nameMatch.group(1).partition('(')[0].strip()
-    name_normalised = normalise_name(name)
-  # If no speaker name found in XML tag, set normalised name to dummy value 'nnnn'.
-  else:
-    name = ""
-    name_normalised = 'nnnn'
-    
-  languageMatch = languageTag.search(line)
-  if languageMatch:
-    lang = languageMatch.group(1)
-  else:
-    lang = ""
-  
-  # Search additional language tag (a two-letter uppercase code in parenthesis) in line following
-  # the current line containing XML metadata tag.
-  additional_lang_tag = langcode.search(nextline)
-  
-  #  Make sure no language code exception of type "(ES) Nr. 123" in line following XML tag is mistakingly taken as language code
-  #  where, in fact, (ES) is only an abbreviation for European Commission in several Slavic languages (eg. CS, SK).
-  if additional_lang_tag and not langcode_exception.search(nextline):
-    additional_lang_tag = additional_lang_tag.group(1)
-  else:
-    additional_lang_tag = ""
-
-  # If speakerID is already stored in data frame, update language code if provided
-  if unique_file_id not in speaker_list.index:
-    speaker_list.loc[unique_file_id] = [{}, {}, '', {}, '', {}]  # 'ID', 'NAMES_FULL_COUNT', 'NAMES_NORMALISED_SUMMARY', 'NAMES_MATCHING', 'ORIGINAL_LANGUAGE', 'SL', 'ADDITIONAL_LANGUAGE', 'SL2' # speaker_ID as first item was deleted
-    if len(name) > 0:
-      speaker_list.loc[unique_file_id].loc['NAMES_FULL_COUNT'][name] = 1
-    if len(lang) > 0:
-      speaker_list.loc[unique_file_id].loc['ORIGINAL_LANGUAGE'][lang] = 1
-    if len(additional_lang_tag) > 0:
-      speaker_list.loc[unique_file_id].loc['ADDITIONAL_LANGUAGE'][additional_lang_tag] = 1
-  else:
-    if len(name) > 0:
-      if name not in speaker_list.loc[unique_file_id].loc['NAMES_FULL_COUNT'].keys():
-        speaker_list.loc[unique_file_id].loc['NAMES_FULL_COUNT'][name] = 1
-      else:
-        speaker_list.loc[unique_file_id].loc['NAMES_FULL_COUNT'][name] += 1
-    if len(lang) > 0:
-      if lang not in speaker_list.loc[unique_file_id].loc['ORIGINAL_LANGUAGE'].keys():
-        speaker_list.loc[unique_file_id].loc['ORIGINAL_LANGUAGE'][lang] = 1
-      else:
-        speaker_list.loc[unique_file_id].loc['ORIGINAL_LANGUAGE'][lang] += 1
-    if len(additional_lang_tag) > 0:
-      if additional_lang_tag not in speaker_list.loc[unique_file_id].loc['ADDITIONAL_LANGUAGE'].keys():
-        speaker_list.loc[unique_file_id].loc['ADDITIONAL_LANGUAGE'][additional_lang_tag] = 1
-      else:
-        speaker_list.loc[unique_file_id].loc['ADDITIONAL_LANGUAGE'][additional_lang_tag] += 1    
-### END OF FUNCTION DECLARATION
+  import numpy as np # Imported here, since statement lists supplied via -s need not be post-processed
+  # Signatures preserve the order of dictionary items, since results of the voting functions may depend on it
+  name_codes, name_signatures = factorize_signatures(tuple(counter.items()) for counter in speaker_list['NAMES_FULL_COUNT'])
+  language_codes, language_signatures = factorize_signatures((tuple(original.items()), tuple(additional.items()))
+                                                             for original, additional in zip(speaker_list['ORIGINAL_LANGUAGE'], speaker_list['ADDITIONAL_LANGUAGE']))
+
+  start = time.perf_counter()
+  names_normalised_summary = np.empty(len(name_signatures), dtype=object)
+  names_matching = np.empty(len(name_signatures), dtype=object)
+  for i, signature in enumerate(name_signatures):
+    names_normalised_summary[i] = group_speakers(dict(signature))
+    names_matching[i] = match_speakers(names_normalised_summary[i])
+  time_names = time.perf_counter() - start
+
+  start = time.perf_counter()
+  source_languages = np.empty(len(language_signatures), dtype=object)
+  for i, (original, additional) in enumerate(language_signatures):
+    source_languages[i] = language_vote(dict(original), dict(additional), additionalLanguageTags)
+  time_languages = time.perf_counter() - start
+
+  # Broadcast results of distinct signatures back to all statements
+  speaker_list['NAMES_NORMALISED_SUMMARY'] = names_normalised_summary[name_codes]
+  speaker_list['NAMES_MATCHING'] = names_matching[name_codes]
+  speaker_list['SL'] = source_languages[language_codes]
+
+  # Estimate time saved from average time per distinct signature and number of rows that were not computed separately
+  seconds_saved = 0.0
+  if len(name_signatures) > 0:
+    seconds_saved += time_names / len(name_signatures) * (len(speaker_list) - len(name_signatures))
+  if len(language_signatures) > 0:
+    seconds_saved += time_languages / len(language_signatures) * (len(speaker_list) - len(language_signatures))
+  return {'statements': len(speaker_list), 'name_signatures': len(name_signatures), 'language_signatures': len(language_signatures),
+          'seconds': time_names + time_languages, 'seconds_saved': seconds_saved}
+##### END OF FUNCTION DECLARATION
 
 
 
-def extract_comparable_nontranslated(statements_nontranslated, tl):
-  """ Extract non-translated comparable statements from EuroParl source files.
-    
+def factorize_signatures(signatures):
+  """ Encode hashable signatures as integer codes.
+
   Arguments:
-    statements_nontranslated (dict) -- The statements in the given language.
-      Dictionary keys: File identifiers of EuroParl source files (e.g. 11-04-06-009).
-      Dictionary values: Speaker IDs (e.g. 158) that point to translated statements in source files..
-  tl (str) - Two-letter language identifier.
+    signatures (iterable) -- Hashable signatures, one per row.
 
   Returns:
-    Nothing; instead, it calls function write_statements_to_txt(fn_in, fn_out, ids) to write extracted statements to output files.
-  
+    codes (:obj: 'numpy.ndarray') -- Index of the distinct signature of each row.
+    uniques (list) -- Distinct signatures in order of first occurrence.
+
   """
-  for filename in statements_nontranslated.keys():
-    # Generate file names for input and output files.
-    # For each extracted statement, a new outputfile will be created.
-    # Name of output file contains the following:
-    #    1) Europarl filename (without prefix ep-)
-    #    2) Statement ID
-    #    3) language code.
-    fname_input = (inDir + "/" + tl.lower() + "/ep-" + filename + ".txt").replace('//', '/')
-    fname_output = (outDir + "/comparable/non-translated/" + tl + "/" + filename + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')
-    
-    if os.path.exists(fname_input):
-      create_folders_comparable_nontranslated(outDir, tl)
-      # Write to output director one statement file for each non-translated statement in given language
-      # from the EuroParl source file by calling function write_statements_to_txt(in, out, ids)
-      if args.debug:
-        logfile.write("Extracting non-translated comparable text from\t%s (Turns: %s)\n" %(fname_input, " ".join(statements_nontranslated[filename])))
-      write_statements_to_txt(fname_input, fname_output, statements_nontranslated[filename]) #3rd argument = statement ID
+  import numpy as np
+  positions = {}
+  codes = [positions.setdefault(signature, len(positions)) for signature in signatures]
+  return np.array(codes, dtype=np.intp), list(positions)
+##### END OF FUNCTION DECLARATION
+
+
+
+def select_statements(extraction, sl):
+  """ Select statements originally uttered in language sl and with unambiguous speaker.
+
+  Statements are selected by an indexed query if a SQLite statement list was supplied (see class StatementStore),
+  otherwise by filtering data frame extraction.speaker_list. Only statements of sessions selected by extraction.session_filter are returned.
+
+  Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    sl (str) -- Two-letter source language identifier.
+
+  Returns:
+    statements (dict) -- Keys: filenames of source files containing the statements (e.g. 11-04-06-009);
+      values: speaker IDs pointing to the statements (e.g. 158).
+
+  """
+  if extraction.statement_store is not None:
+    return extraction.statement_store.select(sl, extraction.session_filter)
+  # Restrict statements to sessions selected via --from, --to and --files
+  return select_from_statement_list(extraction.speaker_list, sl, extraction.session_filter)
+##### END OF FUNCTION DECLARATION
+
+
+
+def run_extraction(extraction, function, work_units):
+  """ Call function once for each work unit, either serially or distributed across extraction.args.jobs worker processes.
+
+  Worker processes are forked and inherit extraction (see function init_worker()), so that they share the statement list, the index of
+  byte offsets and all other settings without pickling them. Each work unit writes to its own output files, which yields the same output
+  as a serial run. If the output sink cannot be written to by several processes (e.g. sharded containers), worker processes return the
+  output of each work unit, which is then written to the output sink by the main process in the order of the work units. If the output
+  sink keeps a manifest of the documents written, worker processes return the manifest of each work unit, which is merged into the
+  manifest of the main process; the same applies to the statistics of banded alignment (-bw). If a log file is created (-d), work units
+  are always run serially, so that log entries are written in order.
+
+  Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    function (function) -- Extraction function, e.g. extract_parallel(extraction, identifier, ids, sl, tl).
+    work_units (list) -- Tuples of arguments of function, without extraction.
+
+  Returns:
+    Nothing; instead, function writes the output files.
+
+  """
+  if extraction.args.jobs <= 1 or extraction.args.debug or len(work_units) < 2:
+    for work_unit in work_units:
+      function(extraction, *work_unit)
+    return
+  chunksize = max(1, len(work_units) // (extraction.args.jobs * 16))
+  with multiprocessing.get_context('fork').Pool(processes=extraction.args.jobs, initializer=init_worker, initargs=(extraction,)) as pool:
+    for operations, manifest, statistics in pool.imap(run_work_unit, [(function, work_unit) for work_unit in work_units], chunksize):
+      if operations is not None:
+        extraction.output_sink.replay(operations)
+      if manifest is not None:
+        extraction.output_sink.merge_manifest(manifest)
+      if statistics is not None:
+        for language_pair, counts in statistics.items():
+          extraction.band_statistics.setdefault(language_pair, BandStatistics()).merge(counts)
+##### END OF FUNCTION DECLARATION
+
+
+
+def init_worker(extraction):
+  """ Keep extraction in a worker process for function run_work_unit(); as worker processes are forked, extraction is not pickled. """
+  global worker_extraction
+  worker_extraction = extraction
+##### END OF FUNCTION DECLARATION
+
+
+
+def run_work_unit(task):
+  """ Run task (function, work_unit) in a worker process and return what is needed to complete it in the main process.
+
+  Returns:
+    operations (list) -- Operations on the output sink, which are deferred if the sink is not process-safe, or None.
+    manifest (dict) -- Manifest of the documents written by the work unit, if the output sink keeps a manifest, or None.
+    statistics (dict) -- Statistics of banded alignment of the work unit per language pair (see function align_statements()), or None.
+
+  """
+  extraction = worker_extraction
+  function, work_unit = task
+  if not extraction.output_sink.process_safe:
+    extraction.output_sink.defer()
+  if extraction.output_sink.manifest is not None:
+    extraction.output_sink.manifest = {}
+  if extraction.band_statistics is not None:
+    extraction.band_statistics = {}
+  function(extraction, *work_unit)
+  operations = extraction.output_sink.collect() if not extraction.output_sink.process_safe else None
+  return operations, extraction.output_sink.manifest, extraction.band_statistics
+##### END OF FUNCTION DECLARATION
+
+
+
+def prepare_comparable_extraction(extraction, statements_by_language, tl):
+  """ Prepare extraction of non-translated and translated comparable statements in language tl from EuroParl source files.
+
+  Each source file in language tl is read only once: statements originally uttered in tl are written to the non-translated
+  subcorpus of tl, statements originally uttered in any other language sl to the translated subcorpus sl-tl.
+  Output folders are created here, so that work units can be run by several worker processes (see function run_extraction()).
+
+  Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    statements_by_language (dict) -- The statements to be extracted, grouped by source language.
+      Dictionary keys: Two-letter source language identifiers (tl for non-translated statements).
+      Dictionary values: Statements originally uttered in that language (see function select_statements(sl)), i.e. dictionaries
+        of file identifiers of EuroParl source files (e.g. 11-04-06-009) and speaker IDs (e.g. 158).
+    tl (str) -- Two-letter target language identifier.
+
+  Returns:
+    work_units (list) -- One tuple of arguments (fn_in, fn_out, ids) of function write_statements_to_txt(fn_in, fn_out, ids) per source file.
+
+  """
+  # Collect output file names of all statements per source file:
+  # Keys: file identifiers of EuroParl source files, values: dictionaries of speaker IDs and output file names
+  # Name of output file contains the following:
+  #    1) Europarl filename (without prefix ep-)
+  #    2) Statement ID (placeholder xIDx)
+  #    3) language code.
+  filenames_output = {}
+  for sl, statements in statements_by_language.items():
+    for identifier, ids in statements.items():
+      if sl == tl:
+        fname_output = (extraction.outDir + "/comparable/non-translated/" + tl + "/" + identifier + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')
+      else:
+        fname_output = (extraction.outDir + "/comparable/translated/" + tl + "/" + sl + "-" + tl + "/" + identifier + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')
+      outputs = filenames_output.setdefault(identifier, {})
+      for id in ids:
+        outputs[id] = fname_output
+
+  work_units = []
+  created_folders = set()
+  for identifier, outputs in filenames_output.items():
+    fname_input = (extraction.inDir + "/" + tl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
+    if not os.path.exists(fname_input):
+      continue
+    # Create subfolders of all source languages occurring in current source file
+    for sl, statements in statements_by_language.items():
+      if sl not in created_folders and identifier in statements:
+        if sl == tl:
+          create_folders_comparable_nontranslated(extraction.outDir, tl)
+        else:
+          create_folders_comparable_translated(extraction.outDir, sl, tl)
+        created_folders.add(sl)
+    # Write to output directory one statement file for each statement in the source file
+    # by calling function write_statements_to_txt(in, out, ids)
+    if extraction.args.debug:
+      extraction.logfile.write("Extracting comparable text from\t%s (Turns: %s)\n" %(fname_input, " ".join(outputs)))
+    work_units.append((fname_input, outputs, list(outputs)))
+  return work_units
 ##### END OF FUNCTION DECLARATION
 
 
@@ -516,101 +532,84 @@ def create_folders_comparable_nontranslated(outDir, tl):
     OSError
     
   """
-  try:
-    os.makedirs(outDir + "/comparable/non-translated/" + tl)
-  except OSError:
-    pass
+  os.makedirs(outDir + "/comparable/non-translated/" + tl, exist_ok=True)
 ##### END OF FUNCTION DECLARATION
 
 
 
-def write_statements_to_txt(filename_input, filename_output, ids):
-  """ Write statements extracted by function extract_comparable_nontranslated or extract_comparable_translated to output files.
+def write_statements_to_txt(extraction, filename_input, filename_output, ids, cache=None):
+  """ Write statements extracted by function prepare_comparable_extraction or extract_parallel to output files.
     
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     filename_input (str) -- Name of EuroParl source file.
-    filename_output (str) -- Name of output file.
+    filename_output (str) -- Name of output file, with placeholder xIDx for the speaker ID; or dictionary of speaker IDs and
+      names of output files, if speaker turns are written to different folders.
     ids (str) -- List of IDs (strings) identyfing speaker turns to be written to output file.
+    cache (:obj: 'StatementCache') -- Optional cache of statements read from source files.
 
   Returns:
     Nothing; instead, it writes the output files.
   """
   
-  # From list of IDs create regex pattern to match speaker IDs for statemens to be extracted.
-  speakerID_pattern = re.compile(r'<SPEAKER ID="?(' + '|'.join(ids) +')"? ')
-
-  # Open EuroParl source file and read it linewise to locate statements to be extracted according to speakerID
-  # All of these statements will be written to separate output files.
-  with open(filename_input, 'rt', encoding='utf-8', errors='ignore') as fl_in:
-    prev_line = None
-    do_extraction = False
-    for line in fl_in:
-      if not prev_line == None:
-        current_line = prev_line.strip()
-        next_line = line.strip()
-        # If regex matches speaker ID in current source file line then write current line to output file and write all subsequent source line lines
-        # to output file until the occurrence of next XML metadata tag.
-        if speakerID_pattern.search(current_line):
-          linecounter = 0 # Count lines for subseqeunt deletion of files that do not contain any text except for XML metadata tags. 
-          statementID = speakerID_pattern.search(current_line).group(1)
-          fname_out = filename_output.replace('xIDx', statementID) # Generate output file name
-          open(fname_out, mode='w').close() # Make sure outputfile exists and is empty if already existent.
-          fl_out = open(fname_out, mode='a', encoding='utf-8')
-          do_extraction = True          
-        if do_extraction == True: 
-          if isCleanOutput:
-            current_line = clean_line(current_line)
-          if len(current_line) > 0:
-            fl_out.write(current_line+"\n")
-            linecounter += 1
-        if do_extraction == True and xmlTag.search(next_line):
-          do_extraction = False
-          fl_out.close()
-          # Remove file if it is empty or consists only of XML meta tag
-          if linecounter < min_lines_per_file:
-            os.remove(fname_out)
-      prev_line = line.strip()
-    current_line = prev_line
-    next_line = ''
-    if do_extraction == True:
-      if args.cleanOutput:
-        current_line = clean_line(current_line)
+  if isinstance(filename_output, str):
+    filenames_output = dict.fromkeys(ids, filename_output)
+  else:
+    filenames_output = filename_output
+
+  # Read statements to be extracted from EuroParl source file (or from cache), i.e. the lines from the speaker tag of each statement
+  # until the occurrence of next XML metadata tag. Each statement will be written to a separate output file.
+  # If byte offsets of speaker turns are indexed, only the turns to be extracted are read from the source file
+  if cache is not None:
+    statements = cache.get(filename_input, ids)
+  else:
+    statements = read_statements(filename_input, ids, extraction.turn_index)
+  for statementID, lines, end in statements:
+    fname_out = filenames_output[statementID].replace('xIDx', statementID) # Generate output file name
+    lines_out = [] # Lines of output file
+    for current_line in lines:
+      if extraction.isCleanOutput:
+        current_line = clean_line(current_line, extraction.isCleanOutput)
       if len(current_line) > 0:
-        fl_out.write(current_line)
-        linecounter += 1
-      fl_out.close()
-      # Remove file if it is empty of consists only of XML meta tag
-      if linecounter < min_lines_per_file:
-        os.remove(fname_out)
+        lines_out.append(current_line+"\n")
+    if end == 'eof' and len(current_line) > 0: # Last line of source file has no line break
+      lines_out[-1] = current_line
+    # Discard file if it is empty or consists only of XML meta tag (unless statement is directly followed by next statement)
+    if end != 'turn' and len(lines_out) < extraction.min_lines_per_file:
+      extraction.output_sink.discard(fname_out)
+    else:
+      extraction.output_sink.write(fname_out, "".join(lines_out))
 ##### END OF FUNCTION DECLARATION
 
 
 
-def clean_line(txt):
-  """ Remove XML metadata tag and/or additional language tag from current txt.
+def create_folders_comparable_translated(outDir, sl, tl):
+  """ Create subfolders in output folder for each language combination of comparable translated corpus.
     
   Arguments:
-    txt (str) -- Text to be cleaned.
+    outDir (str) -- Path to output folder.
+    sl (str) -- Two-letter source language identifier.
+    tl (str) -- Two-letter target language identifier.
 
   Returns:
-    txt(str) -- The cleaned text.
+    Nothing; instead, it creates the subfolders for each language combination.
+  
+  Raises:
+    OSError
+    
   """
-  if isCleanOutput == "lang" or isCleanOutput == "both":
-    if langcode.search(txt) and not langcode_exception.search(txt):
-      txt = re.sub(langcode, '', txt)
-  if isCleanOutput == "speaker" or isCleanOutput == "both":
-    if xmlTag_all.search(txt):
-      txt = ""
-  txt = re.sub('\s{2,}', ' ', txt)    
-  return(txt.strip())
+  os.makedirs(outDir + "/comparable/translated/" + tl + "/" + sl + "-" + tl, exist_ok=True)
 ##### END OF FUNCTION DECLARATION
 
 
 
-def extract_comparable_translated(statements_sourcelanguage, sl, tl):
-  """ Extract translated comparable statements from EuroParl source files.
+def prepare_parallel_extraction(extraction, statements_sourcelanguage, sl, tl):
+  """ Prepare extraction of parallel statements from EuroParl source files.
+
+  Output folders are created here, so that work units can be run by several worker processes (see function run_extraction()).
     
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     statements_sourcelanguage (dict) -- The statements in the source language.
       Dictionary keys: File identifiers of EuroParl source files (e.g. 11-04-06-009).
       Dictionary values: Speaker IDs (e.g. 158) that point to translated statements in source files..
@@ -618,108 +617,144 @@ def extract_comparable_translated(statements_sourcelanguage, sl, tl):
     tl (str) -- Two-letter target language identifier.
 
   Returns:
-    Nothing; instead, it calls function write_statements_to_txt(fn_in, fn_out, ids) to write extracted statements to output files.
+    work_units (list) -- One tuple of arguments (identifier, ids, sl, tl) of function extract_parallel(identifier, ids, sl, tl)
+      per source file available in both languages.
   
   """
+  create_folders_parallel(extraction, sl, tl)
+  work_units = []
   for identifier in statements_sourcelanguage.keys():
-    # Generate filenames for input and output files.
-    # Input: EuroParl source file in given language with corresponding identifier from statements_translated.
-    # Output file contains:
-    #    1) Europarl identifier (without prefix ep-)
-    #    2) Statement ID 
-    #    3) Target language code
-    fname_input = (inDir + "/" + tl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
-    fname_output = (outDir + "/comparable/translated/" + tl + "/" + sl + "-" + tl + "/" + identifier + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')
+    fname_input_sl = (extraction.inDir + "/" + sl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
+    fname_input_tl = (extraction.inDir + "/" + tl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
     
-    if not os.path.exists(fname_input):
+    # Continue with next iteration of loop if input file and/or output file non-existent in input folder
+    if not (os.path.exists(fname_input_sl) and os.path.exists(fname_input_tl)):
       continue
-    create_folders_comparable_translated(outDir, sl, tl)
-    if args.debug:
-      logfile.write("Extracting translated comparable text from\t%s (Turns: %s)\n" %(fname_input, " ".join(statements_sourcelanguage[identifier])))
-    write_statements_to_txt(fname_input, fname_output, statements_sourcelanguage[identifier])
+    work_units.append((identifier, statements_sourcelanguage[identifier], sl, tl))
+  return work_units
 ##### END OF FUNCTION DECLARATION
 
 
 
-def create_folders_comparable_translated(outDir, sl, tl):
-  """ Create subfolders in output folder for each language combination of comparable translated corpus.
+def extract_parallel(extraction, identifier, ids, sl, tl, cache=None):
+  """ Extract parallel statements from the EuroParl source files of one session.
     
   Arguments:
-    outDir (str) -- Path to output folder.
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    identifier (str) -- File identifier of EuroParl source files (e.g. 11-04-06-009).
+    ids (list) -- Speaker IDs (e.g. 158) that point to translated statements in source files.
     sl (str) -- Two-letter source language identifier.
     tl (str) -- Two-letter target language identifier.
+    cache (:obj: 'StatementCache') -- Cache of statements read from source files (default: extraction.statement_cache).
 
   Returns:
-    Nothing; instead, it creates the subfolders for each language combination.
+    alignments (dict) -- Keys: speaker IDs; values: aligned statements (see function align_statements()), or empty dictionary
+      if no aligned output is required. Besides, it calls function write_statements_to_txt(fn_in, fn_out, ids, cache) to write
+      non-aligned extracted statements to output files and function align_statements(fn_in_sl, fn_in_tl, fn_out_generic, identifiers, sl, tl, cache)
+      to write aligned output files.
+    Statements read from the source files are kept in extraction.statement_cache, so that consecutive work units of the same session
+    (i.e. the target languages of a source language file) read the source language file only once.
   
-  Raises:
-    OSError
+  """
+  if cache is None:
+    cache = extraction.statement_cache
+  # Generate filenames for input and output.
+  # Input: TL file with corresponding identifier from statements_sourcelanguage.
+  # Outputfile contains:
+  #    1) Europarl identifier (without prefix ep-)
+  #    2) Statement ID
+  #    3) target language code
+  fname_input_sl = (extraction.inDir + "/" + sl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
+  fname_input_tl = (extraction.inDir + "/" + tl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
+
+  if extraction.outputToTxt:
+    fname_output_sl = (extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl/" + identifier + "_" + "xIDx" + "_" + sl.lower() + ".txt").replace('//', '/')
+    fname_output_tl = (extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl/" + identifier + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')    
     
+    write_statements_to_txt(extraction, fname_input_sl, fname_output_sl, ids, cache)
+    write_statements_to_txt(extraction, fname_input_tl, fname_output_tl, ids, cache)
+
+  if extraction.outputToTab or extraction.outputToTmx or extraction.nWayFormat:
+    fname_output_generic = (extraction.outDir + "/parallel/" + sl + "-" + tl + "/xyz/" + identifier + "_" + "xIDx" + "_" + sl.lower() + "-" + tl.lower() + ".xyz").replace('//', '/')
+    return align_statements(extraction, fname_input_sl, fname_input_tl, fname_output_generic, ids, sl, tl, cache)
+  return {}
+##### END OF FUNCTION DECLARATION
+
+
+
+def group_work_units_by_session(work_units):
+  """ Group work units of function extract_parallel() by session for multi-target extraction (see function extract_multi_target()).
+
+  Arguments:
+    work_units (list) -- Tuples of arguments (identifier, ids, sl, tl) of function extract_parallel(identifier, ids, sl, tl).
+
+  Returns:
+    work_units (list) -- One tuple of arguments (identifier, pairs) of function extract_multi_target(identifier, pairs) per session,
+      where pairs lists the 3-tuples (ids, sl, tl) of all language pairs of the session in their original order.
+
   """
-  try:
-    os.makedirs(outDir + "/comparable/translated/" + tl + "/" + sl + "-" + tl)
-  except OSError:
-    pass
+  pairs_by_session = {}
+  for identifier, ids, sl, tl in work_units:
+    pairs_by_session.setdefault(identifier, []).append((ids, sl, tl))
+  return list(pairs_by_session.items())
 ##### END OF FUNCTION DECLARATION
 
 
 
-def extract_parallel(statements_sourcelanguage, sl, tl):
-  """ Extract parallel statements from EuroParl source files.
-    
+def extract_multi_target(extraction, identifier, pairs):
+  """ Extract parallel statements of all language pairs from the EuroParl source files of one session in a single pass.
+
+  The source file of each language is read once, retrieving the statements of all source languages it is needed for (as source
+  or target language); all language pairs are then extracted from these statements as by function extract_parallel(), which yields
+  the same output files. Hence, the number of source files read grows linearly with the number of languages rather than with
+  the number of language pairs. If N-way output is selected (-nw), the alignments of each source language statement with all
+  its target languages are merged into one N-way aligned file (see function write_to_nway()).
+
   Arguments:
-    statements_sourcelanguage (dict) -- The statements in the source language.
-      Dictionary keys: File identifiers of EuroParl source files (e.g. 11-04-06-009).
-      Dictionary values: Speaker IDs (e.g. 158) that point to translated statements in source files..
-    sl (str) -- Two-letter source language identifier.
-    tl (str) -- Two-letter target language identifier.
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    identifier (str) -- File identifier of EuroParl source files (e.g. 11-04-06-009).
+    pairs (list) -- 3-tuples (ids, sl, tl) of language pairs, where ids are the speaker IDs of the statements in source language sl.
 
   Returns:
-    Nothing; instead, it calls function write_statements_to_txt(fn_in, fn_out, ids) to write non-aligned extracted statements to output files or
-    function align_statements(fn_in_sl, fn_in_tl, fn_out_generic, identifiers, sl, tl) to write aligned output files.
-  
+    Nothing; instead, it writes the output files of all language pairs and, if selected, N-way aligned output files.
+
   """
-  create_folders_parallel(outDir, sl, tl)
-  for identifier in statements_sourcelanguage.keys():
-    # Generate filenames for input and output.
-    # Input: TL file with corresponding identifier from statements_sourcelanguage.
-    # Outputfile contains:
-    #    1) Europarl identifier (without prefix ep-)
-    #    2) Statement ID
-    #    3) target language code
-    fname_input_sl = (inDir + "/" + sl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
-    fname_input_tl = (inDir + "/" + tl.lower() + "/ep-" + identifier + ".txt").replace('//', '/')
-    
-    # Continue with next iteration of loop if input file and/or output file non-existent in input folder
-    if not (os.path.exists(fname_input_sl) and os.path.exists(fname_input_tl)):
-      continue
-    
-    if outputToTxt:
-      fname_output_sl = (outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl/" + identifier + "_" + "xIDx" + "_" + sl.lower() + ".txt").replace('//', '/')
-      fname_output_tl = (outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl/" + identifier + "_" + "xIDx" + "_" + tl.lower() + ".txt").replace('//', '/')    
-      
-      write_statements_to_txt(fname_input_sl, fname_output_sl, statements_sourcelanguage[identifier])
-      write_statements_to_txt(fname_input_tl, fname_output_tl, statements_sourcelanguage[identifier])
-
-      dirname_output_sl = (outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl/").replace('//', '/')
-      dirname_output_tl = (outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl/").replace('//', '/')    
-
-    if outputToTab or outputToTmx:
-      fname_output_generic = (outDir + "/parallel/" + sl + "-" + tl + "/xyz/" + identifier + "_" + "xIDx" + "_" + sl.lower() + "-" + tl.lower() + ".xyz").replace('//', '/')
-      align_statements(fname_input_sl, fname_input_tl, fname_output_generic, statements_sourcelanguage[identifier], sl, tl)
-
-  # Remove spurious monolingual files from language-pair-specific subfolder of parallel corpus
-  if outputToTxt:
-    clean_parallel_texts(sl.lower(), dirname_output_sl, tl.lower(), dirname_output_tl)
+  # Speaker IDs of all statements needed from the source file of each language
+  ids_by_language = {}
+  for ids, sl, tl in pairs:
+    ids_by_language.setdefault(sl, set()).update(ids)
+    ids_by_language.setdefault(tl, set()).update(ids)
+  # The statements of a session are kept for all its language pairs, which request subsets of them (see class StatementCache)
+  session_cache = StatementCache(sys.maxsize, extraction.turn_index)
+  for language, ids in ids_by_language.items():
+    session_cache.get((extraction.inDir + "/" + language.lower() + "/ep-" + identifier + ".txt").replace('//', '/'), ids)
+
+  alignments_by_sl = {} # Keys: source languages; values: lists of target languages and their alignments
+  for ids, sl, tl in pairs:
+    alignments = extract_parallel(extraction, identifier, ids, sl, tl, session_cache)
+    alignments_by_sl.setdefault(sl, []).append((tl, alignments))
+
+  if extraction.nWayFormat:
+    for sl, alignments_tl in alignments_by_sl.items():
+      # Statement IDs in the order of the source file
+      statementIDs = []
+      for tl, alignments in alignments_tl:
+        statementIDs.extend(statementID for statementID in alignments if statementID not in statementIDs)
+      for statementID in statementIDs:
+        targets = [(tl, alignments[statementID]) for tl, alignments in alignments_tl if statementID in alignments]
+        rows = merge_alignments([(sl_sents, tl_sents) for tl, (metadata, sl_sents, tl_sents) in targets])
+        fn = (extraction.outDir + "/parallel/" + sl + "-nway/" + identifier + "_" + statementID + "_" + sl.lower() + ".xyz").replace('//', '/')
+        if len(rows) > 0:
+          write_to_nway(extraction, fn, [sl] + [tl for tl, alignment in targets], rows)
 ##### END OF FUNCTION DECLARATION
 
 
 
-def create_folders_parallel(outDir, sl, tl):
+def create_folders_parallel(extraction, sl, tl):
   """ Create subfolders in output folder for each language combination of parallel corpus.
     
   Arguments:
-    outDir (str) -- Path to output folder.
+    extraction (:obj: 'Extraction') -- Settings of the extraction, including output folder and output formats.
     sl (str) -- Two-letter source language identifier
     tl (str) -- Two-letter target language identifier
 
@@ -730,173 +765,93 @@ def create_folders_parallel(outDir, sl, tl):
     OSError
     
   """
-  if outputToTmx:
-    try:
-      os.makedirs(outDir + "/parallel/" + sl + "-" + tl + "/tmx")
-    except OSError:
-      pass
+  if extraction.outputToTmx:
+    os.makedirs(extraction.outDir + "/parallel/" + sl + "-" + tl + "/tmx", exist_ok=True)
     
-  if outputToTab:
-    try:
-      os.makedirs(outDir + "/parallel/" + sl + "-" + tl + "/tab")
-    except OSError:
-      pass
+  if extraction.outputToTab:
+    os.makedirs(extraction.outDir + "/parallel/" + sl + "-" + tl + "/tab", exist_ok=True)
     
-  if outputToTxt:
-    try:
-      os.makedirs(outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl")
-      os.makedirs(outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl")
-    except OSError:
-      pass
+  if extraction.outputToTxt:
+    os.makedirs(extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl", exist_ok=True)
+    os.makedirs(extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl", exist_ok=True)
 ##### END OF FUNCTION DECLARATION
 
 
   
-def align_statements(filename_in_sl, filename_in_tl, filename_out_generic, ids, sl, tl):
+def align_statements(extraction, filename_in_sl, filename_in_tl, filename_out_generic, ids, sl, tl, cache=None):
   """ Align parallel statements using third-party implementation of Gale-Church algorithm.
   
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     filename_in_sl (str) -- Name of EuroParl source language input file.
     filename_in_tl (str) -- Name of EuroParl target language input file.
     filename_out_generic (str) -- Generic placeholder for output file in aligned TAB or TMX format. 
     ids (str) -- List of IDs (e.g. ((e.g. 135, 058,...)) identifying speaker turns to be written to output file.
     sl (str) -- Two-character source language identifier.
     tl (str) -- Two-character target language identifier.
+    cache (:obj: 'StatementCache') -- Optional cache of statements read from source files.
 
   Returns:
-    Nothing; instead, it writes aligned output files in specified format.
+    alignments (dict) -- Keys: speaker IDs of aligned statements; values: 3-tuples (metadata, sl_sents, tl_sents) returned by
+      function align_statement() of module alignment. Besides, it writes aligned output files in specified format.
   """
     
-  # From list of IDs create regex pattern to match speaker IDs for parallel statements to be extracted
-  speakerID_pattern = re.compile(r'<SPEAKER ID="?(' + '|'.join(ids) +')"? ')
-  
-  sentences_sl = {} # Dictionary storing source language sentences of bitext (Keys: names of output file, values:the sentences)
-  sentences_tl = {} # Dictionary storing target language sentences of bitext (Keys: names of output file, values:the sentences)
-  
-  # Loop linewise over EuroParl input file for source language to extract statements that subsequently are to be aligned.
-  # All of these statements will be written to separate aligned output files
-  with open(filename_in_sl, 'rt', encoding='utf-8', errors='ignore') as fl_in_sl:    
-    prev_line = None
-    do_extraction = False
-    for line in fl_in_sl:
-      if not prev_line == None:
-        current_line = prev_line.strip()
-        next_line = line.strip()
-        
-        # If regex matches speaker ID in current line create list that contains paragraph markers at beginning and end (<P>) and
-        # the sentences of speaker turn (one sentence per list element).
-        # All lines from speaker ID match until occurrence of a next XML metadata tag will be stored in list.
-        if speakerID_pattern.search(current_line):
-          statementID = speakerID_pattern.search(current_line).group(1)
-          fname_out = filename_out_generic.replace('xIDx', statementID)
-          sentences_sl[fname_out] = ['<P>', current_line, '<P>'] # ['<P>', '<END_SL>'] 
-          do_extraction = True
-        if do_extraction == True and not speakerID_pattern.search(current_line):
-          # Add current line to penultimate position of SL sentence list (the last position is reserved for <P>) 
-          sentences_sl[fname_out].insert(-1, current_line)
-        # Stop extracting lines from source file if next line contains XML metadata tag
-        if do_extraction == True and xmlTag.search(next_line):
-          do_extraction = False
-      prev_line = line.strip()
-    current_line = prev_line
-    next_line = ''
-    if do_extraction == True:
-      sentences_sl[fname_out].insert(-1, current_line)
-  fl_in_sl.close()
-  ## Extraction of SL sentences to dictionary sentences_sl completed.
-
-
-  # Loop linewise over EuroParl input file for target language to extract statements that subsequently are to be aligned.
-  # All of these statements will be written to separate aligned output files  with open(filename_in_tl, 'rt', encoding='utf-8', errors='ignore') as fl_in_tl:
-  with open(filename_in_tl, 'rt', encoding='utf-8', errors='ignore') as fl_in_tl:
-    if args.debug:
-      logfile.write("\n####################################### NEXT FILE ########################\n\nOPENING TL INPUT FILE FOR ALIGNMENT:\t%s\n\n" %(filename_in_tl))
-    prev_line_tl = None
-    do_extraction = False
-    for line_tl in fl_in_tl:
-      if not prev_line_tl == None:
-        current_line_tl = prev_line_tl.strip()
-        next_line_tl = line_tl.strip()
-        
-        # If regex matches speaker ID in current line create list that contains paragraph markers at beginning and end (<P>) and
-        # the sentences of speaker turn (one sentence per list element).
-        # All lines from speaker ID match until occurrence of a next XML metadata tag will be stored in list.
-        if speakerID_pattern.search(current_line_tl):
-          statementID = speakerID_pattern.search(current_line_tl).group(1)
-          fname_out = filename_out_generic.replace('xIDx', statementID)
-          
-          sentences_tl[fname_out] = ['<P>', current_line_tl ,'<P>'] # ['<P>', '<END_TL>'] 
-          do_extraction = True
-          
-        if do_extraction == True and not speakerID_pattern.search(current_line_tl):
-          sentences_tl[fname_out].insert(-1, current_line_tl)
-        if do_extraction == True and xmlTag.search(next_line_tl):
-          do_extraction = False
-
-      prev_line_tl = line_tl.strip()
-    current_line_tl = prev_line_tl
-    next_line_tl = ''
-    if do_extraction == True:
-      sentences_tl[fname_out].insert(-1, current_line_tl)
-  fl_in_tl.close()
-  ## Extraction of TL sentences to dictionary sentences_tl completed.
+  # Read statements from EuroParl input files for source and target language (from cache, if any), i.e. all lines from speaker tag
+  # until occurrence of a next XML metadata tag. Keys: speaker IDs, values: lines of the statement
+  if cache is not None:
+    statements_sl = cache.get(filename_in_sl, ids)
+  else:
+    statements_sl = read_statements(filename_in_sl, ids, extraction.turn_index)
+  lines_sl = {statementID: lines for statementID, lines, end in statements_sl}
+  ## Extraction of SL sentences completed.
+
+  if extraction.args.debug:
+    extraction.logfile.write("\n####################################### NEXT FILE ########################\n\nOPENING TL INPUT FILE FOR ALIGNMENT:\t%s\n\n" %(filename_in_tl))
+  if cache is not None:
+    statements_tl = cache.get(filename_in_tl, ids)
+  else:
+    statements_tl = read_statements(filename_in_tl, ids, extraction.turn_index)
+  lines_tl = {statementID: lines for statementID, lines, end in statements_tl}
+  ## Extraction of TL sentences completed.
 
   # Perform sentence alignment:
-  # Loop over dictionary of SL sentences (accessible via output file names) in order to:
-  #    1)  remove adjacent paragraph markers in sentence lists (e.g. '<P>', '<P>')
-  #    2)  remove segments (i.e. all sentences between two <P> marks) from both SL and TL sentence list if corresponding segments are disproportional in terms of nubers of sentences
-  #        (This is needed to reduce number of alignment errors, if e.g. the SL segment consists of 1 sentence and the corresponding TL segment of 5 sentences).
-  #    3)  Align SL with TL segments using Gale-Church algorithm
-  #    4) Post-process resulting alignments by merging empty alignments at segment beginning or end.
-  for fn in sentences_sl.keys():
-
-    if not (fn in sentences_tl.keys() and len(sentences_sl[fn]) > 3 and len(sentences_tl[fn]) > 3):
-      continue
-    if args.debug:
-      logfile.write("OUTPUT FILE:\t%s\n\n> SL Segments Unprocessed:\n%s\n\n" %(fn, sentences_sl[fn]))
+  # Collect statements in SL with their TL counterpart and align all of them at once (see function align_statement_batch() of module alignment)
+  statementIDs = []
+  for statementID in lines_sl.keys():
 
-    # Retrieve metadata about speaker turn and pop it from list of sentences 
-    metadata = sentences_sl[fn].pop(1)
-    sentences_tl[fn].pop(1)
-    
-    # Make sure there are no multiple adjacent <P> marks in the SL/TL sentence lists
-    sentences_sl[fn] = [a for a,b in zip(sentences_sl[fn], sentences_sl[fn][1:]+[not sentences_sl[fn][-1]]) if a != b or a != "<P>"]
-    sentences_tl[fn] = [a for a,b in zip(sentences_tl[fn], sentences_tl[fn][1:]+[not sentences_tl[fn][-1]]) if a != b or a != "<P>"]
-      
-    # Continue with next iteration (i.e. next file) if number of paragraphs in speaker turn differs across SL and TL
-    if sentences_sl[fn].count("<P>") != sentences_tl[fn].count("<P>"):
+    # Continue with next iteration if statement is missing in TL or SL/TL statement consists of speaker tag only
+    if not (statementID in lines_tl.keys() and len(lines_sl[statementID]) > 1 and len(lines_tl[statementID]) > 1):
       continue
-    
-    sentences_sl[fn], sentences_tl[fn] = remove_unevenly_long_segments(sentences_sl[fn], sentences_tl[fn])
-    
-    # Continue with next iteration (i.e. file) if sentence list consists only of one beginning and one end paragraph mark (i.e. if length of sentene list < 3)
-    if len(sentences_sl[fn]) < 3:
+    statementIDs.append(statementID)
+    if extraction.args.debug:
+      fn = filename_out_generic.replace('xIDx', statementID)
+      extraction.logfile.write("OUTPUT FILE:\t%s\n\n> SL Segments Unprocessed:\n%s\n\n" %(fn, ['<P>'] + lines_sl[statementID] + ['<P>']))
+  statistics = extraction.band_statistics.setdefault((sl, tl), BandStatistics()) if extraction.band_statistics is not None else None
+  statements = [(lines_sl[statementID], lines_tl[statementID]) for statementID in statementIDs]
+  batch = align_statement_batch(statements, extraction.isCleanOutput, extraction.args.alignmentEngine, extraction.args.bandWidth, statistics, extraction.args.costError or None)
+
+  alignments = {}
+  for statementID, alignment in zip(statementIDs, batch):
+    # Continue with next iteration (i.e. next file) if statement cannot be aligned
+    if alignment is None:
       continue
-
-    # Run Gale-Church alignment algorithm to align SL sentences with TL sentences
-    sl_sents, tl_sents = gale_church_alignment(sentences_sl[fn], sentences_tl[fn])
-    # Merge adjacent empty alignments at segment beginning/end to avoid zero-alignments
-    sl_sents, tl_sents = postprocess_alignments(sl_sents, tl_sents)
+    fn = filename_out_generic.replace('xIDx', statementID)
+    metadata, sl_sents, tl_sents = alignment
+    alignments[statementID] = alignment
     
-    sl_sents = sl_sents[1:-1] # Remove first and last element, i.e. <P> marks
-    tl_sents = tl_sents[1:-1] # Remove first and last element, i.e. <P> marks
-    
-    if isCleanOutput:
-      for i in range(len(sl_sents)):
-        sl_sents[i] = clean_line(sl_sents[i])
-        tl_sents[i] = clean_line(tl_sents[i])
-    
-    if outputToTab:
-      write_to_tab(fn, metadata, sl_sents, tl_sents)  
-    if outputToTmx:
-      write_to_tmx(fn, sl, tl, sl_sents, tl_sents)
+    if extraction.outputToTab:
+      write_to_tab(extraction, fn, metadata, sl_sents, tl_sents)  
+    if extraction.outputToTmx:
+      write_to_tmx(extraction, fn, sl, tl, sl_sents, tl_sents)
+  return alignments
 ##### END OF DECLARATION OF FUNCTION align_statements()
 
 
-def write_to_tab(fn, metadata, sl_sents, tl_sents):
+def write_to_tab(extraction, fn, metadata, sl_sents, tl_sents):
   """ Write aligned sentences to output file (aligned SL and TL sentences separated by tabulator, one alignment per line).
   
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     fn (str) -- Generic placeholder name of aligned output file (e.g. out/parallel/PL-ES/xyz/07-11-14-013_395_pl-es.xyz)
     metadata (str) -- Metadata XML tag containing speaker and language information
     sl_sents (list) -- SL sentences, equal in length as tl_sents; aligned SL/TL sentences are matched by list index.
@@ -906,25 +861,26 @@ def write_to_tab(fn, metadata, sl_sents, tl_sents):
     Nothing; instead, it writes sentence-aligned output files in tab-separated output format.
   """
   fn_tab = fn.replace("xyz", "tab") # Replace generic output name with output name for tab format
-  open(fn_tab, mode='w').close() # make sure output file exists
-  with open(fn_tab, mode='a', encoding='utf-8') as fl_out_tab:
-    if not (isCleanOutput == "speaker" or isCleanOutput == "both"):
-      fl_out_tab.write("%s\n" %(metadata))
-    for i in range(len(sl_sents)):
-      if sl_sents[i] == "<P>":
-        fl_out_tab.write("<P>\n")
-      else:
-        # Do not output 1:0 or 0:1 alignments , i.e. if aligned segment is empty in either SL or TL
-        if len(sl_sents[i]) > 0 and len(tl_sents[i]) > 0:
-          fl_out_tab.write("%s\t%s\n" %(sl_sents[i], tl_sents[i]))
+  lines_out = []
+  if not (extraction.isCleanOutput == "speaker" or extraction.isCleanOutput == "both"):
+    lines_out.append("%s\n" %(metadata))
+  for i in range(len(sl_sents)):
+    if sl_sents[i] == "<P>":
+      lines_out.append("<P>\n")
+    else:
+      # Do not output 1:0 or 0:1 alignments , i.e. if aligned segment is empty in either SL or TL
+      if len(sl_sents[i]) > 0 and len(tl_sents[i]) > 0:
+        lines_out.append("%s\t%s\n" %(sl_sents[i], tl_sents[i]))
+  extraction.output_sink.write(fn_tab, "".join(lines_out))
 ##### END OF FUNCTION DECLARATION
 
 
 
-def write_to_tmx(fn, sl, tl, sl_sents, tl_sents):
+def write_to_tmx(extraction, fn, sl, tl, sl_sents, tl_sents):
   """ Write aligned sentences to TMX output file.
   
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     fn (str) -- Generic placeholder name of aligned output file (e.g. out/parallel/PL-ES/xyz/07-11-14-013_395_pl-es.xyz)
     sl (str) -- Two-character source language code.
     tl (str) -- Two-character target language code.
@@ -936,180 +892,90 @@ def write_to_tmx(fn, sl, tl, sl_sents, tl_sents):
   """
   fn_tmx = fn.replace("xyz", "tmx")
   date = datetime.now().isoformat()
-  open(fn_tmx, mode='w').close() # make sure outputfile exists
-  with open(fn_tmx, mode='a', encoding='utf-8') as fl_out_tmx:
-    fl_out_tmx.write("<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"no\"?>\n"\
-                     "<tmx version=\"1.4\">\n"\
-                     " <header creationtool=\"EuroParlExtract\" creationtoolversion=\"1.0\" creationdate=\"%s\" segtype=\"sentence\" "\
-                     "adminlang=\"en-GB\" srclang=\"%s\" datatype=\"plaintext\">\n"\
-                     " </header>\n"\
-                     " <body>\n"\
-                     %(date, sl.lower()))
-    for i in range(len(sl_sents)):
-
-      # Continue with next iteration (i.e. next sentence) if:
-      #    - the sentence == <P>, or
-      #    - either of SL or TL sentences is empty (i.e. if we have a zero alignment)
-      if sl_sents[i] == "<P>" or len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0:
-        continue
-   
-      fl_out_tmx.write("  <tu>\n"\
-                       "   <tuv xml:lang=\"%s\"><seg>%s</seg></tuv>\n"\
-                       "   <tuv xml:lang=\"%s\"><seg>%s</seg></tuv>\n"\
-                       "  </tu>\n"\
-                       %(sl.lower(), sl_sents[i], tl.lower(), tl_sents[i]))
-    # Close body and tmx tags upon loop over entire file.
-    fl_out_tmx.write(" </body>\n"\
-                     "</tmx>")
+  lines_out = ["<?xml version=\"1.0\" encoding=\"UTF-8\" standalone=\"no\"?>\n"\
+               "<tmx version=\"1.4\">\n"\
+               " <header creationtool=\"EuroParlExtract\" creationtoolversion=\"1.0\" creationdate=\"%s\" segtype=\"sentence\" "\
+               "adminlang=\"en-GB\" srclang=\"%s\" datatype=\"plaintext\">\n"\
+               " </header>\n"\
+               " <body>\n"\
+               %(date, sl.lower())]
+  for i in range(len(sl_sents)):
+
+    # Continue with next iteration (i.e. next sentence) if:
+    #    - the sentence == <P>, or
+    #    - either of SL or TL sentences is empty (i.e. if we have a zero alignment)
+    if sl_sents[i] == "<P>" or len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0:
+      continue
+ 
+    lines_out.append("  <tu>\n"\
+                     "   <tuv xml:lang=\"%s\"><seg>%s</seg></tuv>\n"\
+                     "   <tuv xml:lang=\"%s\"><seg>%s</seg></tuv>\n"\
+                     "  </tu>\n"\
+                     %(sl.lower(), sl_sents[i], tl.lower(), tl_sents[i]))
+  # Close body and tmx tags upon loop over entire file.
+  lines_out.append(" </body>\n"\
+                   "</tmx>")
+  extraction.output_sink.write(fn_tmx, "".join(lines_out))
 ##### END OF FUNCTION DECLARATION
 
 
 
-def postprocess_alignments(sl_sents, tl_sents):
-  """ Merge adjacent sentences at beginning/end of paragraph if corresponding aligned counterpart is empty.
-  The two input lists must be equal in length and have paragraph marks (<P>) in exactly the same positions.
-    
-  Arguments:
-    sl_sents (list) -- Source language sentences, including, paragraph markers.
-    tl_sents (list) -- Source language sentences, including, paragraph markers.
-
-  Returns:
-    sl_sents (list) -- Postprecessed list of source language sentences, including paragraph markers.
-    tl_sents (list) -- Postprecessed list of target language sentences, including paragraph markers.
-
-  """
-  # Iterate over list of source language sentences using while; for each SL sentence check if corresponding TL sentence
-  # at same position is empty. If either SL or corresponding TL sentence at given position is empty AND the SL-TL sentence pair is at paragraph BEGINNING (i.e. if previous list item == "<P>")
-  # then concatenate current sentence with next sentence in both SL and TL as well as remove the next sentence from the list. Subsequently, go back two positions in list and continue iteration.
-  # Example:
-  # SL = ['<P>', 'a', 'b', 'c', 'd', '<P>'] => becomes    ['<P>', 'a b c', 'd', <P>]
-  # TL = ['<P>', 'A B C', '', '', 'D', '<P>'] => becomes  ['<P>', 'A B C', 'd', <P>]
-  i = 0
-  while i < len(sl_sents)-1:
-    if (len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0) and prevIsParagraph == True:
-      sl_sents[i] = (sl_sents[i] + " " + sl_sents[i+1]).strip()
-      sl_sents.pop(i+1)
-      tl_sents[i] = (tl_sents[i] + " " + tl_sents[i+1]).strip()
-      tl_sents.pop(i+1)
-      i -= 1
-    if sl_sents[i] == "<P>":
-      lastparindex = i
-      prevIsParagraph = True
-    else:
-      prevIsParagraph = False
-    i += 1
-
-  # Now the same for sentences directly BEFORE paragraph ends:
-  # Iterate over list of source language sentences using while and for each SL sentence check if corresponding TL sentence
-  # at same position is empty. If either SL or corresponding TL sentence at given position is empty AND the SL-TL sentence pair is at paragraph END (i.e. if previous list item == "<P>")
-  # then concatenate previous sentence with current sentence in both SL and TL as well as remove the current sentence from the list. Subsequently, go back two positions in list and continue iteration over list.
-  # Example:
-  # SL = ['<P>', 'a', 'b', 'c', '<P>'] => becomes    ['<P>', 'a', 'b c', <P>]
-  # TL = ['<P>', 'A', 'B C', '', '<P>'] => becomes   ['<P>', 'A', 'B C', <P>]
-  i = 0
-  while i < len(sl_sents) - 1:
-    if sl_sents[i+1] == "<P>":
-      nextIsParagraph = True
-    else:
-      nextIsParagraph = False
-    if (len(sl_sents[i]) == 0 or len(tl_sents[i]) == 0) and nextIsParagraph == True:
-      sl_sents[i-1] = (sl_sents[i-1] + " " + sl_sents[i]).strip()
-      sl_sents.pop(i)
-      tl_sents[i-1] = (tl_sents[i-1] + " " + tl_sents[i]).strip()
-      tl_sents.pop(i)
-      i -= 2
-    i += 1
-  return sl_sents, tl_sents
-##### END OF FUNCTION DECLARATION
-
+def write_to_nway(extraction, fn, languages, rows):
+  """ Write N-way aligned sentences to output file in TSV format (-nw tsv) or JSONL format (-nw jsonl).
 
+  TSV files start with a header line of language codes, followed by one row of aligned segments per line (separated by tabulator);
+  JSONL files hold one JSON object per row, mapping language codes to aligned segments.
 
-def remove_unevenly_long_segments(sl_sents, tl_sents):
-  """Remove entire segment between two <P> markers if segment length difference across SL/TL above certain threshold,
-  i.e. if either the SL or TL segment consists of much more sentences than its counterpart in the other language.  
-  
   Arguments:
-    sl_sents (dict) -- Source language sentences, represented as strings.
-      Keys: names of output file
-      Values: List of the sentences
-    tl_sents (dict) -- Target language sentences, represented as strings.
-      Keys: names of output file
-      Values: List of the sentences
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
+    fn (str) -- Generic placeholder name of N-way aligned output file (e.g. out/parallel/PL-nway/07-11-14-013_395_pl.xyz)
+    languages (list) -- Two-character codes of source language and target languages, in the order of the segments of each row.
+    rows (list) -- Lists of aligned segments, one per language (see function merge_alignments() of module alignment).
 
   Returns:
-    sl_sents (dict) -- SL sentences, with unevenly long segments removed.
-    tl_sents (dict) -- TL sentences, with unevenly long segments removed.
-
+    Nothing; instead, it writes the N-way aligned output file.
   """
-  p_positions_sl = [i for i, n in enumerate(sl_sents) if n == "<P>"] # Determine index positions of <P> markers
-  p_positions_tl = [i for i, n in enumerate(tl_sents) if n == "<P>"] # Determine index positions of <P> markers
-
-  for i in reversed(range(len(p_positions_sl)-1)): # Iterate by index over reversed list of <P> indices, i.e. from last segment to 1st    
-    segmentStart_sl = p_positions_sl[i] # Determine start index of given SL segment
-    segmentEnd_sl = p_positions_sl[i+1] # Determine end index of given SL segment
-
-    segmentStart_tl = p_positions_tl[i] # Determine start index of given TL segment
-    segmentEnd_tl = p_positions_tl[i+1] # Determine end index of given TL segment
-
-    segmentLength_sl = abs(segmentStart_sl - segmentEnd_sl) - 1 # Get SL segment length (nr. of sentences) from start/end positions of segment
-    segmentLength_tl = abs(segmentStart_tl - segmentEnd_tl) - 1 # Get TL segment length (nr. of sentences) from start/end positions of segment
-
-    lengthRatio_sl_tl = max(segmentLength_sl, segmentLength_tl) / min(segmentLength_sl, segmentLength_tl) # Calculate ratio of length of SL segment to length of TL segment irrespective of which segment is longer
-
-    if lengthRatio_sl_tl > 2: # If SL segment has at least 3x more sentences than TL segment, or vice versa:
-      del sl_sents[segmentStart_sl : segmentEnd_sl] # Delete entire segment from list of SL segments
-      del tl_sents[segmentStart_tl : segmentEnd_tl] # Delete entire segment from list of TL segments
-
-  if len(sl_sents) == 1 and sl_sents[0] == "<P>": # If SL segment has no sentences, i.e. only one <P> mark:
-    sl_sents.append("<P>") # Append final <P> mark
-  if len(tl_sents) == 1 and tl_sents[0] == "<P>": # If TL segment has no sentences, i.e. only one <P> mark:
-      tl_sents.append("<P>") # Append final <P> mark
-
-  return sl_sents, tl_sents
+  languages = [language.lower() for language in languages]
+  if extraction.nWayFormat == "jsonl":
+    lines_out = ["%s\n" %(json.dumps(dict(zip(languages, row)), ensure_ascii=False)) for row in rows]
+  else:
+    lines_out = ["%s\n" %("\t".join(languages))] + ["%s\n" %("\t".join(row)) for row in rows]
+  extraction.output_sink.write(fn.replace("xyz", extraction.nWayFormat), "".join(lines_out))
 ##### END OF FUNCTION DECLARATION
 
 
 
-
-
-
-def clean_parallel_texts(sl, dirname_sl, tl, dirname_tl):
+def clean_parallel_texts(extraction, sl, dirname_sl, tl, dirname_tl):
   """ Delete monolingual files from parallel corpus if either SL or TL language file is missing for a given translation pair
   (e.g. remove 01_de.txt from folder DE_sl if no corresponding translation 01_it.txt is found in folder IT_tl).
     
   Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
     sl (str) -- Two-letter source language identifier.
     dirname_sl (str) -- Path to source language folder of given language pair.
     tl (str) -- Two-letter target language identifier.
     dirname_tl (str) -- Path to target language folder of given language pair.
 
   Returns:
-    Nothing; instead, it removes all files that have no corresponding file in other language of given language pair.
+    Nothing; instead, it removes all files that have no corresponding file in other language of given language pair from the output sink.
+    Files are looked up in the manifest of the output sink, i.e. among the files written during extraction, without listing the folders.
   
   """
-  files_sl = []
-  files_tl = []
-  
-  for root, dirs, files in os.walk(dirname_sl):
-    for fn in files:
-      if fn.endswith('.txt'):
-        files_sl.append(re.sub("_" + sl + ".txt", "", fn))
-
-  for root, dirs, files in os.walk(dirname_tl):
-    for fn in files:
-      if fn.endswith('.txt'):
-        files_tl.append(re.sub("_" + tl + ".txt", "", fn))
-
-  delete_from_dirname_sl = set(files_sl) - set(files_tl)
-  delete_from_dirname_tl = set(files_tl) - set(files_sl)
+  suffix_sl = "_" + sl + ".txt"
+  suffix_tl = "_" + tl + ".txt"
+  files_sl = set(fn[:-len(suffix_sl)] for fn in extraction.output_sink.documents(dirname_sl) if fn.endswith(suffix_sl))
+  files_tl = set(fn[:-len(suffix_tl)] for fn in extraction.output_sink.documents(dirname_tl) if fn.endswith(suffix_tl))
+
+  delete_from_dirname_sl = files_sl - files_tl
+  delete_from_dirname_tl = files_tl - files_sl
   
   for i in delete_from_dirname_sl:
     fn = (dirname_sl + "/" + i + "_" + sl + ".txt").replace('//', '/')
-    os.remove(fn)
+    extraction.output_sink.discard(fn)
 
   for i in delete_from_dirname_tl:
     fn = (dirname_tl + "/" + i + "_" + tl + ".txt").replace('//', '/')
-    os.remove(fn)
+    extraction.output_sink.discard(fn)
 ##### END OF FUNCTION DECLARATION 
 
 
@@ -1126,30 +992,13 @@ def clean_parallel_texts(sl, dirname_sl, tl, dirname_tl):
 
 
 ##############################################
-########## DEFINE GLOBALLY-USED REGEX PATTERNS
-# Language abbreviation codes, grouped for retrieval: language code in parenthesis
-# with optional space between code and parenthesis
-langcode = re.compile (r"\( ?(BG|CS|DA|DE|EL|EN|ES|ET|FI|FR|GA|\
-                        HU|IT|LT|LV|MT|NL|PL|PT|RO|SK|SV|SL) ?\)")
-# In some Slavic languages, "ES" followed by certain pattern is abbreviation of "European Union"
-# rather than Spanish language code. These exceptions are defined in langcode_exception 
-langcode_exception = re.compile(r'(\( ?ES ?\)( št\.? | \d{1,4} ?/| ?,? \(? ?č| Nr))')
-
-chapterTag = re.compile(r'<CHAPTER ID="?([\d_]+)"?')
-speakerTag = re.compile(r'<SPEAKER ID="?(x?\d+(_\d{3})?)"?') #?x greps optional x to capture inserted language IDs - original RegEx was: (r'<SPEAKER ID="?(\d+(_\d{3})?)"?')
-languageTag = re.compile(r'LANGUAGE="(\w{2})"')
-nameTag = re.compile(r'NAME="([^"]*)"')
-president = re.compile(r'(Πρόεδρ|Président|Formand|Președin|Elnök|Przewodnicz|\
-                              |Presid|Juhataja|Pirminink|Talman|Председа|Voorzitter|Předsed|\
-                              |Puhemies|Puheenjoh|Präsident|Priekš|Přesed|Prieks|Prési|Predsed|Preisdente|\
-                              |Preşdinte|Προεδρ|Preşedi|Представ|Ordförand|Preseda)', re.I)
-exceptions_nonroman = re.compile(r'(|Барозу|Малмстрьом|Κυριάκος|Аштън|Мишел|Гюнтер|Йоханес|Хоакин|\
-                                    |Хосе|Σπύρος|Щефан|Συλβάνα|Ευαγγελία|Оли Рен|Δημητρακόπουλος|\
-                                    |Δημήτριος|Жак|Джо|Ян|Μπ|Χρ|Χαρ)')
-xmlTag_all = re.compile(r'^<.+>$')
-xmlTag = re.compile(r'^<[^P].*>$')
-##### DEFINITION OF REGEX-PATTERNS COMPLETED
-############################################
+########## DEFINE GLOBALLY-USED OBJECTS
+# Name normaliser shared by all calls of group_speakers(); normalised names are cached across speaker turns
+name_normaliser = NameNormaliser()
+# Extraction inherited by forked worker processes (see function init_worker())
+worker_extraction = None
+##### DEFINITION OF GLOBALLY-USED OBJECTS COMPLETED
+###################################################
 
 
 
@@ -1160,285 +1009,470 @@ choices_sl = ['all', 'BG', 'CS', 'DA', 'DE', 'EL', 'EN', 'ES', 'ET', 'FI', 'FR',
 choices_tl = ['all', 'BG', 'CS', 'DA', 'DE', 'EL', 'EN', 'ES', 'ET', 'FI', 'FR', 'HU', 'IT',
               'LT', 'LV', 'NL', 'PL', 'PT', 'RO', 'SK', 'SL', 'SV']
 
-parser = argparse.ArgumentParser(description="Extraction of Comparable or Parallel Corpora from EuroParl")
-subparsers = parser.add_subparsers(dest="subcommand")
-
-# Subparser for Comparable Corpora
-parser_comparable = subparsers.add_parser("comparable", description="Extraction of comparable corpora from EuroParl")
-
-langs_comparable = parser_comparable.add_argument_group("LANGUAGES")
-langs_comparable.add_argument("-sl", metavar ="SOURCE LANGUAGE(S)", nargs='+', choices=choices_sl, required=True, help='Choose from {%(choices)s}')
-langs_comparable.add_argument("-tl", metavar ="TARGET LANGUAGE(S)", nargs='+', choices=choices_tl, required=True, help='Choose from {%(choices)s}')
-
-paths_comparable = parser_comparable.add_argument_group('PATHS')
-paths_comparable.add_argument("-i", "--inputFolder", required=True, help="Path to file to be processed or directory that contains files to be processed")
-paths_comparable.add_argument("-o", "--outputFolder", required=True, help="Output folder for storage of extracted corpus files")
-
-iooptions_comparable = parser_comparable.add_argument_group("INPUT-/OUTPUT OPTIONS")
-iooptions_comparable.add_argument("-d", "--debug", required=False, action= "store_true",
-                    help="Create a log file for debugging")
-iooptions_comparable.add_argument("-s", "--statementList", nargs=1, required=False,
-                    help="Supply External Statement List in CSV Format")
-iooptions_comparable.add_argument("-al", "--additionalLanguageTags", action="store_true", required=False, help="Disseminate additional language tags to increase recall of segments")
-iooptions_comparable.add_argument("-c", "--cleanOutput", nargs=1,
-                                  choices=['lang', 'speaker', 'both'], required=False, help='Clean output from speaker tags and/or additional language tags')
-
-# Subparser for Parallel Corpora
-parser_parallel = subparsers.add_parser("parallel", description="Extraction of parallel corpora from EuroParl")
-
-langs_parallel = parser_parallel.add_argument_group("LANGUAGES")
-langs_parallel.add_argument("-sl", metavar ="SOURCE LANGUAGE(S)", nargs='+', choices=choices_sl, required=True, help='Choose from {%(choices)s}')
-langs_parallel.add_argument("-tl", metavar ="TARGET LANGUAGE(S)", nargs='+', choices=choices_tl, required=True, help='Choose from {%(choices)s}')
-
-paths_parallel = parser_parallel.add_argument_group('PATHS')
-paths_parallel.add_argument("-i", "--inputFolder", required=True, help="Path to file to be processed or directory that contains files to be processed")
-paths_parallel.add_argument("-o", "--outputFolder", required=True, help="Output folder for storage of extracted corpus files")
-
-iooptions_parallel = parser_parallel.add_argument_group("INPUT-/OUTPUT OPTIONS")
-iooptions_parallel.add_argument("-f", "--outputFormat", required=True, nargs='+',
-                                choices=['txt', 'tab', 'tmx'],
-                                help='Choose one or more output formats from {txt, tab, tmx}\n'\
-                                'TXT: non-aligned plain text files (SL/TL separately)\n'\
-                                'TAB: tabulator-separated sentence-aligned file format\n'\
-                                'TMX: sentence-alignd TMX files', metavar='\a') # '\a' is potential source for bugs - replace metavar='\a' with metavar='OUTPUT FORMAT(s)' if assertion error arises in CLI parsing
-iooptions_parallel.add_argument("-d", "--debug", required=False, action= "store_true",
-                    help="Create a log file to for debugging")
-iooptions_parallel.add_argument("-s", "--statementList", nargs=1, required=False,
-                    help="Supply External Statement List in CSV Format")
-iooptions_parallel.add_argument("-al", "--additionalLanguageTags", action="store_true", required=False, help="Disseminate additional language tags to increase number of statements")
-iooptions_parallel.add_argument("-c", "--cleanOutput", nargs=1,
-                                choices=['langs', 'xml', 'both'], required=False, help='Clean output from XML for paragraphs, speaker turns or both')
+def iso_date(string):
+  """ Validate date given on command line in ISO format (YYYY-MM-DD). """
+  try:
+    datetime.strptime(string, '%Y-%m-%d')
+  except ValueError:
+    raise argparse.ArgumentTypeError("invalid date '%s', expected format YYYY-MM-DD" %(string))
+  return string
+
+def positive_int(string):
+  """ Validate integer given on command line that must be at least 1. """
+  try:
+    value = int(string)
+  except ValueError:
+    raise argparse.ArgumentTypeError("invalid int value: '%s'" %(string))
+  if value < 1:
+    raise argparse.ArgumentTypeError("invalid value %d, expected an integer of at least 1" %(value))
+  return value
+
+def build_parser():
+  """ Create parser of command line arguments (subcommands comparable and parallel). """
+  parser = argparse.ArgumentParser(description="Extraction of Comparable or Parallel Corpora from EuroParl")
+  subparsers = parser.add_subparsers(dest="subcommand")
+
+  # Subparser for Comparable Corpora
+  parser_comparable = subparsers.add_parser("comparable", description="Extraction of comparable corpora from EuroParl")
+
+  langs_comparable = parser_comparable.add_argument_group("LANGUAGES")
+  langs_comparable.add_argument("-sl", metavar ="SOURCE LANGUAGE(S)", nargs='+', choices=choices_sl, required=True, help='Choose from {%(choices)s}')
+  langs_comparable.add_argument("-tl", metavar ="TARGET LANGUAGE(S)", nargs='+', choices=choices_tl, required=True, help='Choose from {%(choices)s}')
+
+  paths_comparable = parser_comparable.add_argument_group('PATHS')
+  paths_comparable.add_argument("-i", "--inputFolder", required=True, help="Path to file to be processed or directory that contains files to be processed")
+  paths_comparable.add_argument("-o", "--outputFolder", required=True, help="Output folder for storage of extracted corpus files")
+
+  sessions_comparable = parser_comparable.add_argument_group("SESSIONS")
+  sessions_comparable.add_argument("--from", dest="dateFrom", metavar="YYYY-MM-DD", type=iso_date, required=False, help="Only process sessions held on or after this date")
+  sessions_comparable.add_argument("--to", dest="dateTo", metavar="YYYY-MM-DD", type=iso_date, required=False, help="Only process sessions held on or before this date")
+  sessions_comparable.add_argument("--files", nargs='+', required=False, help="Only process these source files, e.g. ep-09-10-22-009")
+
+  iooptions_comparable = parser_comparable.add_argument_group("INPUT-/OUTPUT OPTIONS")
+  iooptions_comparable.add_argument("-d", "--debug", required=False, action= "store_true",
+                      help="Create a log file for debugging")
+  iooptions_comparable.add_argument("-s", "--statementList", nargs=1, required=False,
+                      help="Supply External Statement List in CSV, Parquet, Pickle or SQLite Format (detected automatically)")
+  iooptions_comparable.add_argument("-sf", "--statementListFormat", nargs='+', choices=['csv', 'parquet', 'pickle', 'sqlite'], default=['csv'], required=False,
+                      help="Format(s) of generated statement list; parquet and pickle preserve native types and load faster, sqlite can be queried without loading the whole list (default: csv)")
+  iooptions_comparable.add_argument("-al", "--additionalLanguageTags", action="store_true", required=False, help="Disseminate additional language tags to increase recall of segments")
+  iooptions_comparable.add_argument("-j", "--jobs", type=positive_int, default=1, required=False,
+                      help="Number of worker processes used to scan source files and to extract statements (default: 1)")
+  iooptions_comparable.add_argument("-os", "--outputSink", choices=OUTPUT_SINKS, default='folders', required=False,
+                      help="Storage of output files: one file per statement in folder tree (folders) or sharded JSONL containers with index per output folder (jsonl) (default: folders)")
+  iooptions_comparable.add_argument("-r", "--rescan", action="store_true", required=False,
+                      help="Rescan all source files instead of reusing metadata of unchanged files from previous run")
+  iooptions_comparable.add_argument("-c", "--cleanOutput", nargs=1,
+                                    choices=['lang', 'speaker', 'both'], required=False, help='Clean output from speaker tags and/or additional language tags')
+
+  # Subparser for Parallel Corpora
+  parser_parallel = subparsers.add_parser("parallel", description="Extraction of parallel corpora from EuroParl")
+
+  langs_parallel = parser_parallel.add_argument_group("LANGUAGES")
+  langs_parallel.add_argument("-sl", metavar ="SOURCE LANGUAGE(S)", nargs='+', choices=choices_sl, required=True, help='Choose from {%(choices)s}')
+  langs_parallel.add_argument("-tl", metavar ="TARGET LANGUAGE(S)", nargs='+', choices=choices_tl, required=True, help='Choose from {%(choices)s}')
+
+  paths_parallel = parser_parallel.add_argument_group('PATHS')
+  paths_parallel.add_argument("-i", "--inputFolder", required=True, help="Path to file to be processed or directory that contains files to be processed")
+  paths_parallel.add_argument("-o", "--outputFolder", required=True, help="Output folder for storage of extracted corpus files")
+
+  sessions_parallel = parser_parallel.add_argument_group("SESSIONS")
+  sessions_parallel.add_argument("--from", dest="dateFrom", metavar="YYYY-MM-DD", type=iso_date, required=False, help="Only process sessions held on or after this date")
+  sessions_parallel.add_argument("--to", dest="dateTo", metavar="YYYY-MM-DD", type=iso_date, required=False, help="Only process sessions held on or before this date")
+  sessions_parallel.add_argument("--files", nargs='+', required=False, help="Only process these source files, e.g. ep-09-10-22-009")
+
+  iooptions_parallel = parser_parallel.add_argument_group("INPUT-/OUTPUT OPTIONS")
+  iooptions_parallel.add_argument("-f", "--outputFormat", required=True, nargs='+',
+                                  choices=['txt', 'tab', 'tmx'],
+                                  help='Choose one or more output formats from {txt, tab, tmx}\n'\
+                                  'TXT: non-aligned plain text files (SL/TL separately)\n'\
+                                  'TAB: tabulator-separated sentence-aligned file format\n'\
+                                  'TMX: sentence-alignd TMX files', metavar='\a') # '\a' is potential source for bugs - replace metavar='\a' with metavar='OUTPUT FORMAT(s)' if assertion error arises in CLI parsing
+  iooptions_parallel.add_argument("-d", "--debug", required=False, action= "store_true",
+                      help="Create a log file to for debugging")
+  iooptions_parallel.add_argument("-s", "--statementList", nargs=1, required=False,
+                      help="Supply External Statement List in CSV, Parquet, Pickle or SQLite Format (detected automatically)")
+  iooptions_parallel.add_argument("-sf", "--statementListFormat", nargs='+', choices=['csv', 'parquet', 'pickle', 'sqlite'], default=['csv'], required=False,
+                      help="Format(s) of generated statement list; parquet and pickle preserve native types and load faster, sqlite can be queried without loading the whole list (default: csv)")
+  iooptions_parallel.add_argument("-al", "--additionalLanguageTags", action="store_true", required=False, help="Disseminate additional language tags to increase number of statements")
+  iooptions_parallel.add_argument("-j", "--jobs", type=positive_int, default=1, required=False,
+                      help="Number of worker processes used to scan source files and to extract statements (default: 1)")
+  iooptions_parallel.add_argument("-os", "--outputSink", choices=OUTPUT_SINKS, default='folders', required=False,
+                      help="Storage of output files: one file per statement in folder tree (folders) or sharded JSONL containers with index per output folder (jsonl) (default: folders)")
+  iooptions_parallel.add_argument("-cs", "--cacheSize", type=int, default=64, required=False,
+                      help="Maximum size in MB of the cache of statements read from source files, which are reused across target languages (default: 64; 0 disables the cache)")
+  iooptions_parallel.add_argument("-ae", "--alignmentEngine", choices=ENGINES, default='auto', required=False,
+                      help="Engine of the Gale-Church sentence alignment: python, numpy (vectorised; same alignments as python with -ce 0), batch (numpy with exact length costs, filling the tables of many paragraphs of a session together; pays off over python -ce 0 for large sessions, small groups of paragraphs are aligned one at a time) or auto (numpy for long paragraphs and large groups of short ones, if installed) (default: auto)")
+  iooptions_parallel.add_argument("-bw", "--bandWidth", type=positive_int, required=False,
+                      help="Restrict the sentence alignment to a band of this many sentences around the diagonal, which is widened automatically where needed (faster for long paragraphs; overrides -ae)")
+  iooptions_parallel.add_argument("-ce", "--costError", type=float, default=MAX_COST_ERROR, required=False,
+                      help="Maximum error of the length costs of the sentence alignment, which are looked up in a precomputed table by the python engine, banded search (-bw) and auto for paragraphs not aligned with numpy (default: %(default)s); 0 computes them exactly. The numpy and batch engines always compute them exactly, so all engines yield the same alignments only with -ce 0")
+  iooptions_parallel.add_argument("-mt", "--multiTarget", action="store_true", required=False,
+                      help="Extract all language pairs of a session in one pass, reading the source file of each language only once (same output files)")
+  iooptions_parallel.add_argument("-nw", "--nWay", choices=['tsv', 'jsonl'], required=False,
+                      help="Additionally write N-way aligned files with one column per language (tsv or jsonl); implies -mt")
+  iooptions_parallel.add_argument("-r", "--rescan", action="store_true", required=False,
+                      help="Rescan all source files instead of reusing metadata of unchanged files from previous run")
+  iooptions_parallel.add_argument("-c", "--cleanOutput", nargs=1,
+                                  choices=['langs', 'xml', 'both'], required=False, help='Clean output from XML for paragraphs, speaker turns or both')
+  return parser
+##### END OF FUNCTION DECLARATION
 ##### DEFINITION OF CLI PARSER COMPLETED
 ########################################
 
 
 
-###################################
-########## PARSE COMMAND LINE INPUT
-args = parser.parse_args()
+##########################################################
+########## SETTINGS AND OBJECTS SHARED BY EXTRACTION FUNCTIONS
 
-corpustype = args.subcommand
-  
-inDir = args.inputFolder
-outDir = args.outputFolder
+class Extraction(object):
+  """ Settings of an extraction, derived from parsed command line arguments, and the objects shared by the extraction functions.
 
-# Get list of input file(s) from input folder specified in CLI arguments
-europarl_sourcefiles = get_sourcefiles_from_folder(inDir)
+  An Extraction is passed to all functions that read source files or write output files, so that they can be called from other code
+  without function main(), e.g.:
+    extraction = Extraction(build_parser().parse_args(['parallel', '-sl', 'DE', '-tl', 'EN', '-i', 'txt/', '-o', 'out/', '-f', 'tab']))
+    prepare_statement_list(extraction)
+    extract_parallel_corpora(extraction)
+    extraction.close()
+  Worker processes are forked and inherit the Extraction of the main process (see function run_extraction()).
 
-'''
-# Get list of input file(s) from single file rather than entire input folder
-# Deprecated function
-if args.file:
-  get_sourcefile(inDir)
-else:
-'''
+  Attributes:
+    args (:obj: 'argparse.Namespace') -- Parsed command line arguments (see function build_parser()).
+    inDir (str) -- Path to input folder.
+    outDir (str) -- Path to output folder.
+    all_sourcefiles (list) -- All EuroParl source files in the input folder.
+    session_filter (:obj: 'SessionFilter') -- Sessions selected by date range (--from, --to) and/or file names (--files).
+    europarl_sourcefiles (list) -- Source files of the selected sessions.
+    sourceLanguages (list) -- Two-letter source language identifiers.
+    targetLanguages (list) -- Two-letter target language identifiers.
+    logfile (file) -- Log file for debugging (-d), or None.
+    statementList_path (str) -- Path to statement list supplied via -s, or None.
+    statement_store (:obj: 'StatementStore') -- Statement list from which statements are selected without data frame (SQLite or CSV), or None.
+    speaker_list (:obj: 'pandas.DataFrame') -- Statement list, if statements are selected from a data frame, or None.
+    turn_index (:obj: 'SpeakerTurnIndex') -- Byte offsets of speaker turns in source files, if available, or None.
+    output_sink (:obj: 'OutputSink') -- Storage of output files.
+    isCleanOutput (str) -- Cleaning of output selected via -c, or False.
+    min_lines_per_file (int) -- Minimum number of lines of comparable output files.
+    outputToTxt, outputToTab, outputToTmx (bool) -- Output formats of parallel corpora (-f), or None.
+    nWayFormat (str) -- Format of N-way aligned output files (-nw), or None.
+    statement_cache (:obj: 'StatementCache') -- Statements of recently read source files, reused across target languages, or None.
+    band_statistics (dict) -- Statistics of banded alignment per language pair (-bw), or None.
 
-sourceLanguages = args.sl
-if 'all' in sourceLanguages:
-  choices_sl.remove('all')
-  sourceLanguages = choices_sl
-  
-targetLanguages = args.tl
-if 'all' in targetLanguages:
-  choices_tl.remove('all')
-  targetLanguages = choices_tl
-
-# Initialise log file for debugging if CLI argument set accordingly
-if args.debug:
-  open(outDir + '/log_extraction.txt', 'w').close()
-  logfile = open(outDir + '/log_extraction.txt', mode='a')
-  logfile_header = ("EuroParlExtract Logfile (Creation Date: %s)" %(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
-  logfile.write("=" * len(logfile_header) + "\n"\
-                + logfile_header + "\n" +\
-                 "=" * len(logfile_header) + "\n")
-  logfile.write("\nCLI ARGS: \n" + str(args) + "\n\n\n")
-
-if args.statementList:
-  statementList_path = args.statementList[0]
-
-if args.cleanOutput:
-  isCleanOutput = args.cleanOutput[0]
-  if isCleanOutput != "lang":
-    min_lines_per_file = 1
-  else:
-    min_lines_per_file = 2
-else:
-  isCleanOutput = False
-  min_lines_per_file = 2
-##### PARSING OF COMMAND LINE INPUT COMPLETED
-#############################################
-
-
-
-################################################################################
-########## GENERATE LIST OF SPEAKER TURNS OR LOAD EXISTING LIST OF SPEAKER TURNS
-# If no external CSV list of statements is supplied then generate it from EuroParl source files
-if args.statementList:
-  print("\n>> Reading list of speaker turns from pre-compiled CSV file %s" %(statementList_path))
-  speaker_list = pd.read_csv(statementList_path, sep='\t', dtype=str, index_col=0)
-  print("\n   CSV file loaded into memory!")
-else:
-  '''
-  # List generation from single input file rather than from input folder disabled in this version
-  if args.file:
-    print("\nProcessing file %s \n" %(inDir))
-  else:
-  '''
-  print("\n>> GENERATING LIST OF SPEAKER TURNS FROM INPUT FILES:\n")
-  print("   Processing %s EuroParl source files in input folder %s\n" %(len(europarl_sourcefiles), inDir))
-  speaker_list = pd.DataFrame(columns= ('NAMES_FULL_COUNT', 'NAMES_NORMALISED_SUMMARY', 'NAMES_MATCHING', 'ORIGINAL_LANGUAGE', 'SL', 'ADDITIONAL_LANGUAGE')) 
-  speaker_list.index.name = 'UNIQUE_ID'
-  
-#  Loop over input files to generate list of speaker turns
-  if args.debug:
-    logfile.write("######################## STARTING GENERATION OF SPEAKER TURNS LIST ######################### \n\n")
-  counter = 1 # Initialise counter for progress bar
-  for inputfile in europarl_sourcefiles:
-    if args.debug:
-      logfile.write("Retrieving metadata from input file:\t" + inputfile + "\n")
-    analyse_sourcefile(inputfile)
-  
-    progress = int((counter/len(europarl_sourcefiles))*100)
-    statusbar = int(progress/2)
-    sys.stdout.write("\r")
-    sys.stdout.write("\t["+"="*statusbar+" "*(50-statusbar)+"]"+"\t"+str(progress)+" %")
-    counter +=1
-  print("\n\n   %s speaker turns identified in source files.\n" %len(speaker_list))
-  # Finished looping over input files
-
-  #  Post-process generated list of statements:\
-  #  1) Disambiguate speakers by calling match_speakers() \
-  #  2) Determine source language from XML language tags (SL) and alternative parenthesis () language tags (SL2) \
-  #     by calling language_vote()
-  print("   Post-processing list, please wait.\n")
-  if args.debug:
-    logfile.write("\n\n######################## POST-PROCESSING SPEAKER TURNS LIST #########################\n\n")
-  for index, row in speaker_list.iterrows(): # Index is equivalent to column unique_file_id
+  Raises:
+    ValueError -- If none of the source files in the input folder matches the selected sessions.
+
+  """
+
+  def __init__(self, args):
+    self.args = args
+    self.inDir = args.inputFolder
+    self.outDir = args.outputFolder
+
+    # Get list of input file(s) from input folder specified in CLI arguments
+    self.all_sourcefiles = get_sourcefiles_from_folder(self.inDir)
+    # Restrict input files to the sessions selected by date range (--from, --to) and/or file names (--files)
+    self.session_filter = SessionFilter(args.dateFrom, args.dateTo, args.files)
+    self.europarl_sourcefiles = self.session_filter.sourcefiles(self.all_sourcefiles)
+    if len(self.europarl_sourcefiles) == 0:
+      raise ValueError("None of the source files in folder %s matches the selected sessions" %(self.inDir))
+
+    self.sourceLanguages = args.sl
+    if 'all' in self.sourceLanguages:
+      self.sourceLanguages = [language for language in choices_sl if language != 'all']
+
+    self.targetLanguages = args.tl
+    if 'all' in self.targetLanguages:
+      self.targetLanguages = [language for language in choices_tl if language != 'all']
+
+    # Initialise log file for debugging if CLI argument set accordingly
+    self.logfile = None
     if args.debug:
-      logfile.write(index + "\n")
-    row['NAMES_NORMALISED_SUMMARY'] = group_speakers(row['NAMES_FULL_COUNT'])
-    row['NAMES_MATCHING'] = match_speakers(row['NAMES_NORMALISED_SUMMARY'])
-    
-    # Determine source language of each speaker turn by voting procedure
-    sourceLanguage = language_vote(row['ORIGINAL_LANGUAGE'], row['ADDITIONAL_LANGUAGE'])
-    row['SL'] = sourceLanguage
-    ##  Post-Processing of speaker_list completed
-  
-  # Export list to CSV file
-  speaker_list.to_csv(outDir + 'europarl_statements.csv', sep='\t', header=True, encoding='UTF-8')
-  print("   DONE! Statements list successfully exported to CSV as " + outDir.replace("/", "") + "/europarl_statements.csv !\n")
-##### GENERATING OR LOADING LIST OF SPEAKER TURNS COMPLETED
-###########################################################
+      open(self.outDir + '/log_extraction.txt', 'w').close()
+      self.logfile = open(self.outDir + '/log_extraction.txt', mode='a')
+      logfile_header = ("EuroParlExtract Logfile (Creation Date: %s)" %(datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+      self.logfile.write("=" * len(logfile_header) + "\n"\
+                         + logfile_header + "\n" +\
+                         "=" * len(logfile_header) + "\n")
+      self.logfile.write("\nCLI ARGS: \n" + str(args) + "\n\n\n")
+
+    self.statementList_path = args.statementList[0] if args.statementList else None
+    self.statement_store = None # Statement list supplied via -s from which statements are selected without data frame (SQLite or CSV)
+    self.speaker_list = None
+    self.turn_index = None
+    self.output_sink = create_output_sink(args.outputSink) # Storage of output files
+    self.outputToTxt, self.outputToTab, self.outputToTmx, self.nWayFormat = None, None, None, None
+    self.statement_cache = None
+    self.band_statistics = None # Statistics of banded alignment per language pair, if selected (-bw)
+
+    if args.cleanOutput:
+      self.isCleanOutput = args.cleanOutput[0]
+      if self.isCleanOutput != "lang":
+        self.min_lines_per_file = 1
+      else:
+        self.min_lines_per_file = 2
+    else:
+      self.isCleanOutput = False
+      self.min_lines_per_file = 2
+  ##### END OF METHOD DECLARATION
 
 
+  def close(self):
+    """ Close output sink and log file. """
+    self.output_sink.close()
+    if self.logfile is not None:
+      self.logfile.close()
+  ##### END OF METHOD DECLARATION
+##### END OF CLASS DECLARATION
+##### DEFINITION OF SHARED SETTINGS AND OBJECTS COMPLETED
+#########################################################
 
-################################################################################
-#                                                                              #
-#                    C O R P U S  E X T R A C T I O N                          #
-#                                                                              #
-################################################################################
 
 
+###################################################################
+########## LOAD OR GENERATE LIST OF SPEAKER TURNS AND EXTRACT CORPORA
 
-###############################################################################
-########## COMPARABLE CORPUS
+def prepare_statement_list(extraction):
+  """ Load the statement list supplied via -s or generate it from the EuroParl source files.
 
-if corpustype == "comparable":
-  print("\n>> STARTING EXTRACTION OF COMPARABLE CORPORA ...\n")
-  print("   NON-TRANSLATED COMPARABLE SUBCORPORA:")
+  Arguments:
+    extraction (:obj: 'Extraction') -- Settings of the extraction and objects shared by the extraction functions.
 
-#####  EXTRACT NON-TRANSLATED COMPARABLE SUBCORPORA
-  if args.debug:
-    logfile.write("############################  START EXTRACTION OF NON-TRANSLATED COMPARABLE CORPORA  #############################\n")
-  for tl in targetLanguages:
-    if os.path.exists((inDir + "/" + tl.lower()).replace('//', '/')):
-      print("     Extracting non-translated text in language\t%s" %(tl))
+  Returns:
+    Nothing; instead, it sets the attributes statement_store (if statements can be selected without data frame),
+    speaker_list (otherwise) and turn_index (byte offsets of speaker turns, if available) of extraction.
 
-    # Filter speaker_list to find statements originally uttered in given language and with unambiguous speaker
-    unambiguous_statemens_nontranslated = speaker_list[(speaker_list['SL'] == tl) & (speaker_list['NAMES_MATCHING'] != "xAMB")].index
-    # Put all non-translated statements for given language in dictionary statements_nontranslated
-    # Keys:    Filenames of source files containing the statements
-    # Values:  Speaker IDs of each non-translated statement
-    statements_nontranslated = {}
-    for usn in unambiguous_statemens_nontranslated: # usn = unambiguous_statement_nontranslated
-      fname_out = usn.split("|")[0]
-      id = usn.split("|")[1]
-      if fname_out not in statements_nontranslated:
-        statements_nontranslated[fname_out] = [id]
-      else:
-        statements_nontranslated[fname_out].append(id)
-    extract_comparable_nontranslated(statements_nontranslated, tl)
-#####  EXTRACTION OF NON-TRANSLATED COMPARABLE CORPORA COMPLETED
+  """
+  # If no external statement list is supplied then generate it from EuroParl source files
+  if extraction.args.statementList:
+    statementList_format = detect_statement_list_format(extraction.statementList_path)
+    print("\n>> Reading list of speaker turns from pre-compiled %s file %s" %(statementList_format.upper(), extraction.statementList_path))
+    if statementList_format == 'sqlite':
+      # Statements are selected by indexed queries against the SQLite database; the statement list is not loaded into memory
+      extraction.statement_store = StatementStore(extraction.statementList_path)
+      print("\n   %s statements available in SQLite database!" %(len(extraction.statement_store)))
+    elif statementList_format == 'csv':
+      # Only the columns required for the selection of statements are read, without creating a data frame
+      extraction.statement_store = CSVStatementStore(extraction.statementList_path)
+      print("\n   %s file loaded into memory!" %(statementList_format.upper()))
+    else:
+      # Only columns required for the selection of statements are loaded
+      extraction.speaker_list = load_statement_list(extraction.statementList_path, columns=('NAMES_MATCHING', 'SL'))
+      print("\n   %s file loaded into memory!" %(statementList_format.upper()))
+    # Load byte offsets of speaker turns if stored next to the statement list
+    turn_index_path = os.path.splitext(extraction.statementList_path)[0] + '.offsets'
+    extraction.turn_index = SpeakerTurnIndex.load(turn_index_path) if os.path.exists(turn_index_path) else None
+    if extraction.turn_index is not None:
+      print("\n   Byte offsets of speaker turns in %s source files loaded from %s" %(len(extraction.turn_index), turn_index_path))
+  else:
+    '''
+    # List generation from single input file rather than from input folder disabled in this version
+    if args.file:
+      print("\nProcessing file %s \n" %(inDir))
+    else:
+    '''
+    print("\n>> GENERATING LIST OF SPEAKER TURNS FROM INPUT FILES:\n")
+    # Only the source files of the selected sessions are scanned; the statement list and byte offsets of a selection are saved under
+    # a separate name, so that a statement list of all source files in the output folder is not replaced by a partial one
+    statementList_base = 'europarl_statements_selection' if extraction.session_filter else 'europarl_statements'
+    if extraction.session_filter:
+      print("   Sessions selected via --from/--to/--files: statement list is saved as %s, not as europarl_statements\n" %(statementList_base))
+    print("   Processing %s EuroParl source files in input folder %s\n" %(len(extraction.europarl_sourcefiles), extraction.inDir))
+    # Counters of speaker turns are accumulated in plain dictionaries; data frame speaker_list is created once all files are read
+    statement_builder = StatementListBuilder()
+    # Byte offsets of speaker turns are indexed during the scan, so that extraction functions can seek to the turns they need
+    extraction.turn_index = SpeakerTurnIndex()
+
+  #  Loop over input files to generate list of speaker turns
+    if extraction.args.debug:
+      extraction.logfile.write("######################## STARTING GENERATION OF SPEAKER TURNS LIST ######################### \n\n")
+    # Partial counters of each source file are cached together with a fingerprint of the file next to the CSV statement list,
+    # so that only new or changed source files need to be rescanned in subsequent runs; the cache is shared by all selections of sessions
+    sourcefile_cache = SourceFileCache(extraction.outDir + 'europarl_statements.fingerprints')
+    if extraction.args.rescan:
+      sourcefile_cache.entries = {}
+    elif len(sourcefile_cache.entries) > 0:
+      unchanged = sum(1 for inputfile in extraction.europarl_sourcefiles if sourcefile_cache.lookup(inputfile) is not None)
+      print("   Reusing metadata of %s unchanged source files from previous run, scanning %s new or changed files\n" %(unchanged, len(extraction.europarl_sourcefiles) - unchanged))
+    counter = 1 # Initialise counter for progress bar
+    # Source files are scanned in args.jobs worker processes; partial counters of each file are merged in order of europarl_sourcefiles
+    for inputfile, turns, offsets in scan_sourcefiles(extraction.europarl_sourcefiles, extraction.args.jobs, sourcefile_cache):
+      if extraction.args.debug:
+        extraction.logfile.write("Retrieving metadata from input file:\t" + inputfile + "\n")
+      statement_builder.merge(turns)
+      extraction.turn_index.add(inputfile, offsets)
+
+      progress = int((counter/len(extraction.europarl_sourcefiles))*100)
+      statusbar = int(progress/2)
+      sys.stdout.write("\r")
+      sys.stdout.write("\t["+"="*statusbar+" "*(50-statusbar)+"]"+"\t"+str(progress)+" %")
+      counter +=1
+    sourcefile_cache.save(extraction.all_sourcefiles) # Cached metadata of source files outside the selected sessions is kept for subsequent runs
+    extraction.turn_index.save(extraction.outDir + statementList_base + '.offsets')
+    extraction.speaker_list = statement_builder.to_dataframe()
+    print("\n\n   %s speaker turns identified in source files.\n" %len(extraction.speaker_list))
+    # Finished looping over input files
+
+    #  Post-process generated list of statements:\
+    #  1) Disambiguate speakers by calling match_speakers() \
+    #  2) Determine source language from XML language tags (SL) and alternative parenthesis () language tags (SL2) \
+    #     by calling language_vote()
+    print("   Post-processing list, please wait.\n")
+    if extraction.args.debug:
+      extraction.logfile.write("\n\n######################## POST-PROCESSING SPEAKER TURNS LIST #########################\n\n")
+    postprocessing_stats = postprocess_statement_list(extraction.speaker_list, extraction.args.additionalLanguageTags)
+    print("   %s distinct name signatures and %s distinct language signatures among %s speaker turns (%.1f s, estimated %.1f s saved by memoisation)\n"
+          %(postprocessing_stats['name_signatures'], postprocessing_stats['language_signatures'], postprocessing_stats['statements'],
+            postprocessing_stats['seconds'], postprocessing_stats['seconds_saved']))
+    print("   Name normalisation cache: %s hits, %s misses\n" %(name_normaliser.hits, name_normaliser.misses))
+    if extraction.args.debug:
+      extraction.logfile.write("Post-processing statistics:\t%s\n" %(postprocessing_stats))
+      ##  Post-Processing of speaker_list completed
+
+    # Export list to CSV file and/or binary formats
+    for statementList_format in extraction.args.statementListFormat:
+      statementList_filename = statementList_base + STATEMENT_LIST_EXTENSIONS[statementList_format]
+      written_format = save_statement_list(extraction.speaker_list, extraction.outDir + statementList_filename, statementList_format)
+      if written_format != statementList_format: # Package pyarrow required for parquet format not installed
+        print("   Package pyarrow not installed, statement list is exported in pickle format instead of parquet format.")
+      print("   DONE! Statements list successfully exported to %s as " %(written_format.upper()) + extraction.outDir.replace("/", "") + "/" + statementList_filename + " !\n")
+##### END OF FUNCTION DECLARATION
 
 
 
-##### EXTRACT TRANSLATED COMPARABLE SUBCORPORA
-  if args.debug:
-    logfile.write("\n\n############################  START EXTRACTION OF TRANSLATED COMPARABLE CORPORA  #############################\n\n")
-  print("\n   TRANSLATED COMPARABLE SUBCORPORA:")
-  for sl in sourceLanguages:
-    
-    unambiguous_statemens_in_sourcelanguage = speaker_list[(speaker_list['SL'] == sl) & (speaker_list['NAMES_MATCHING'] != "xAMB")].index
-    # Put all source language statements for given language in dictionary statements_sourcelanguage:
-    # Keys: filenames of files containing the statements, values: speaker IDs pointing to source language statement 
-    statements_sourcelanguage = {}
-    for uss in unambiguous_statemens_in_sourcelanguage:
-      fname = uss.split("|")[0]
-      id = uss.split("|")[1]
-      if fname not in statements_sourcelanguage:
-        statements_sourcelanguage[fname] = [id]
-      else:
-        statements_sourcelanguage[fname].append(id)
-    for tl in targetLanguages:
-      if sl != tl: # Avoid pairs of type BG-BG, which are equivalent to non-translated statements
-        if os.path.exists((inDir + "/" + tl.lower()).replace('//', '/')):
-          print("     %s > %s" %(sl, tl))
-        extract_comparable_translated(statements_sourcelanguage, sl, tl)
-    print("")
+def extract_comparable_corpora(extraction):
+  """ Extract non-translated and translated comparable subcorpora of all target languages of extraction (see class Extraction). """
+  print("\n>> STARTING EXTRACTION OF COMPARABLE CORPORA ...\n")
+
+##### EXTRACT NON-TRANSLATED AND TRANSLATED COMPARABLE SUBCORPORA
+  # Each source file in a target language is read once for the non-translated and all translated subcorpora of that language
+  if extraction.args.debug:
+    extraction.logfile.write("############################  START EXTRACTION OF COMPARABLE CORPORA  #############################\n")
+  statements_by_language = {} # Statements of each source language, selected only once across target languages
+  work_units = [] # One work unit per source file in target language
+  for tl in extraction.targetLanguages:
+    # Put all statements with unambiguous speaker in dictionary statements_by_language:
+    # Keys: source languages, i.e. tl for non-translated statements and all other source languages for translated statements (avoiding pairs of type BG-BG)
+    # Values: dictionaries with filenames of files containing the statements as keys and speaker IDs as values
+    languages = [tl] + [sl for sl in extraction.sourceLanguages if sl != tl]
+    for sl in languages:
+      if sl not in statements_by_language:
+        statements_by_language[sl] = select_statements(extraction, sl)
+    if os.path.exists((extraction.inDir + "/" + tl.lower()).replace('//', '/')):
+      print("     Extracting non-translated text in language\t%s" %(tl))
+      print("     Extracting translated text in language\t%s from source languages %s" %(tl, " ".join(languages[1:])))
+    work_units.extend(prepare_comparable_extraction(extraction, {sl: statements_by_language[sl] for sl in languages}, tl))
+  # Source files are processed by args.jobs worker processes
+  run_extraction(extraction, write_statements_to_txt, work_units)
+  print("")
   print("DONE! Extraction of Comparable Corpora Completed!\n\n")
-##### EXTRACTION OF COMPARABLE CORPORA COMPLETED
-###############################################################################
+##### END OF FUNCTION DECLARATION
 
 
 
-###############################################################################
-############# EXTRACT PARALLEL CORPORA
-else: # if corpustype != "comparable":
+def extract_parallel_corpora(extraction):
+  """ Extract parallel corpora of all language pairs of extraction (see class Extraction) in the output formats selected via -f. """
   print("\n>> STARTING EXTRACTION OF PARALLEL CORPORA ...\n")
   # Determine output format specified in CLI arguments
-  outputToTxt, outputToTab, outputToTmx = None, None, None
-  if "txt" in args.outputFormat:
-    outputToTxt = True
-  if "tab" in args.outputFormat:
-    outputToTab = True
-  if "tmx" in args.outputFormat:
-    outputToTmx = True
-
-  for sl in sourceLanguages:
-    unambiguous_statemens_in_sourcelanguage = speaker_list[(speaker_list['SL'] == sl) & (speaker_list['NAMES_MATCHING'] != "xAMB")].index
+  extraction.outputToTxt, extraction.outputToTab, extraction.outputToTmx = None, None, None
+  if "txt" in extraction.args.outputFormat:
+    extraction.outputToTxt = True
+  if "tab" in extraction.args.outputFormat:
+    extraction.outputToTab = True
+  if "tmx" in extraction.args.outputFormat:
+    extraction.outputToTmx = True
+  extraction.nWayFormat = extraction.args.nWay # N-way aligned output requires multi-target extraction
+
+  # Files written to the monolingual folders of each language pair are tracked, so that orphans can be removed without listing the folders
+  if extraction.outputToTxt:
+    extraction.output_sink.manifest = {}
+
+  # Counts of paragraphs aligned with banded search and of widenings of the band per language pair (-bw)
+  if extraction.args.bandWidth is not None:
+    extraction.band_statistics = {}
+
+  # Statements of recently read source files, reused across target languages (one cache per worker process)
+  extraction.statement_cache = StatementCache(extraction.args.cacheSize * 1024 * 1024, extraction.turn_index)
+
+  work_units = [] # One work unit per language pair and source file
+  language_pairs = []
+  for sl in extraction.sourceLanguages:
     # Put all source language statements for given language in dictionary statements_sourcelanguage
     # Keys: Filenames of files containing the statements
     # Values: Speaker IDs pointing to source language statements 
-    statements_sourcelanguage = {}
-    for uss in unambiguous_statemens_in_sourcelanguage: # uss = "unambiguous statements in SL"
-      fname = uss.split("|")[0]
-      id = uss.split("|")[1]
-      if fname not in statements_sourcelanguage:
-        statements_sourcelanguage[fname] = [id]
-      else:
-        statements_sourcelanguage[fname].append(id)
-    for tl in targetLanguages:
-      if os.path.exists(inDir + "/" + sl.lower()) and tl != sl and os.path.exists(inDir + "/" + tl.lower()): #avoid pairs of type BG-BG, which are equivalent to non-translated statements as well as pairs like MT>BG, for which no source files exist
+    statements_sourcelanguage = select_statements(extraction, sl)
+    work_units_sl = []
+    for tl in extraction.targetLanguages:
+      if os.path.exists(extraction.inDir + "/" + sl.lower()) and tl != sl and os.path.exists(extraction.inDir + "/" + tl.lower()): #avoid pairs of type BG-BG, which are equivalent to non-translated statements as well as pairs like MT>BG, for which no source files exist
         print("   %s > %s" %(sl, tl))
-        extract_parallel(statements_sourcelanguage, sl, tl)
+        work_units_sl.extend(prepare_parallel_extraction(extraction, statements_sourcelanguage, sl, tl))
+        language_pairs.append((sl, tl))
+    # Order work units by session, so that the work units of all target languages of a source language file follow each other
+    # and the source language file is read only once (sort is stable, i.e. target languages keep their order)
+    session_position = {identifier: i for i, identifier in enumerate(statements_sourcelanguage)}
+    work_units_sl.sort(key=lambda work_unit: session_position[work_unit[0]])
+    work_units.extend(work_units_sl)
+  # Source files of all language pairs are processed by args.jobs worker processes
+  if extraction.args.multiTarget or extraction.nWayFormat:
+    # One work unit per session, covering all its language pairs
+    if extraction.nWayFormat:
+      for sl in extraction.sourceLanguages:
+        if any(pair[0] == sl for pair in language_pairs):
+          os.makedirs(extraction.outDir + "/parallel/" + sl + "-nway", exist_ok=True)
+    run_extraction(extraction, extract_multi_target, group_work_units_by_session(work_units))
+  else:
+    run_extraction(extraction, extract_parallel, work_units)
+  if extraction.args.debug:
+    extraction.logfile.write("\nStatement cache:\t%d hits, %d misses (%d source files cached, %.1f MB)\n" %(extraction.statement_cache.hits, extraction.statement_cache.misses, len(extraction.statement_cache.entries), extraction.statement_cache.size / (1024 * 1024)))
+  if extraction.band_statistics is not None:
+    # Report how often the band of the alignment search had to be widened, so that its width can be tuned per language pair
+    print("\n   Banded alignment (width %d): paragraphs with widened band per language pair" %(extraction.args.bandWidth))
+    for (sl, tl), counts in sorted(extraction.band_statistics.items()):
+      print("   %s > %s\t%d of %d paragraphs (%.1f %%), %d widenings" %(sl, tl, counts.widened, counts.paragraphs,
+            100.0 * counts.widened / max(counts.paragraphs, 1), counts.widenings))
+      if extraction.args.debug:
+        extraction.logfile.write("Banded alignment %s > %s:\t%d of %d paragraphs widened, %d widenings\n" %(sl, tl, counts.widened, counts.paragraphs, counts.widenings))
+
+  # Remove spurious monolingual files from language-pair-specific subfolders of parallel corpus
+  if extraction.outputToTxt:
+    for sl, tl in language_pairs:
+      dirname_output_sl = (extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + sl + "_sl/").replace('//', '/')
+      dirname_output_tl = (extraction.outDir + "/parallel/" + sl + "-" + tl + "/" + tl + "_tl/").replace('//', '/')
+      clean_parallel_texts(extraction, sl.lower(), dirname_output_sl, tl.lower(), dirname_output_tl)
   print("\nDONE! Extraction of Parallel Corpora Completed!\n\n")
+##### END OF FUNCTION DECLARATION
+
+
+
+def main(argv=None):
+  """ Parse command line arguments argv (default: sys.argv) and extract comparable or parallel corpora.
 
-############# EXTRACTION OF PARALLEL CORPORA COMPLETED
-###############################################################################
+  Settings and objects used by the extraction functions are kept in an Extraction (see class Extraction), which is passed to them
+  and shared with forked worker processes (see function run_extraction()).
 
+  """
+  ########## PARSE COMMAND LINE INPUT
+  args = build_parser().parse_args(argv)
+  try:
+    extraction = Extraction(args)
+  except ValueError as error:
+    print ("\n%s\n\n" %(error))
+    exit(1)
+
+  ########## GENERATE LIST OF SPEAKER TURNS OR LOAD EXISTING LIST OF SPEAKER TURNS
+  prepare_statement_list(extraction)
+
+  ########## CORPUS EXTRACTION
+  if args.subcommand == "comparable":
+    extract_comparable_corpora(extraction)
+  else:
+    extract_parallel_corpora(extraction)
+
+  extraction.close()
+##### END OF FUNCTION DECLARATION
+##### MAIN PROGRAM COMPLETED
+############################
 
 
-###################### CORPUS EXTRACTION COMPLETED #############################
 
-if args.debug:
-  logfile.close()
+if __name__ == "__main__":
+  main()
@@ -19,12 +19,31 @@ Original code customized for implementation with EuroParlExtract by Michael Usta
 """
 
 import math, codecs
+import importlib.util
+from array import array
+from bisect import bisect_left
 
 LOG2 = math.log(2)
 
 BEAD_COSTS = {(1, 1): 0, (2, 1): 230, (1, 2): 230, (0, 1): 450, 
               (1, 0): 450, (2, 2): 440 }
 
+# Engines filling the dynamic-programming table: 'python' (function _align()), 'numpy' (function _align_numpy()),
+# 'batch' (numpy, with the tables of paragraphs aligned together filled at once where this pays off, see function align_batch())
+# or 'auto' (numpy for paragraphs, or groups of paragraphs aligned together, with at least NUMPY_MIN_CELLS cells, if numpy is installed)
+ENGINES = ('python', 'numpy', 'batch', 'auto')
+NUMPY_MIN_CELLS = 2500
+# Minimum number of rows and columns of the tables filled together by engine 'batch' (small tables are padded to this size,
+# since the overhead of filling a group of tables outweighs the padding), minimum number of cells (including padding) of a group
+# for filling its tables together to pay off, and maximum number of cells of the tables filled together at a time
+BATCH_MIN_SIZE = 8
+BATCH_MIN_CELLS = NUMPY_MIN_CELLS
+BATCH_MAX_CELLS = 2 ** 16
+# Unit roundoff of double precision floats, used to bound the deviation of numpy's exp() and powers from those of module math
+EPSILON = 2.0 ** -52
+# Default bound of the error of tabulated length costs (see class LengthCostTable); None selects exact length costs
+MAX_COST_ERROR = 1e-4
+
 def norm_cdf(z):
   """ Just in case you haven't installed scipy, use the norm distribution 
   functions as of Gale-Church'srcfile (1993). """
@@ -66,41 +85,450 @@ def length_cost(sx, sy, mean_xy, variance_xy):
     return float('-inf')
   return - 100 * (LOG2 + norm_logsf(abs(delta)))
 
-def _align(x, y, mean_xy, variance_xy, bead_costs):
+class LengthCostTable(object):
+  """
+  Length costs -100 * (LOG2 + norm_logsf(z)) tabulated for z = |delta| (see function
+  length_cost()) and linearly interpolated, with an error of at most max_error.
+
+  The step of the table is chosen such that the interpolation error, bounded by
+  step^2 / 8 * max|cost''(z)| (about 100, doubled for safety), is at most max_error / 2.
+  For large z, the computed costs are subject to rounding of 1 - norm_cdf(z) to
+  multiples of EPSILON; beyond z_max, where this would exceed max_error / 4, costs
+  are computed exactly.
+  """
+
+  def __init__(self, max_error):
+    self.max_error = max_error
+    self.step = math.sqrt(8 * (max_error / 2.0) / 200.0)
+    self.inverse_step = 1 / self.step
+    self.values = []
+    z = 0.0
+    while True:
+      self.values.append(-100 * (LOG2 + norm_logsf(z)))
+      if 100 * EPSILON / (1 - norm_cdf(z)) > max_error / 4:
+        break
+      z = len(self.values) * self.step
+    self.z_max = (len(self.values) - 2) * self.step
+
+  def cost(self, lx, ly, mean_xy, variance_xy):
+    """ Length cost of bead lengths lx and ly (see function length_cost()). """
+    m = (lx + ly * mean_xy) / 2
+    root = math.sqrt(m * variance_xy)
+    if root == 0:
+      return float('-inf')
+    z = abs((lx - ly * mean_xy) / root)
+    if z >= self.z_max:
+      return - 100 * (LOG2 + norm_logsf(z))
+    position = z * self.inverse_step
+    k = int(position)
+    return self.values[k] + (self.values[k+1] - self.values[k]) * (position - k)
+
+
+_length_cost_tables = {}
+
+def length_cost_table(max_error):
+  """ Return LengthCostTable for max_error, which is created once per process. """
+  if max_error not in _length_cost_tables:
+    _length_cost_tables[max_error] = LengthCostTable(max_error)
+  return _length_cost_tables[max_error]
+
+
+def _dp_table(x, y, band):
+  """
+  Compact layout of the dynamic-programming table of _align(): returns the
+  band (all columns of each row if None), the offsets of the rows in the flat
+  table of backpointers and the table itself, a bytearray with one byte per
+  cell holding the chosen bead (di, dj) as two bits each (see _bead_code()).
+  Costs are only kept for the last three rows, as beads span at most two rows.
+  """
+  if band is None:
+    band = [(0, len(y))] * (len(x) + 1)
+  offsets = []
+  size = 0
+  for first, last in band:
+    offsets.append(size - first)
+    size += last - first + 1
+  return band, offsets, bytearray(size)
+
+
+def _bead_code(di, dj):
+  return di << 2 | dj
+
+
+def _trace(band, offsets, backpointers, n_x, n_y):
+  """ Follow the backpointers from cell (n_x, n_y) back to cell (0, 0), yielding the beads of the best path. """
+  i, j = n_x, n_y
+  while True:
+    code = backpointers[offsets[i] + j]
+    di, dj = code >> 2, code & 3
+    if di == dj == 0:
+      break
+    yield (i-di, i), (j-dj, j)
+    i -= di
+    j -= dj
+
+
+def _align(x, y, mean_xy, variance_xy, bead_costs, band=None, table=None):
   """ 
   The minimization function to choose the sentence pair with 
-  cheapest alignment cost. 
+  cheapest alignment cost. If band (see function _band()) is given,
+  only the cells of the band are computed. If table (LengthCostTable)
+  is given, length costs are looked up in the table, with bead lengths
+  taken from prefix sums of sentence lengths.
   """
-  m = {}
+  if table is not None:
+    for bead in _align_tabulated(x, y, mean_xy, variance_xy, band, table):
+      yield bead
+    return
+  band, offsets, backpointers = _dp_table(x, y, band)
+  rows = [None, None, None] # Costs of rows i, i-1 and i-2, indexed by i % 3
   for i in range(len(x) + 1):
-    for j in range(len(y) + 1):
+    first, last = band[i]
+    row = rows[i % 3] = array('d', bytes(8 * (last - first + 1)))
+    for j in range(first, last + 1):
       if i == j == 0:
-        m[0, 0] = (0, 0, 0)
-      else:
-        m[i, j] = min((m[i-di, j-dj][0] +
+        continue
+      c, di, dj = min((rows[(i-di) % 3][j-dj-band[i-di][0]] +
                       length_cost(x[i-di:i], y[j-dj:j], mean_xy, variance_xy) \
                       + bead_cost, di, dj)
                       for (di, dj), bead_cost in BEAD_COSTS.items()
-                      if i-di>=0 and j-dj>=0)
+                      if i-di>=0 and band[i-di][0] <= j-dj <= band[i-di][1])
+      row[j-first] = c
+      backpointers[offsets[i] + j] = _bead_code(di, dj)
+
+  for bead in _trace(band, offsets, backpointers, len(x), len(y)):
+    yield bead
+    
+def _align_tabulated(x, y, mean_xy, variance_xy, band, table):
+  """ Version of _align() with length costs looked up in table (LengthCostTable). """
+  px, py = [0], [0]
+  for length in x:
+    px.append(px[-1] + length)
+  for length in y:
+    py.append(py[-1] + length)
+  beads = list(BEAD_COSTS.items())
+  values, inverse_step, z_max = table.values, table.inverse_step, table.z_max
+  sqrt = math.sqrt
+  band, offsets, backpointers = _dp_table(x, y, band)
+  rows = [None, None, None] # Costs of rows i, i-1 and i-2, indexed by i % 3
+  for i in range(len(x) + 1):
+    first, last = band[i]
+    row = rows[i % 3] = array('d', bytes(8 * (last - first + 1)))
+    offset = offsets[i]
+    # Beads ending in row i: previous row of costs with its first and last column, and SL length of the bead
+    row_beads = [(di, dj, bead_cost, rows[(i-di) % 3], band[i-di][0], band[i-di][1], px[i] - px[i-di])
+                 for (di, dj), bead_cost in beads if i-di >= 0]
+    for j in range(first, last + 1):
+      if i == j == 0:
+        continue
+      best = None
+      for di, dj, bead_cost, previous_row, previous_first, previous_last, lx in row_beads:
+        if not previous_first <= j-dj <= previous_last:
+          continue
+        ly = py[j] - py[j-dj]
+        root = sqrt((lx + ly * mean_xy) / 2 * variance_xy)
+        if root == 0:
+          cost = float('-inf')
+        else:
+          z = abs((lx - ly * mean_xy) / root)
+          if z < z_max:
+            position = z * inverse_step
+            k = int(position)
+            cost = values[k] + (values[k+1] - values[k]) * (position - k)
+          else:
+            cost = - 100 * (LOG2 + norm_logsf(z))
+        candidate = (previous_row[j-dj-previous_first] + cost + bead_cost, di, dj)
+        if best is None or candidate < best:
+          best = candidate
+      row[j-first] = best[0]
+      backpointers[offset + j] = _bead_code(best[1], best[2])
+
+  return _trace(band, offsets, backpointers, len(x), len(y))
+
+
+def _length_costs_numpy(np, lx, ly, mean_xy, variance_xy):
+  """ Vectorised length_cost() for arrays of bead lengths lx and ly (all lengths > 0).
+
+  Returns the costs and lower and upper bounds of the costs computed by length_cost(), which may differ in the last bits
+  since numpy's exp() and products of t are not identical to exp() and pow() of module math.
+  """
+  m = (lx + ly * mean_xy) / 2
+  delta = (lx - ly * mean_xy) / np.sqrt(m * variance_xy)
+  z = np.abs(delta)
+  t = 1/(1+0.2316419*z)
+  t2 = t * t # Products instead of power(), whose few ulps of deviation from math.pow() are covered by the allowance below
+  t4 = t2 * t2
+  terms = (0.319381530 * t, -0.356563782 * t2, 1.781477937 * (t2 * t), -1.821255978 * t4, 1.330274429 * (t4 * t))
+  poly = terms[0] + terms[1] + terms[2] + terms[3] + terms[4]
+  density = 0.3989423*np.exp(-z*z/2)
+  tail = density * poly
+  sf = 1 - (1 - tail)
+  # Bound of the deviation of tail from that of norm_cdf(), with generous allowance for the errors of exp() and the powers of t;
+  # since 1 - tail is rounded in the same way by both implementations, this bounds sf
+  deviation = (density * (np.abs(poly) * 32 * EPSILON + (np.abs(terms[0]) + np.abs(terms[1]) + np.abs(terms[2])
+               + np.abs(terms[3]) + np.abs(terms[4])) * 64 * EPSILON) + tail * 16 * EPSILON)
+  sf_lower = 1 - (1 - (tail - deviation))
+  sf_upper = 1 - (1 - (tail + deviation))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    costs = -100 * (LOG2 + np.where(sf > 0, np.log(sf), -np.inf))
+    lower = -100 * (LOG2 + np.where(sf_upper > 0, np.log(sf_upper), -np.inf))
+    upper = -100 * (LOG2 + np.where(sf_lower > 0, np.log(sf_lower), -np.inf))
+    # Allowance for the error of log()
+    lower = np.where(np.isinf(lower), lower, lower - (np.abs(lower) + 100) * 8 * EPSILON)
+    upper = np.where(np.isinf(upper), upper, upper + (np.abs(upper) + 100) * 8 * EPSILON)
+  return costs, lower, upper
+
+
+def _align_numpy(x, y, mean_xy, variance_xy, bead_costs):
+  """
+  Vectorised version of _align() (requires numpy): the table is filled by anti-diagonals,
+  all cells of which are computed at once. Returns the beads in forward order.
+
+  Since costs may differ from those of _align() in the last bits, lower and upper bounds of
+  the costs of _align() are carried along; if any choice on the best path is not certain to
+  be the one of _align(), None is returned and _align() should be used instead.
+  """
+  return _align_numpy_batch([(x, y)], mean_xy, variance_xy, bead_costs)[0]
+
+
+def _align_numpy_batch(paragraphs, mean_xy, variance_xy, bead_costs):
+  """
+  Version of _align_numpy() for a list of paragraphs, given as pairs (x, y) of
+  sentence lengths: their tables are padded to the same size and filled together,
+  with the paragraphs along the last axis. Returns one path (or None) per paragraph.
+  """
+  import numpy as np
+  paths = [None] * len(paragraphs)
+  if mean_xy <= 0 or variance_xy <= 0:
+    return paths
+  # Zero-length beads are assigned cost -inf by length_cost(); such paragraphs are left to _align()
+  selected = [k for k, (x, y) in enumerate(paragraphs) if 0 not in x and 0 not in y]
+  if not selected:
+    return paths
+  beads = sorted(BEAD_COSTS) # Ties are resolved in favour of the smallest bead, as by min() in _align()
+  di = np.array([bead[0] for bead in beads])[:, None]
+  dj = np.array([bead[1] for bead in beads])[:, None]
+  bc = np.array([float(BEAD_COSTS[bead]) for bead in beads])[:, None, None]
+  bead_index = np.arange(len(beads))[:, None, None]
+  n = max(len(paragraphs[k][0]) for k in selected)
+  width = max(len(paragraphs[k][1]) for k in selected) + 1
+  px, py = [], [] # Prefix sums of sentence lengths, padded with the total length
+  for k in selected:
+    for lengths, sums, size in zip(paragraphs[k], (px, py), (n + 1, width)):
+      prefix = [0]
+      for length in lengths:
+        prefix.append(prefix[-1] + length)
+      sums.append(prefix + prefix[-1:] * (size - len(prefix)))
+  px, py = np.array(px, dtype=float).T, np.array(py, dtype=float).T
+  size = (n + 1) * width
+  cost = np.zeros((size, len(selected))) # Flat tables of costs, bounds, chosen beads and certainty of choices
+  lower = np.zeros((size, len(selected)))
+  upper = np.zeros((size, len(selected)))
+  choice = np.zeros((size, len(selected)), dtype=np.int8)
+  certain = np.ones((size, len(selected)), dtype=bool)
+  for d in range(1, n + width):
+    i = np.arange(max(0, d - width + 1), min(n, d) + 1)
+    j = d - i
+    pi, pj = i - di, j - dj
+    valid = (pi >= 0) & (pj >= 0)
+    pi, pj = np.maximum(pi, 0), np.maximum(pj, 0)
+    lx, ly = px[i] - px[pi], py[j] - py[pj]
+    valid = np.broadcast_to(valid[:, :, None], lx.shape)
+    usable = valid & ((lx > 0) | (ly > 0)) # Beads within the padding of shorter paragraphs may be empty
+    lc, lc_lower, lc_upper = _length_costs_numpy(np, np.where(usable, lx, 1), np.where(usable, ly, 1), mean_xy, variance_xy)
+    previous = pi * width + pj
+    candidates = np.where(valid, cost[previous] + lc + bc, np.inf)
+    candidates_lower = np.where(valid, lower[previous] + lc_lower + bc, np.inf)
+    candidates_upper = np.where(valid, upper[previous] + lc_upper + bc, np.inf)
+    first_valid = np.argmax(valid, axis=0)
+    best_cost = candidates.min(axis=0) # If all candidates are inf, the first valid one is chosen, as by min() in _align()
+    best = np.where(best_cost == np.inf, first_valid, np.argmin(candidates, axis=0))
+    cell = i * width + j
+    cost[cell] = best_cost
+    lower[cell] = candidates_lower.min(axis=0)
+    upper[cell] = candidates_upper.min(axis=0)
+    choice[cell] = best
+    chosen = bead_index == best
+    chosen_upper = np.where(chosen, candidates_upper, -np.inf).max(axis=0)
+    others_lower = np.where(chosen, np.inf, candidates_lower).min(axis=0)
+    certain[cell] = (chosen_upper < others_lower) | (np.isinf(others_lower) & (best == first_valid)) | np.isinf(lower[cell])
+
+  choice, certain = choice.T.tobytes(), certain.T.tobytes() # One byte per cell, table by table
+  for b, k in enumerate(selected):
+    path = []
+    i, j = len(paragraphs[k][0]), len(paragraphs[k][1])
+    while i > 0 or j > 0:
+      cell = b * size + i * width + j
+      if not certain[cell]:
+        path = None
+        break
+      bead_di, bead_dj = beads[choice[cell]]
+      path.append(((i-bead_di, i), (j-bead_dj, j)))
+      i -= bead_di
+      j -= bead_dj
+    if path is not None:
+      path.reverse()
+    paths[k] = path
+  return paths
+
+
+def _batch_shape(n):
+  """
+  Padded number of rows or columns of tables aligned together: BATCH_MIN_SIZE, then
+  increasing by factors of 1.5 and 4/3 in turn (e.g. 8, 12, 16, 24, 32, ...).
+  """
+  size = BATCH_MIN_SIZE
+  while size < n:
+    if size & (size - 1) == 0:
+      size += size // 2 # 8 -> 12, 16 -> 24, ...
+    else:
+      size += size // 3 # 12 -> 16, 24 -> 32, ...
+  return size
+
+
+def align_batch(paragraphs, mean_xy, variance_xy, bc, engine='batch', max_cost_error=MAX_COST_ERROR):
+  """
+  Align many paragraphs, given as pairs (x, y) of sentence lengths, with the
+  numpy engine (see function _align_numpy_batch()). Paragraphs are grouped by
+  the size of their tables (padded to at most about twice as many cells), and
+  the tables of each group are filled together, up to BATCH_MAX_CELLS cells at
+  a time, so that short paragraphs do not each incur the overhead of a call.
+  Paragraphs the numpy engine is not certain about are aligned with _align().
+  Groups of less than BATCH_MIN_CELLS cells in total, for which filling the
+  tables together does not pay off, are aligned one paragraph at a time with
+  _align(): by engine 'batch' with exact length costs, so that all alignments
+  are those of the numpy engine, and by engine 'auto' (which does so for all
+  groups if numpy is not installed) as by function align(), i.e. with length
+  costs looked up in a table with an error of at most max_cost_error (or
+  computed exactly if None).
+  Returns the beads of each paragraph in forward order.
+  """
+  groups = {}
+  for k, (x, y) in enumerate(paragraphs):
+    groups.setdefault((_batch_shape(len(x) + 1), _batch_shape(len(y) + 1)), []).append(k)
+  min_cells = BATCH_MIN_CELLS
+  if engine == 'auto' and importlib.util.find_spec('numpy') is None:
+    min_cells = float('inf') # Without numpy, all paragraphs are aligned one at a time
+  table = length_cost_table(max_cost_error) if max_cost_error is not None and engine == 'auto' else None
+  paths = [None] * len(paragraphs)
+  for (rows, columns), members in groups.items():
+    if len(members) * rows * columns < min_cells:
+      for k in members:
+        x, y = paragraphs[k]
+        paths[k] = list(reversed(list(_align(x, y, mean_xy, variance_xy, bc, None, table))))
+      continue
+    step = max(1, BATCH_MAX_CELLS // (rows * columns))
+    for start in range(0, len(members), step):
+      chunk = members[start:start+step]
+      for k, path in zip(chunk, _align_numpy_batch([paragraphs[k] for k in chunk], mean_xy, variance_xy, bc)):
+        x, y = paragraphs[k]
+        paths[k] = path if path is not None else list(reversed(list(_align(x, y, mean_xy, variance_xy, bc))))
+  return paths
+
+
+def _band(x, y, width):
+  """
+  Columns (first, last) of each row of the band of the given width around the
+  diagonal proportional to the cumulative sentence lengths. The band is widened
+  where necessary, so that all its cells can be reached from cell (0, 0) and
+  cell (len(x), len(y)) can be reached from all its cells.
+  """
+  px, py = [0], [0]
+  for length in x:
+    px.append(px[-1] + length)
+  for length in y:
+    py.append(py[-1] + length)
+  ratio = py[-1] / float(px[-1]) if px[-1] > 0 else 1.0
+  band = []
+  for i in range(len(x) + 1):
+    center = min(bisect_left(py, px[i] * ratio), len(y))
+    first, last = max(0, center - width), min(len(y), center + width)
+    if band:
+      first = min(max(first, band[-1][0]), band[-1][1]) # Overlap with previous row
+      last = max(last, band[-1][1])
+    band.append((first, last))
+  band[0] = (0, band[0][1])
+  band[-1] = (band[-1][0], len(y))
+  return band
+
+
+def _touches_band_edge(path, band, n_y):
+  """ Check whether an alignment path runs along an edge of the band that is not an edge of the table. """
+  for (i1, i2), (j1, j2) in path:
+    first, last = band[i2]
+    if (j2 == first and first > 0) or (j2 == last and last < n_y):
+      return True
+  return False
+
+
+class BandStatistics(object):
+  """ Counts of paragraphs aligned with banded search (see function align()) and of widenings of the band. """
+
+  def __init__(self):
+    self.paragraphs = 0 # Paragraphs aligned with banded search
+    self.widened = 0 # Paragraphs for which the band had to be widened
+    self.widenings = 0 # Widenings of the band in total
 
-  i, j = len(x), len(y)
+  def merge(self, other):
+    self.paragraphs += other.paragraphs
+    self.widened += other.widened
+    self.widenings += other.widenings
+
+
+def _align_banded(x, y, mean_xy, variance_xy, bc, width, statistics=None, table=None):
+  """
+  Banded version of _align(): only cells within width rows of the diagonal
+  are computed, i.e. O(len(x) * width) instead of O(len(x) * len(y)) cells.
+  The band is doubled as long as the best path touches its edge.
+  Returns the beads in forward order.
+  """
+  if width < 1:
+    raise ValueError("Band width must be at least 1, got %r" %(width))
+  widenings = 0
   while True:
-    (c, di, dj) = m[i, j]
-    if di == dj == 0:
+    band = _band(x, y, width)
+    path = list(reversed(list(_align(x, y, mean_xy, variance_xy, bc, band, table))))
+    if width >= max(len(x), len(y)) or not _touches_band_edge(path, band, len(y)):
       break
-    yield (i-di, i), (j-dj, j)
-    i -= di
-    j -= dj
-    
+    width *= 2
+    widenings += 1
+  if statistics is not None:
+    statistics.paragraphs += 1
+    statistics.widened += widenings > 0
+    statistics.widenings += widenings
+  return path
+
+
 def sent_length(sentence):
   """ Returns sentence length without spaces. """
-  return sum(1 for c in sentence if c != ' ')
+  return len(sentence) - sentence.count(' ')
 
-def align(sx, sy, mean_xy, variance_xy, bc):
-  """ Main alignment function. """
+def align(sx, sy, mean_xy, variance_xy, bc, engine='python', band=None, statistics=None, max_cost_error=MAX_COST_ERROR):
+  """ Main alignment function; engine is one of ENGINES. If the width of a band
+  is given, banded search (see function _align_banded()) is used instead.
+  The python engine and banded search look up length costs in a table with an
+  error of at most max_cost_error (see class LengthCostTable), or compute them
+  exactly if None; the numpy and batch engines always compute them exactly.
+  Where costs of alternative beads tie or nearly tie, tabulated costs may lead
+  to different alignments, so engines only agree if max_cost_error is None. """
+  if band is not None and band < 1:
+    raise ValueError("Band width must be at least 1, got %r" %(band))
   cx = list(map(sent_length,sx)); cy = list(map(sent_length, sy)) 
-  for (i1, i2), (j1, j2) in \
-  reversed(list(_align(cx, cy, mean_xy, variance_xy, bc))):
+  table = length_cost_table(max_cost_error) if max_cost_error is not None else None
+  path = None
+  if band is not None:
+    path = _align_banded(cx, cy, mean_xy, variance_xy, bc, band, statistics, table)
+  elif engine in ('numpy', 'batch') or (engine == 'auto' and (len(cx)+1) * (len(cy)+1) >= NUMPY_MIN_CELLS):
+    try:
+      path = _align_numpy(cx, cy, mean_xy, variance_xy, bc)
+    except ImportError:
+      if engine != 'auto':
+        raise
+  if path is None and engine in ('numpy', 'batch'):
+    path = reversed(list(_align(cx, cy, mean_xy, variance_xy, bc))) # Same alignment as the numpy engine
+  elif path is None:
+    path = reversed(list(_align(cx, cy, mean_xy, variance_xy, bc, None, table)))
+  for (i1, i2), (j1, j2) in path:
     yield ' '.join(sx[i1:i2]), ' '.join(sy[j1:j2])
 
   
@@ -146,7 +574,7 @@ def calculateVariance(srcfile,trgfile):
   return m
 '''
 
-def gale_church_alignment(sl_sentences, tl_sentences, mean=1.0, variance=6.8, bc = BEAD_COSTS):
+def gale_church_alignment(sl_sentences, tl_sentences, mean=1.0, variance=6.8, bc = BEAD_COSTS, engine='python', band=None, statistics=None, max_cost_error=MAX_COST_ERROR):
   """ Apply Gale-Church algorithm to align SL with TL sentences.
   
   Arguments:
@@ -155,12 +583,25 @@ def gale_church_alignment(sl_sentences, tl_sentences, mean=1.0, variance=6.8, bc
     mean (float) -- Mean of SL/TL character emmission rate; default = 1.0.
     variance (float) -- Variance of SL/TL character emmission; default = 6.8.
     bc (dict) -- Bead costs.
+    engine (str) -- Engine filling the dynamic-programming table, one of ENGINES (default: python).
+      The numpy engine computes length costs exactly and yields the same alignments as the python engine with exact
+      length costs (max_cost_error None), to which it falls back if in doubt; so does the batch engine, which aligns all paragraphs together (see function gale_church_alignments()).
+      The auto engine aligns groups of paragraphs together where this pays off (see function align_batch()).
+    band (int) -- Optional width (in sentences, at least 1) of the band around the diagonal to which the search is restricted;
+      the band is widened automatically where the best alignment touches its edge. Overrides engine.
+    statistics (:obj: 'BandStatistics') -- Optional counts of banded paragraphs and widenings of the band, updated in place.
+    max_cost_error (float) -- Bound of the error of length costs looked up in a table by the python engine, by banded search and
+      by the auto engine for paragraphs it does not align with numpy (see class LengthCostTable); if None, length costs are computed
+      exactly. The numpy and batch engines always compute length costs exactly; where costs of alternative beads (nearly) tie,
+      tabulated costs may yield different alignments, so all engines yield the same alignments only if max_cost_error is None.
 
   Returns:
     segments_sl (list) -- SL sentences, equal in length as segments_tl; aligned SL/TL sentences are matched by list index.
     segments_tl (list) -- TL sentences, equal in length as segments_sl; aligned SL/TL sentences are matched by list index.
   """
     
+  if engine in ('batch', 'auto') and band is None:
+    return gale_church_alignments([(sl_sentences, tl_sentences)], mean, variance, bc, engine, band, statistics, max_cost_error)[0]
   segments_sl = []
   segments_tl = []
   # If "gacha" instead of float value passed to function, calculate mean and variance
@@ -172,11 +613,59 @@ def gale_church_alignment(sl_sentences, tl_sentences, mean=1.0, variance=6.8, bc
     assert src[1] == trg[1]
     segments_sl.append(src[1])
     segments_tl.append(src[1])
-    for (sentence_x, sentence_y) in align(src[0], trg[0], mean, variance, bc):
+    for (sentence_x, sentence_y) in align(src[0], trg[0], mean, variance, bc, engine, band, statistics, max_cost_error):
       segments_sl.append(sentence_x)
       segments_tl.append(sentence_y)
       x = len(segments_sl)
       y = len(segments_tl)
   segments_sl.append("<P>")
   segments_tl.append("<P>")
-  return segments_sl, segments_tl
\ No newline at end of file
+  return segments_sl, segments_tl
+
+
+def gale_church_alignments(sentence_pairs, mean=1.0, variance=6.8, bc=BEAD_COSTS, engine='python', band=None, statistics=None, max_cost_error=MAX_COST_ERROR):
+  """ Apply Gale-Church algorithm to align SL with TL sentences of several texts, e.g. of all statements of a session.
+
+  With the batch and auto engines, the paragraphs of all texts are aligned together with function align_batch(), which avoids the
+  overhead of aligning each (typically short) paragraph on its own; otherwise, each text is aligned with function gale_church_alignment().
+
+  Arguments:
+    sentence_pairs (list) -- 2-tuples (sl_sentences, tl_sentences) of SL and TL sentences with paragraph markers (<P>), one per text.
+    Further arguments as of function gale_church_alignment().
+
+  Returns:
+    alignments (list) -- 2-tuples (segments_sl, segments_tl) as returned by function gale_church_alignment(), one per text.
+  """
+  if engine not in ('batch', 'auto') or band is not None:
+    return [gale_church_alignment(sl_sentences, tl_sentences, mean, variance, bc, engine, band, statistics, max_cost_error)
+            for sl_sentences, tl_sentences in sentence_pairs]
+
+  texts = [] # Paragraphs per text: 5-tuples (paragraph marker, SL sentences, TL sentences, group key, index in group)
+  groups = {} # Keys: (mean, variance); values: sentence lengths of paragraphs to be aligned together
+  for sl_sentences, tl_sentences in sentence_pairs:
+    # If "gacha" instead of float value passed to function, calculate mean and variance
+    text_mean = calculateMean(sl_sentences, tl_sentences) if mean == "gacha" else mean
+    key = tuple(map(float, [text_mean, variance]))
+    paragraphs = groups.setdefault(key, [])
+    text = []
+    for src, trg in zip(readSentences(sl_sentences), readSentences(tl_sentences)):
+      assert src[1] == trg[1]
+      text.append((src[1], src[0], trg[0], key, len(paragraphs)))
+      paragraphs.append((list(map(sent_length, src[0])), list(map(sent_length, trg[0]))))
+    texts.append(text)
+  paths = {key: align_batch(paragraphs, key[0], key[1], bc, engine, max_cost_error) for key, paragraphs in groups.items()}
+
+  alignments = []
+  for text in texts:
+    segments_sl = []
+    segments_tl = []
+    for marker, sx, sy, key, index in text:
+      segments_sl.append(marker)
+      segments_tl.append(marker)
+      for (i1, i2), (j1, j2) in paths[key][index]:
+        segments_sl.append(' '.join(sx[i1:i2]))
+        segments_tl.append(' '.join(sy[j1:j2]))
+    segments_sl.append("<P>")
+    segments_tl.append("<P>")
+    alignments.append((segments_sl, segments_tl))
+  return alignments
@@ -0,0 +1,135 @@
+'''
+Normalisation of speaker names for grouping speaker turns across language versions of EuroParl source files.
+
+Cyrillic/Greek names are latinised, multilingual denominations of 'president' are unified, and names are transliterated to
+lower-case ASCII without punctuation and spaces. All regex patterns and translation tables are compiled once when a
+NameNormaliser is created; normalised names are cached in a bounded LRU cache keyed on the raw name, since the same
+names (e.g. of the President and of MEPs) occur in thousands of speaker turns.
+
+Usage:
+
+  name_normaliser = NameNormaliser()
+  name_normaliser.normalise('Jim Higgins') # 'jimhiggins'
+  name_normaliser.hits, name_normaliser.misses
+
+'''
+
+import re
+from functools import lru_cache
+from string import punctuation
+
+
+##############################################
+########## DEFINE REGEX PATTERNS AND TABLES FOR NAME NORMALISATION
+president = re.compile(r'(Πρόεδρ|Président|Formand|Președin|Elnök|Przewodnicz|\
+                              |Presid|Juhataja|Pirminink|Talman|Председа|Voorzitter|Předsed|\
+                              |Puhemies|Puheenjoh|Präsident|Priekš|Přesed|Prieks|Prési|Predsed|Preisdente|\
+                              |Preşdinte|Προεδρ|Preşedi|Представ|Ordförand|Preseda)', re.I)
+exceptions_nonroman = re.compile(r'(|Барозу|Малмстрьом|Κυριάκος|Аштън|Мишел|Гюнтер|Йоханес|Хоакин|\
+                                    |Хосе|Σπύρος|Щефан|Συλβάνα|Ευαγγελία|Оли Рен|Δημητρακόπουλος|\
+                                    |Δημήτριος|Жак|Джо|Ян|Μπ|Χρ|Χαρ)')
+
+# Cyrillic/Greek names or name parts and their Latin forms
+LATIN_REPLACEMENTS = {
+  'Жозе Мануел Барозу':'José Manuel Barroso',
+  'Сесилия Малмстрьом' : 'Cecilia Malmström',
+  'Катрин Аштън' : 'Catherine Ashton',
+  'Κυριάκος' : 'Kyriacos',
+  'Мишел' : 'Michel',
+  'Гюнтер' : 'Günther',
+  'Жак' : 'jacques',
+  'Δημήτρ' : 'Dimitr',
+  'Оли Рен' : 'Olli Rehn',
+  'Χαρ' : 'Char',
+  'Ευαγγελία' : 'Evangelia',
+  'Συλβάνα' : 'Sylvana',
+  'Χρ' : 'Chr',
+  'Щефан' : 'Stefan',
+  'Μπ' : 'B',
+  'Σπύρος' : 'Spyros',
+  'Хосе' : 'Jose',
+  'Хоакин' : 'Joaquin',
+  'Йоханес' : 'Johannes',
+  'Ян' : 'Jan',
+  'Джо' : 'Joe',
+  'Нели' : 'Neelie',
+  'Сесилия': 'Cecilia',
+  'Σηφουνάκης' : 'Sifunakis',
+  'Παφίλης' : 'Pafilis',
+  'Φώλιας' : 'Folias',
+  'Джон' : 'John',
+  'Петя' : 'Petya',
+  'Кони' : 'Connie',
+  'Мойра' : 'Máire',
+  'Ив ' : 'Yves',
+  'Жан-Клод Трише' : 'Jean-Claude Trichet',
+  'Филип ' : 'Philippe',
+}
+##### DEFINITION OF REGEX-PATTERNS COMPLETED
+############################################
+
+
+
+class NameNormaliser(object):
+  """ Normalise speaker names with precompiled patterns and a bounded LRU cache of results.
+
+  Arguments:
+    maxsize (int) -- Maximum number of raw names whose normalised forms are kept in the cache.
+
+  """
+
+  def __init__(self, maxsize=65536):
+    self.latin_pattern = re.compile('|'.join(LATIN_REPLACEMENTS.keys()))
+    self.punctuation_table = str.maketrans({a:None for a in punctuation})
+    self.normalise = lru_cache(maxsize=maxsize)(self.normalise_uncached)
+
+
+  @property
+  def hits(self):
+    """ Number of names whose normalised form was retrieved from the cache. """
+    return self.normalise.cache_info().hits
+
+
+  @property
+  def misses(self):
+    """ Number of names that had to be normalised because they were not in the cache. """
+    return self.normalise.cache_info().misses
+
+
+  def normalise_uncached(self, name):
+    """ Normalise speaker name by latinising Cyrillic/Greek characters and unifying multilingual denominations of 'president'.
+    Use method normalise(name), which caches results of this method.
+
+    Arguments:
+      name (str) -- The name of the speaker.
+
+    Returns:
+      norm (str) -- The normalised form of the name.
+
+    """
+    if exceptions_nonroman.search(name):
+      name = self.latinise(name)
+    if president.search(name):
+      norm = "prsd"
+    else:
+      from unidecode import unidecode # Imported on first use, so that importing this module is cheap
+      norm = unidecode(name).lower().translate(self.punctuation_table).replace(' ','')
+    if len(norm) < 1:
+      norm = "xxxx"
+    return(norm)
+  ##### END OF METHOD DECLARATION
+
+
+  def latinise(self, name):
+    """ Convert Cyrillic/Greek names to Latin alphabet form.
+
+    Arguments:
+      name (str) -- Name of speaker.
+
+    Returns:
+      name_latinised (str) -- Latinised form of the name.
+
+    """
+    return self.latin_pattern.sub(lambda x: LATIN_REPLACEMENTS[x.group()], name)
+  ##### END OF METHOD DECLARATION
+##### END OF CLASS DECLARATION
@@ -0,0 +1,251 @@
+'''
+Output sinks for documents (extracted statements in TXT, TAB or TMX format) written by the extraction functions.
+
+Documents are identified by their path in the output folder layout of EuroParlExtract, e.g.
+out/parallel/DE-EN/de_sl/09-10-22-009_158_de.txt. Sinks differ in how these documents are stored:
+  - FolderSink (default) writes one file per document.
+  - JSONLSink writes the documents of each output folder to a few large sharded JSONL containers
+    (e.g. out/parallel/DE-EN/de_sl/documents.00000.jsonl), one JSON object {"id": ..., "text": ...} per line,
+    and records the location of each document in an index file (out/parallel/DE-EN/de_sl/documents.index).
+
+Usage:
+
+  sink = create_output_sink('jsonl')
+  sink.write('out/parallel/DE-EN/de_sl/09-10-22-009_158_de.txt', text)
+  sink.discard('out/parallel/DE-EN/de_sl/09-10-22-009_159_de.txt') # Removes document if already written
+  sink.close() # Writes index files
+
+Sinks that are not process-safe (class attribute process_safe) can defer their operations in worker processes;
+the collected operations are then replayed in the main process in the order of the work units.
+
+If a manifest is kept (attribute manifest), the names of the documents written (and not discarded) are tracked per folder,
+so that the documents of a folder are known without listing it:
+
+  sink.manifest = {}
+  sink.write('out/parallel/DE-EN/de_sl/09-10-22-009_158_de.txt', text)
+  sink.documents('out/parallel/DE-EN/de_sl/') # {'09-10-22-009_158_de.txt'}
+
+'''
+
+import os
+import json
+
+
+OUTPUT_SINKS = ('folders', 'jsonl')
+
+
+
+class OutputSink(object):
+  """ Base class of output sinks; subclasses implement methods _write(path, text), _discard(path) and list_documents(folder).
+
+  Attributes:
+    deferred (list) -- Operations recorded instead of being executed (see method defer()), or None.
+    manifest (dict) -- Keys: normalised output folders; values: sets of names of documents written to the folder and not discarded
+      since the manifest was set up, or None if no manifest is kept (default).
+
+  """
+
+  process_safe = True # True if several worker processes can write to the sink at the same time
+
+  def __init__(self):
+    self.deferred = None
+    self.manifest = None
+
+
+  def write(self, path, text):
+    """ Write document text, replacing any document previously written to path. """
+    if self.deferred is not None:
+      self.deferred.append(('write', path, text))
+    else:
+      self.track('write', path)
+      self._write(path, text)
+
+
+  def discard(self, path):
+    """ Remove document path if it exists. """
+    if self.deferred is not None:
+      self.deferred.append(('discard', path, None))
+    else:
+      self.track('discard', path)
+      self._discard(path)
+
+
+  def track(self, operation, path):
+    """ Record operation ('write' or 'discard') on document path in the manifest, if any. """
+    if self.manifest is None:
+      return
+    folder, name = os.path.split(path)
+    names = self.manifest.setdefault(os.path.normpath(folder), set())
+    if operation == 'write':
+      names.add(name)
+    else:
+      names.discard(name)
+
+
+  def documents(self, folder):
+    """ Return names of documents written to folder according to the manifest. """
+    return self.manifest.get(os.path.normpath(folder), set())
+
+
+  def merge_manifest(self, manifest):
+    """ Add the documents of the manifest of another instance of the sink (e.g. in a worker process) to the manifest. """
+    for folder, names in manifest.items():
+      self.manifest.setdefault(folder, set()).update(names)
+
+
+  def defer(self):
+    """ Record subsequent operations instead of executing them, e.g. in a worker process. """
+    self.deferred = []
+
+
+  def collect(self):
+    """ Return and reset the operations recorded since the last call of method defer() or collect(). """
+    operations = self.deferred
+    self.deferred = []
+    return operations
+
+
+  def replay(self, operations):
+    """ Execute operations recorded by another instance of the sink (e.g. in a worker process). """
+    for operation, path, text in operations:
+      self.track(operation, path)
+      if operation == 'write':
+        self._write(path, text)
+      else:
+        self._discard(path)
+
+
+  def close(self):
+    pass
+##### END OF CLASS DECLARATION
+
+
+
+class FolderSink(OutputSink):
+  """ Write each document to a file of its own (default output layout of EuroParlExtract). """
+
+  def _write(self, path, text):
+    with open(path, mode='w', encoding='utf-8') as fl:
+      fl.write(text)
+
+
+  def _discard(self, path):
+    if os.path.exists(path):
+      os.remove(path)
+
+
+  def list_documents(self, folder):
+    """ Return names of all documents in folder. """
+    return [fn for root, dirs, files in os.walk(folder) for fn in files]
+##### END OF CLASS DECLARATION
+
+
+
+class JSONLSink(OutputSink):
+  """ Write documents to sharded JSONL containers, one set of shards and one index file per output folder.
+
+  Containers are only appended to; documents that are rewritten or discarded are removed from the index, which maps
+  document names to 3-tuples (shard, byte offset, byte length). Index files are written upon method close().
+  Shards and index of a folder that already exist (e.g. from a previous run) are continued.
+
+  Attributes:
+    max_shard_size (int) -- Size in bytes at which a new shard is started.
+    folders (dict) -- Keys: output folders; values: dictionaries holding the index, the number and the file object of the current shard.
+
+  """
+
+  process_safe = False
+  index_filename = 'documents.index'
+
+  def __init__(self, max_shard_size=256 * 1024 * 1024):
+    OutputSink.__init__(self)
+    self.max_shard_size = max_shard_size
+    self.folders = {}
+
+
+  @staticmethod
+  def shard_filename(number):
+    return 'documents.%05d.jsonl' %(number)
+
+
+  def folder(self, folder):
+    """ Return state of output folder, loading its index if it already exists. """
+    folder = os.path.normpath(folder) # Paths of documents and folders may differ in trailing or duplicate slashes
+    state = self.folders.get(folder)
+    if state is None:
+      index = {}
+      index_path = os.path.join(folder, self.index_filename)
+      if os.path.exists(index_path):
+        with open(index_path, 'rt', encoding='utf-8') as fl:
+          for line in fl:
+            name, shard, offset, length = line.rstrip('\n').split('\t')
+            index[name] = (shard, int(offset), int(length))
+      shard_number = 0
+      while os.path.exists(os.path.join(folder, self.shard_filename(shard_number + 1))):
+        shard_number += 1
+      state = self.folders[folder] = {'index': index, 'shard': shard_number, 'file': None}
+    return state
+
+
+  def _write(self, path, text):
+    folder, name = os.path.split(path)
+    state = self.folder(folder)
+    if state['file'] is None:
+      os.makedirs(folder, exist_ok=True)
+      state['file'] = open(os.path.join(folder, self.shard_filename(state['shard'])), 'ab') # Appending continues existing shard
+    if state['file'].tell() >= self.max_shard_size:
+      state['file'].close()
+      state['shard'] += 1
+      state['file'] = open(os.path.join(folder, self.shard_filename(state['shard'])), 'ab')
+    record = (json.dumps({'id': name, 'text': text}, ensure_ascii=False) + '\n').encode('utf-8')
+    offset = state['file'].tell()
+    state['file'].write(record)
+    state['index'][name] = (self.shard_filename(state['shard']), offset, len(record))
+
+
+  def _discard(self, path):
+    folder, name = os.path.split(path)
+    self.folder(folder)['index'].pop(name, None)
+
+
+  def list_documents(self, folder):
+    """ Return names of all documents in folder. """
+    return list(self.folder(folder)['index'])
+
+
+  def read(self, path):
+    """ Return text of document path. """
+    folder, name = os.path.split(path)
+    state = self.folder(folder)
+    shard, offset, length = state['index'][name]
+    if state['file'] is not None:
+      state['file'].flush()
+    with open(os.path.join(folder, shard), 'rb') as fl:
+      fl.seek(offset)
+      return json.loads(fl.read(length).decode('utf-8'))['text']
+
+
+  def close(self):
+    """ Close current shards and write index files (atomically, via temporary files). """
+    for folder, state in self.folders.items():
+      if state['file'] is not None:
+        state['file'].close()
+        state['file'] = None
+      if not os.path.isdir(folder):
+        continue
+      index_path = os.path.join(folder, self.index_filename)
+      with open(index_path + '.tmp', 'wt', encoding='utf-8') as fl:
+        for name in sorted(state['index']):
+          shard, offset, length = state['index'][name]
+          fl.write('%s\t%s\t%d\t%d\n' %(name, shard, offset, length))
+      os.replace(index_path + '.tmp', index_path)
+##### END OF CLASS DECLARATION
+
+
+
+def create_output_sink(kind):
+  """ Create output sink of the given kind (one of OUTPUT_SINKS). """
+  if kind == 'jsonl':
+    return JSONLSink()
+  return FolderSink()
+##### END OF FUNCTION DECLARATION
@@ -0,0 +1,1012 @@
+'''
+Generation of the list of speaker turns (statements) from EuroParl source files.
+
+Metadata of each speaker turn (speaker names and language tags) is collected across all
+language versions of a EuroParl source file. Counters are accumulated in plain dictionaries
+and the data frame speaker_list is created only once, after all source files have been read.
+
+Usage:
+
+  builder = StatementListBuilder()
+  for inputfile in europarl_sourcefiles:
+    analyse_sourcefile(inputfile, builder)
+  speaker_list = builder.to_dataframe()
+
+Source files can be scanned by several worker processes; the partial counters of each file are
+then merged in the order of the source files, so that the result is identical to a serial scan:
+
+  builder = StatementListBuilder()
+  for inputfile, turns, offsets in scan_sourcefiles(europarl_sourcefiles, jobs=8):
+    builder.merge(turns)
+
+Partial counters can be stored together with a fingerprint (size and modification time) of each source file
+in a SourceFileCache, so that subsequent runs only rescan new or changed source files.
+
+While scanning, the byte offsets of each speaker turn are recorded in a SpeakerTurnIndex. Extraction functions
+open source files with open_sourcefile(inputfile, ids, turn_index), which reads only the speaker turns needed.
+Function read_statements(inputfile, ids, turn_index) returns the lines of these speaker turns; a StatementCache keeps
+the statements of recently read source files in memory (up to a maximum size), e.g. to reuse the statements of a
+source language file for all target languages:
+
+  cache = StatementCache(64 * 1024 * 1024, turn_index)
+  statements = cache.get('txt/de/ep-09-10-22-009.txt', ['158', '159']) # [('158', [lines], 'tag'), ...]
+
+Function assemble_statement(lines) turns the lines of a statement into the list of sentences and paragraph marks
+used for sentence alignment.
+
+The statement list can be saved as tab-separated CSV file or in one of two binary formats that preserve
+native types (dictionaries of counts, categorical SL and NAMES_MATCHING columns):
+  - parquet (requires package pyarrow); single columns can be loaded without reading the whole file.
+  - pickle (fallback if pyarrow is not installed).
+  - sqlite; a database with indexes on SL, NAMES_MATCHING, session date and session (file), which can be queried with
+    class StatementStore without loading the whole list, e.g. by several concurrent extraction jobs:
+
+      store = StatementStore('europarl_statements.sqlite')
+      statements = store.select('DE') # {'11-04-06-009': ['158', ...], ...}
+      statements = store.select('DE', SessionFilter(date_from='2004-07-20', date_to='2009-05-07'))
+
+Function load_statement_list(path) detects the format of a statement list automatically. Class CSVStatementStore selects
+statements from a CSV statement list like StatementStore, without loading the list into a data frame.
+
+Package pandas is only imported by the functions that create, save or load data frames.
+
+'''
+
+import io
+import os
+import re
+import sys
+import csv
+import json
+import pickle
+import sqlite3
+from collections import OrderedDict
+from multiprocessing import Pool
+from tag_scanner import scan_tag, is_metadata_tag, speakerTurnPattern
+
+
+##############################################
+########## DEFINE REGEX PATTERNS FOR METADATA
+# XML metadata tags are matched by function scan_tag(line) of module tag_scanner
+# Language abbreviation codes, grouped for retrieval: language code in parenthesis
+# with optional space between code and parenthesis
+langcode = re.compile (r"\( ?(BG|CS|DA|DE|EL|EN|ES|ET|FI|FR|GA|\
+                        HU|IT|LT|LV|MT|NL|PL|PT|RO|SK|SV|SL) ?\)")
+# In some Slavic languages, "ES" followed by certain pattern is abbreviation of "European Union"
+# rather than Spanish language code. These exceptions are defined in langcode_exception
+langcode_exception = re.compile(r'(\( ?ES ?\)( št\.? | \d{1,4} ?/| ?,? \(? ?č| Nr))')
+##### DEFINITION OF REGEX-PATTERNS COMPLETED
+############################################
+
+STATEMENT_LIST_COLUMNS = ('NAMES_FULL_COUNT', 'NAMES_NORMALISED_SUMMARY', 'NAMES_MATCHING', 'ORIGINAL_LANGUAGE', 'SL', 'ADDITIONAL_LANGUAGE')
+COUNTER_COLUMNS = ('NAMES_FULL_COUNT', 'NAMES_NORMALISED_SUMMARY', 'ORIGINAL_LANGUAGE', 'ADDITIONAL_LANGUAGE') # Columns holding dictionaries of counts
+CATEGORICAL_COLUMNS = ('NAMES_MATCHING', 'SL') # Columns stored as categoricals in binary formats
+STATEMENT_LIST_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'pickle': '.pkl', 'sqlite': '.sqlite'}
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+
+
+def session_date(filename_base):
+  """ Determine date of parliamentary session from basename of EuroParl source file.
+
+  Arguments:
+    filename_base (str) -- Basename of source file without prefix 'ep-', e.g. 09-10-22-009 or 00-01-17.
+
+  Returns:
+    date (str) -- Session date in ISO format, e.g. 2009-10-22 (sessions from 1996 to 1999 have years 96 to 99).
+
+  """
+  year, month, day = filename_base.split('-')[:3]
+  century = '19' if int(year) > 90 else '20'
+  return '%s%s-%s-%s' %(century, year, month, day)
+##### END OF FUNCTION DECLARATION
+
+
+
+class SessionFilter(object):
+  """ Selection of parliamentary sessions by date range and/or basenames of source files.
+
+  Attributes:
+    date_from (str) -- First session date to be selected in ISO format (e.g. 2009-10-01), or None.
+    date_to (str) -- Last session date to be selected in ISO format (e.g. 2009-10-31), or None.
+    sessions (frozenset) -- Basenames of source files to be selected (e.g. 09-10-22-009), or None.
+
+  """
+
+  def __init__(self, date_from=None, date_to=None, files=None):
+    self.date_from = date_from
+    self.date_to = date_to
+    # Files may be given as paths, filenames (ep-09-10-22-009.txt) or basenames (09-10-22-009)
+    self.sessions = None if files is None else frozenset(self.basename(fn) for fn in files)
+
+
+  def __bool__(self):
+    return self.date_from is not None or self.date_to is not None or self.sessions is not None
+
+
+  def __contains__(self, filename_base):
+    if self.sessions is not None and filename_base not in self.sessions:
+      return False
+    if self.date_from is not None or self.date_to is not None:
+      date = session_date(filename_base)
+      if self.date_from is not None and date < self.date_from:
+        return False
+      if self.date_to is not None and date > self.date_to:
+        return False
+    return True
+
+
+  @staticmethod
+  def basename(filename):
+    filename = os.path.basename(filename)
+    if filename.endswith('.txt'):
+      filename = filename[:-len('.txt')]
+    if filename.startswith('ep-'):
+      filename = filename[len('ep-'):]
+    return filename
+
+
+  def sourcefiles(self, sourcefiles):
+    """ Return the paths of those source files in sourcefiles which belong to a selected session. """
+    return [inputfile for inputfile in sourcefiles if self.basename(inputfile) in self]
+##### END OF CLASS DECLARATION
+
+
+
+class StatementListBuilder(object):
+  """ Accumulate metadata counters of speaker turns and convert them to data frame speaker_list in one go.
+
+  Attributes:
+    turns (dict) -- Counters of all speaker turns in order of first occurrence.
+      Dictionary keys: Unique IDs of speaker turns (e.g. 11-04-06-009|158).
+      Dictionary values: 3-tuples of dictionaries (NAMES_FULL_COUNT, ORIGINAL_LANGUAGE, ADDITIONAL_LANGUAGE),
+        each holding names or language codes as keys and their counts across all language files as values.
+
+  """
+
+  def __init__(self):
+    self.turns = {}
+
+
+  def __len__(self):
+    return len(self.turns)
+
+
+  def add_turn(self, unique_file_id, name, lang, additional_lang_tag):
+    """ Update counters of a speaker turn with the metadata found in one source file.
+
+    Arguments:
+      unique_file_id (str) -- Unique ID of speaker turn, i.e. basename of source file and speaker ID separated by '|'.
+      name (str) -- Name of speaker, or empty string if no name was found.
+      lang (str) -- Language code from XML metadata tag, or empty string.
+      additional_lang_tag (str) -- Language code in parenthesis from line following the XML metadata tag, or empty string.
+
+    Returns:
+      Nothing; instead, it updates the counters in self.turns.
+
+    """
+    counters = self.turns.get(unique_file_id)
+    if counters is None:
+      counters = self.turns[unique_file_id] = ({}, {}, {})
+    names_full_count, original_language, additional_language = counters
+    if len(name) > 0:
+      names_full_count[name] = names_full_count.get(name, 0) + 1
+    if len(lang) > 0:
+      original_language[lang] = original_language.get(lang, 0) + 1
+    if len(additional_lang_tag) > 0:
+      additional_language[additional_lang_tag] = additional_language.get(additional_lang_tag, 0) + 1
+  ##### END OF METHOD DECLARATION
+
+
+  def merge(self, turns):
+    """ Add partial counters of speaker turns (e.g. those of a single source file) to the counters of the builder.
+
+    Arguments:
+      turns (dict) -- Partial counters in the format of attribute turns, e.g. as returned by function scan_sourcefile(inputfile).
+
+    Returns:
+      Nothing; instead, it updates the counters in self.turns.
+
+    """
+    for unique_file_id, partial_counters in turns.items():
+      counters = self.turns.get(unique_file_id)
+      if counters is None:
+        counters = self.turns[unique_file_id] = ({}, {}, {})
+      for counter, partial_counter in zip(counters, partial_counters):
+        for key, count in partial_counter.items():
+          counter[key] = counter.get(key, 0) + count
+  ##### END OF METHOD DECLARATION
+
+
+  def to_dataframe(self):
+    """ Create data frame speaker_list from accumulated counters.
+
+    Returns:
+      speaker_list (:obj: 'pandas.DataFrame') -- One row per speaker turn, indexed by UNIQUE_ID. Columns NAMES_NORMALISED_SUMMARY,
+        NAMES_MATCHING and SL are left empty for post-processing.
+
+    """
+    import pandas as pd
+    records = [(names, {}, '', original, '', additional) for names, original, additional in self.turns.values()]
+    speaker_list = pd.DataFrame.from_records(records, index=list(self.turns.keys()), columns=STATEMENT_LIST_COLUMNS)
+    speaker_list.index.name = 'UNIQUE_ID'
+    return speaker_list
+  ##### END OF METHOD DECLARATION
+##### END OF CLASS DECLARATION
+
+
+
+class SourceFileCache(object):
+  """ Store partial counters and byte offsets of speaker turns per source file together with a fingerprint of the file.
+
+  The fingerprint consists of file size and modification time. Counters of a file are reused as long as its fingerprint
+  is unchanged; new or changed files have to be rescanned.
+
+  Attributes:
+    path (str) -- Path of the cache file.
+    entries (dict) -- Keys: paths of source files; values: 2-tuples (fingerprint, (turns, offsets)).
+
+  """
+
+  version = 2 # Increase whenever the format of partial counters changes, so that outdated cache files are discarded
+
+  def __init__(self, path):
+    self.path = path
+    self.entries = {}
+    if os.path.exists(path):
+      try:
+        with open(path, 'rb') as fl:
+          cache = pickle.load(fl)
+        if cache.get('version') == self.version:
+          self.entries = cache['entries']
+      except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+        self.entries = {}
+
+
+  @staticmethod
+  def fingerprint(inputfile):
+    stat = os.stat(inputfile)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+  def lookup(self, inputfile):
+    """ Return cached 2-tuple (turns, offsets) of inputfile, or None if the file is new or has changed since it was cached. """
+    entry = self.entries.get(inputfile)
+    if entry is not None and entry[0] == self.fingerprint(inputfile):
+      return entry[1]
+    return None
+
+
+  def update(self, inputfile, scan):
+    self.entries[inputfile] = (self.fingerprint(inputfile), scan)
+
+
+  def save(self, sourcefiles):
+    """ Write cache file, keeping only entries of the given source files (i.e. dropping files that no longer exist). """
+    sourcefiles = set(sourcefiles)
+    entries = {k: v for k, v in self.entries.items() if k in sourcefiles}
+    tmp = self.path + '.tmp'
+    with open(tmp, 'wb') as fl:
+      pickle.dump({'version': self.version, 'entries': entries}, fl, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, self.path)
+  ##### END OF METHOD DECLARATION
+##### END OF CLASS DECLARATION
+
+
+
+class SpeakerTurnIndex(object):
+  """ Index of byte offsets of speaker turns in EuroParl source files.
+
+  A speaker turn starts with its <SPEAKER> tag line and ends after the first subsequent XML metadata tag line (i.e. the tag at which
+  extraction of the turn stops), or at the end of the file. Reading only these byte ranges yields the same extraction results as
+  reading the whole file.
+
+  Attributes:
+    files (dict) -- Keys: 2-tuples (language folder, basename of source file), e.g. ('de', '11-04-06-009');
+      values: 2-tuples (fingerprint, offsets), where offsets maps speaker IDs to lists of (start, end) byte offsets.
+
+  """
+
+  version = 1
+
+  def __init__(self):
+    self.files = {}
+
+
+  def __len__(self):
+    return len(self.files)
+
+
+  @staticmethod
+  def key(inputfile):
+    lang = os.path.basename(os.path.dirname(inputfile)).lower()
+    filename_base = inputfile.split("/")[-1].split(".txt")[0].split("ep-")[1]
+    return (lang, filename_base)
+
+
+  def add(self, inputfile, offsets):
+    self.files[self.key(inputfile)] = (SourceFileCache.fingerprint(inputfile), offsets)
+
+
+  def ranges(self, inputfile, ids):
+    """ Return sorted, non-overlapping byte ranges covering all speaker turns ids in inputfile.
+
+    Arguments:
+      inputfile (str) -- Path to EuroParl source file.
+      ids (list) -- Speaker IDs of the turns to be read.
+
+    Returns:
+      ranges (list) -- 2-tuples (start, end) of byte offsets, or None if inputfile is not indexed or has changed since it was indexed.
+
+    """
+    entry = self.files.get(self.key(inputfile))
+    if entry is None or entry[0] != SourceFileCache.fingerprint(inputfile):
+      return None
+    offsets = entry[1]
+    ranges = []
+    for speaker_ID in set(ids):
+      ranges.extend(offsets.get(speaker_ID, ()))
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+      if merged and start <= merged[-1][1]:
+        merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+      else:
+        merged.append((start, end))
+    return merged
+  ##### END OF METHOD DECLARATION
+
+
+  def save(self, path):
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fl:
+      pickle.dump({'version': self.version, 'files': self.files}, fl, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+  @classmethod
+  def load(cls, path):
+    """ Load index from path; returns an empty index if the file is missing, corrupt or outdated. """
+    index = cls()
+    try:
+      with open(path, 'rb') as fl:
+        stored = pickle.load(fl)
+      if stored.get('version') == cls.version:
+        index.files = stored['files']
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError):
+      pass
+    return index
+  ##### END OF METHOD DECLARATION
+##### END OF CLASS DECLARATION
+
+
+
+class StatementStore(object):
+  """ Read-only access to a statement list saved in SQLite format (see function save_statement_list()).
+
+  Statements are selected by indexed queries, so that the statement list need not be loaded into memory. The database is
+  opened in read-only mode and can thus be shared by several concurrent extraction jobs.
+
+  Attributes:
+    path (str) -- Path of the SQLite database.
+    connection (:obj: 'sqlite3.Connection') -- Read-only connection to the database.
+
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self.connection = sqlite3.connect('file:%s?mode=ro' %(os.path.abspath(path)), uri=True)
+
+
+  def __len__(self):
+    return self.connection.execute('SELECT COUNT(*) FROM statements').fetchone()[0]
+
+
+  def select(self, sl, session_filter=None):
+    """ Select unambiguous statements (i.e. statements whose speaker could be determined) originally uttered in language sl.
+
+    Arguments:
+      sl (str) -- Two-letter source language code (upper case).
+      session_filter (:obj: 'SessionFilter') -- Optional selection of sessions by date range and/or source files.
+
+    Returns:
+      statements (dict) -- Keys: basenames of source files (e.g. 11-04-06-009); values: lists of speaker IDs in order of the statement list.
+
+    """
+    query = "SELECT SESSION, SPEAKER_ID FROM statements WHERE SL = ? AND NAMES_MATCHING IS NOT 'xAMB'"
+    parameters = [sl]
+    if session_filter is not None:
+      if session_filter.date_from is not None:
+        query += " AND SESSION_DATE >= ?"
+        parameters.append(session_filter.date_from)
+      if session_filter.date_to is not None:
+        query += " AND SESSION_DATE <= ?"
+        parameters.append(session_filter.date_to)
+      if session_filter.sessions is not None:
+        query += " AND SESSION IN (SELECT value FROM json_each(?))" # Avoids limit on number of query parameters
+        parameters.append(json.dumps(sorted(session_filter.sessions)))
+    statements = {}
+    rows = self.connection.execute(query + " ORDER BY rowid", parameters)
+    for session, speaker_ID in rows:
+      statements.setdefault(session, []).append(speaker_ID)
+    return statements
+  ##### END OF METHOD DECLARATION
+
+
+  def close(self):
+    self.connection.close()
+##### END OF CLASS DECLARATION
+
+
+
+class CSVStatementStore(object):
+  """ Selection of statements from a statement list saved in CSV format, without creating a data frame.
+
+  Only columns UNIQUE_ID, NAMES_MATCHING and SL are read. Statements are selected as by class StatementStore, so that
+  both can be used interchangeably.
+
+  Attributes:
+    path (str) -- Path of the CSV file.
+    statements (dict) -- Keys: source languages; values: lists of 2-tuples (session, speaker ID) of unambiguous statements in order of the statement list.
+    size (int) -- Number of statements in the statement list.
+
+  """
+
+  def __init__(self, path):
+    self.path = path
+    self.statements = {}
+    self.size = 0
+    with open(path, 'rt', encoding='utf-8', newline='') as fl:
+      rows = csv.reader(fl, delimiter='\t')
+      header = next(rows)
+      names_matching_column, sl_column = header.index('NAMES_MATCHING'), header.index('SL')
+      for row in rows:
+        self.size += 1
+        if row[names_matching_column] != "xAMB":
+          session, _, speaker_ID = row[0].partition('|')
+          self.statements.setdefault(row[sl_column], []).append((session, speaker_ID))
+
+
+  def __len__(self):
+    return self.size
+
+
+  def select(self, sl, session_filter=None):
+    """ Select unambiguous statements originally uttered in language sl (see method select() of class StatementStore). """
+    statements = {}
+    for session, speaker_ID in self.statements.get(sl, ()):
+      if not session_filter or session in session_filter:
+        statements.setdefault(session, []).append(speaker_ID)
+    return statements
+
+
+  def close(self):
+    pass
+##### END OF CLASS DECLARATION
+
+
+
+def select_from_statement_list(speaker_list, sl, session_filter=None):
+  """ Select unambiguous statements (i.e. statements whose speaker could be determined) originally uttered in language sl.
+
+  Arguments:
+    speaker_list (:obj: 'pandas.DataFrame') -- The statement list.
+    sl (str) -- Two-letter source language code (upper case).
+    session_filter (:obj: 'SessionFilter') -- Optional selection of sessions by date range and/or source files.
+
+  Returns:
+    statements (dict) -- Keys: basenames of source files (e.g. 11-04-06-009); values: lists of speaker IDs in order of the statement list.
+
+  """
+  unambiguous_statements = speaker_list[(speaker_list['SL'] == sl) & (speaker_list['NAMES_MATCHING'] != "xAMB")].index
+  statements = {}
+  for us in unambiguous_statements: # us = unambiguous statement
+    fname = us.split("|")[0]
+    id = us.split("|")[1]
+    if fname not in statements:
+      statements[fname] = [id]
+    else:
+      statements[fname].append(id)
+  # Restrict statements to selected sessions, so that other source files are never opened
+  if session_filter:
+    statements = {fname: ids for fname, ids in statements.items() if fname in session_filter}
+  return statements
+##### END OF FUNCTION DECLARATION
+
+
+
+def open_sourcefile(inputfile, ids, turn_index=None):
+  """ Open EuroParl source file for extraction of the speaker turns ids.
+
+  If turn_index holds up-to-date byte offsets of inputfile, only the byte ranges of the speaker turns ids are read (using seek())
+  and returned as in-memory text stream; otherwise, the whole file is opened. Both can be iterated linewise in the same way.
+
+  Arguments:
+    inputfile (str) -- Path to EuroParl source file.
+    ids (list) -- Speaker IDs of the turns to be extracted.
+    turn_index (:obj: 'SpeakerTurnIndex') -- Optional index of byte offsets.
+
+  Returns:
+    fl (:obj: 'io.TextIOBase') -- Text stream of (the relevant parts of) inputfile.
+
+  """
+  ranges = None if turn_index is None else turn_index.ranges(inputfile, ids)
+  if ranges is None:
+    return open(inputfile, 'rt', encoding='utf-8', errors='ignore')
+  chunks = []
+  with open(inputfile, 'rb') as fl:
+    for start, end in ranges:
+      fl.seek(start)
+      chunks.append(fl.read(end - start))
+  return io.TextIOWrapper(io.BytesIO(b''.join(chunks)), encoding='utf-8', errors='ignore')
+##### END OF FUNCTION DECLARATION
+
+
+
+def read_statements(inputfile, ids, turn_index=None):
+  """ Read the speaker turns ids from EuroParl source file.
+
+  A speaker turn comprises its <SPEAKER> tag line and all subsequent lines up to the next XML metadata tag (exclusive).
+
+  Arguments:
+    inputfile (str) -- Path to EuroParl source file.
+    ids (list) -- Speaker IDs of the turns to be extracted.
+    turn_index (:obj: 'SpeakerTurnIndex') -- Optional index of byte offsets (see function open_sourcefile()).
+
+  Returns:
+    statements (list) -- 3-tuples (speaker ID, lines, end) in the order of the source file; lines are stripped, end is 'tag' if the
+      turn is terminated by an XML metadata tag, 'turn' if it is terminated by the next wanted speaker turn and 'eof' if it
+      is terminated by the end of the file (the last line of which has no line break).
+
+  """
+  wanted_IDs = frozenset(ids)
+  search_speaker_turn = speakerTurnPattern.search # Local name avoids global lookup for each line
+  statements = []
+  lines = None # Lines of current speaker turn, or None outside wanted speaker turns
+  turnID = None
+  with open_sourcefile(inputfile, ids, turn_index) as fl:
+    current_line = None
+    for line in fl:
+      next_line = line.strip()
+      if current_line is not None:
+        turnMatch = search_speaker_turn(current_line)
+        statementID = turnMatch.group(1) if turnMatch is not None else None
+        if statementID in wanted_IDs:
+          if lines is not None:
+            statements.append((turnID, lines, 'turn'))
+          turnID = statementID
+          lines = [current_line]
+        elif lines is not None:
+          lines.append(current_line)
+        if lines is not None and is_metadata_tag(next_line):
+          statements.append((turnID, lines, 'tag'))
+          lines = None
+      current_line = next_line
+    if lines is not None:
+      lines.append(current_line)
+      statements.append((turnID, lines, 'eof'))
+  return statements
+##### END OF FUNCTION DECLARATION
+
+
+
+def subset_statements(statements, ids):
+  """ Restrict statements read by function read_statements(inputfile, all_ids) to the speaker turns ids (a subset of all_ids).
+
+  The result equals that of read_statements(inputfile, ids): a turn that was terminated by a turn not in ids (end 'turn')
+  is continued with the lines of that turn, as if the latter had not been wanted.
+
+  Arguments:
+    statements (list) -- 3-tuples (speaker ID, lines, end) returned by function read_statements().
+    ids (set) -- Speaker IDs of the turns to be kept.
+
+  Returns:
+    statements (list) -- 3-tuples (speaker ID, lines, end) of the turns ids.
+
+  """
+  subset = []
+  open_turn = False # True if last kept turn was terminated by a turn that is not kept
+  for statementID, lines, end in statements:
+    if statementID in ids:
+      subset.append((statementID, lines, end))
+    elif open_turn:
+      previousID, previous_lines, _ = subset[-1]
+      subset[-1] = (previousID, previous_lines + lines, end)
+    else:
+      continue
+    open_turn = end == 'turn'
+  return subset
+##### END OF FUNCTION DECLARATION
+
+
+
+def assemble_statement(lines):
+  """ Assemble the sentence list of a statement for sentence alignment in a single pass over its lines.
+
+  Arguments:
+    lines (list) -- Lines of the statement, starting with its speaker tag (see function read_statements()).
+
+  Returns:
+    metadata (str) -- The speaker tag.
+    sentences (list) -- Sentences of the statement enclosed in paragraph marks <P>, without adjacent duplicate paragraph marks.
+    paragraphs (int) -- Number of paragraph marks in sentences.
+
+  """
+  sentences = ['<P>']
+  append = sentences.append
+  previous = '<P>'
+  paragraphs = 1
+  for i in range(1, len(lines)):
+    line = lines[i]
+    if line == '<P>':
+      if previous == '<P>': # Skip adjacent paragraph marks
+        continue
+      paragraphs += 1
+    append(line)
+    previous = line
+  if previous != '<P>':
+    append('<P>')
+    paragraphs += 1
+  return lines[0], sentences, paragraphs
+##### END OF FUNCTION DECLARATION
+
+
+
+class StatementCache(object):
+  """ Keep the speaker turns read from recently used source files in memory, up to a maximum size.
+
+  Entries are keyed by source file (i.e. by language and session) and evicted in least-recently-used order
+  once the estimated size of all cached lines exceeds max_size.
+
+  Attributes:
+    max_size (int) -- Maximum size of cached statements in bytes; 0 disables caching.
+    turn_index (:obj: 'SpeakerTurnIndex') -- Optional index of byte offsets passed on to function read_statements().
+    entries (:obj: 'OrderedDict') -- Keys: paths of source files; values: 3-tuples (ids, statements, size).
+    size (int) -- Estimated size of all cached statements in bytes.
+    hits, misses (int) -- Number of lookups served from / not found in the cache.
+
+  """
+
+  def __init__(self, max_size, turn_index=None):
+    self.max_size = max_size
+    self.turn_index = turn_index
+    self.entries = OrderedDict()
+    self.size = 0
+    self.hits = 0
+    self.misses = 0
+
+
+  def get(self, inputfile, ids):
+    """ Return statements ids of inputfile (see function read_statements()), reading the file only if it is not cached.
+    Statements are also served from the cache if they are a subset of the cached statements (see function subset_statements()). """
+    ids = frozenset(ids)
+    entry = self.entries.get(inputfile)
+    if entry is not None and ids <= entry[0]:
+      self.hits += 1
+      self.entries.move_to_end(inputfile)
+      return entry[1] if ids == entry[0] else subset_statements(entry[1], ids)
+    self.misses += 1
+    statements = read_statements(inputfile, ids, self.turn_index)
+    if entry is not None:
+      del self.entries[inputfile]
+      self.size -= entry[2]
+    size = sys.getsizeof(statements) + sum(sys.getsizeof(line) for statementID, lines, end in statements for line in lines)
+    if size <= self.max_size:
+      self.entries[inputfile] = (ids, statements, size)
+      self.size += size
+      while self.size > self.max_size:
+        evicted_ids, evicted_statements, evicted_size = self.entries.popitem(last=False)[1]
+        self.size -= evicted_size
+    return statements
+##### END OF CLASS DECLARATION
+
+
+
+def analyse_sourcefile(inputfile, builder):
+  """ Extract metadata from EuroParl source file and pass it to function write_metadata_to_df(tag, next_line, filename_base, builder).
+
+  Arguments:
+    inputfile (str) -- Path to input file.
+    builder (:obj: 'StatementListBuilder') -- Accumulator of speaker turn counters.
+
+  Returns:
+    offsets (dict) -- Byte offsets of speaker turns in inputfile; keys: speaker IDs, values: lists of (start, end) offsets (see class SpeakerTurnIndex).
+    Besides, it calls function write_metadata_to_df(tag, next_line, filename_base, builder) to add metadata to builder.
+
+  """
+  filename_base = inputfile.split("/")[-1].split(".txt")[0].split("ep-")[1] # basename of the input file, i.e. truncate folder path and prefix 'ep' and suffix '.txt' from filename
+
+  # Loop over input file line-by-line; each line is scanned only once for XML metadata tags (see function scan_tag(line)).
+  # To avoid EOF errors, reading file line by line looks behind instead of looking ahead:
+  # the tag of the previous line is stored as prev_tag and its metadata is written once the following line has been read.
+  prev_tag = None
+  offsets = {}
+  open_turns = [] # Speaker IDs and start offsets of speaker turns whose end has not been reached yet
+  position = 0 # Byte offset of current line
+
+  # File is read in binary mode to keep track of byte offsets; lines are decoded one by one
+  with open(inputfile, 'rb') as fl:
+    # Loop over entire input file, extract SpeakerIDs and language codes (the latter happens in write_metadata_to_df)
+    for raw_line in fl:
+      line = raw_line.decode('utf-8', errors='ignore').strip() # flag errors='ignore' is used in order to prevent program terminating upon encoding errors (one such error can be found in file /txt/pl/ep-09-10-22-009.txt)
+      if line[:1] == '<': # Only lines starting with '<' can be XML metadata tags
+        tag = scan_tag(line)
+        # A speaker turn ends after the first XML metadata tag following its speaker tag
+        if open_turns and is_metadata_tag(line):
+          for speaker_ID, start in open_turns:
+            offsets.setdefault(speaker_ID, []).append((start, position + len(raw_line)))
+          open_turns = []
+        if tag is not None and tag.extractable:
+          open_turns.append((tag.ID, position))
+      else:
+        tag = None
+      position += len(raw_line)
+
+      if prev_tag is not None and prev_tag.kind == 'SPEAKER':
+        write_metadata_to_df(prev_tag, line, filename_base, builder)
+      prev_tag = tag
+
+    # After reaching the last line of file (stored as prev_tag), check once again whether there is a speaker tag in last line.
+    # This time, next_line is empty because it is the end of file, therefore we pass '' to function write_metadata_to_df().
+    if prev_tag is not None and prev_tag.kind == 'SPEAKER':
+      write_metadata_to_df(prev_tag, '', filename_base, builder)
+  for speaker_ID, start in open_turns:
+    offsets.setdefault(speaker_ID, []).append((start, position))
+  return offsets
+##### END OF FUNCTION DECLARATION
+
+
+
+def write_metadata_to_df(tag, nextline, filename_base, builder):
+  """ Write metadata identified within function analyse_sourcefile(fn, builder) to the counters of the statement list builder.
+
+  Arguments:
+    tag (:obj: 'TagRecord') -- Metadata of the speaker tag in the current line of EuroParl source file being read by function analyse_sourcefile(fn, builder).
+    nextline (str) -- Next line of EuroParl source file being read by function analyse_sourcefile(fn, builder).
+    filename_base (str) -- Basename of EuroParl source file.
+    builder (:obj: 'StatementListBuilder') -- Accumulator of speaker turn counters.
+
+  Returns:
+    Nothing; instead, it adds metadata to the counters of builder, which are converted to data frame speaker_list once all files are read.
+
+  """
+  unique_file_id = filename_base + "|" + tag.ID
+  # If speaker name is found in XML tag, retrieve it from the tag record.
+  # Names are normalised during post-processing of the statement list (see function group_speakers(all_name_forms)).
+  if tag.name is not None:
+    name = tag.name.partition('(')[0].strip()
+  else:
+    name = ""
+
+  if tag.language is not None:
+    lang = tag.language
+  else:
+    lang = ""
+
+  # Search additional language tag (a two-letter uppercase code in parenthesis) in line following
+  # the current line containing XML metadata tag.
+  additional_lang_tag = langcode.search(nextline)
+
+  #  Make sure no language code exception of type "(ES) Nr. 123" in line following XML tag is mistakingly taken as language code
+  #  where, in fact, (ES) is only an abbreviation for European Commission in several Slavic languages (eg. CS, SK).
+  if additional_lang_tag and not langcode_exception.search(nextline):
+    additional_lang_tag = additional_lang_tag.group(1)
+  else:
+    additional_lang_tag = ""
+
+  builder.add_turn(unique_file_id, name, lang, additional_lang_tag)
+### END OF FUNCTION DECLARATION
+
+
+
+def scan_sourcefile(inputfile):
+  """ Scan a single EuroParl source file and return the counters and byte offsets of its speaker turns.
+
+  Arguments:
+    inputfile (str) -- Path to input file.
+
+  Returns:
+    turns (dict) -- Partial counters of the speaker turns in inputfile (see attribute turns of class StatementListBuilder).
+    offsets (dict) -- Byte offsets of the speaker turns in inputfile (see function analyse_sourcefile(inputfile, builder)).
+
+  """
+  builder = StatementListBuilder()
+  offsets = analyse_sourcefile(inputfile, builder)
+  return builder.turns, offsets
+##### END OF FUNCTION DECLARATION
+
+
+
+def scan_sourcefiles(sourcefiles, jobs=1, cache=None):
+  """ Scan EuroParl source files, optionally distributed across several worker processes.
+
+  Arguments:
+    sourcefiles (list) -- Paths of input files.
+    jobs (int) -- Number of worker processes; 1 scans all files in the current process.
+    cache (:obj: 'SourceFileCache') -- Optional cache of partial counters; only files that are new or changed since they were cached are scanned,
+      and the cache is updated with their counters and offsets.
+
+  Returns:
+    Generator of 3-tuples (inputfile, turns, offsets) in the order of sourcefiles, where turns holds the partial counters and offsets
+    the byte offsets of the speaker turns in inputfile (see function scan_sourcefile(inputfile)).
+
+  """
+  cached = {}
+  if cache is not None:
+    for inputfile in sourcefiles:
+      scan = cache.lookup(inputfile)
+      if scan is not None:
+        cached[inputfile] = scan
+  files_to_scan = [inputfile for inputfile in sourcefiles if inputfile not in cached]
+
+  if jobs <= 1 or len(files_to_scan) < 2:
+    scanned = map(scan_sourcefile, files_to_scan)
+    pool = None
+  else:
+    # Results are returned in order of files_to_scan (imap), so that merging them yields the same order of speaker turns, names and language codes as a serial scan
+    chunksize = max(1, len(files_to_scan) // (jobs * 16))
+    pool = Pool(processes=jobs)
+    scanned = pool.imap(scan_sourcefile, files_to_scan, chunksize)
+
+  try:
+    for inputfile in sourcefiles:
+      if inputfile in cached:
+        scan = cached[inputfile]
+      else:
+        scan = next(scanned)
+        if cache is not None:
+          cache.update(inputfile, scan)
+      yield inputfile, scan[0], scan[1]
+  finally:
+    if pool is not None:
+      pool.terminate()
+      pool.join()
+##### END OF FUNCTION DECLARATION
+
+
+
+def save_statement_list(speaker_list, path, list_format='csv'):
+  """ Save data frame speaker_list to file.
+
+  Arguments:
+    speaker_list (:obj: 'pandas.DataFrame') -- The statement list.
+    path (str) -- Path of output file.
+    list_format (str) -- One of 'csv' (tab-separated), 'parquet', 'pickle' or 'sqlite'.
+
+  Returns:
+    list_format (str) -- The format actually written, i.e. 'pickle' if 'parquet' was requested but package pyarrow is not installed.
+
+  """
+  if list_format == 'csv':
+    speaker_list.to_csv(path, sep='\t', header=True, encoding='UTF-8')
+    return list_format
+  if list_format == 'sqlite':
+    save_statement_store(speaker_list, path)
+    return list_format
+
+  speaker_list = speaker_list.astype({column: 'category' for column in CATEGORICAL_COLUMNS})
+  if list_format == 'parquet':
+    try:
+      import pyarrow as pa
+      import pyarrow.parquet as pq
+    except ImportError:
+      list_format = 'pickle'
+  if list_format == 'pickle':
+    speaker_list.to_pickle(path)
+    return list_format
+
+  # Dictionaries of counts are stored as parquet maps, since pyarrow would otherwise convert them to structs with one field per key
+  arrays = [pa.array(speaker_list.index, type=pa.string())]
+  for column in STATEMENT_LIST_COLUMNS:
+    if column in COUNTER_COLUMNS:
+      arrays.append(pa.array([list(counter.items()) for counter in speaker_list[column]], type=pa.map_(pa.string(), pa.int64())))
+    else:
+      arrays.append(pa.array(speaker_list[column]))
+  pq.write_table(pa.Table.from_arrays(arrays, names=[speaker_list.index.name] + list(STATEMENT_LIST_COLUMNS)), path)
+  return list_format
+##### END OF FUNCTION DECLARATION
+
+
+
+def save_statement_store(speaker_list, path):
+  """ Save data frame speaker_list as SQLite database with indexes for the selection of statements.
+
+  Besides the columns of speaker_list, table statements holds the basename of the source file (SESSION), the session date
+  in ISO format (SESSION_DATE) and the speaker ID (SPEAKER_ID) of each statement. Dictionaries of counts are stored as JSON.
+  The database is written to a temporary file first, so that concurrent readers never see an incomplete database.
+
+  Arguments:
+    speaker_list (:obj: 'pandas.DataFrame') -- The statement list.
+    path (str) -- Path of output file.
+
+  """
+  import pandas as pd
+  rows = []
+  for unique_file_id, row in zip(speaker_list.index, speaker_list.itertuples(index=False, name=None)):
+    session, _, speaker_ID = unique_file_id.partition('|')
+    values = [json.dumps(value, ensure_ascii=False) if column in COUNTER_COLUMNS else (None if pd.isna(value) else value)
+              for column, value in zip(STATEMENT_LIST_COLUMNS, row)]
+    rows.append([unique_file_id, session, session_date(session), speaker_ID] + values)
+
+  tmp = path + '.tmp'
+  if os.path.exists(tmp):
+    os.remove(tmp)
+  connection = sqlite3.connect(tmp)
+  try:
+    columns = ['UNIQUE_ID TEXT PRIMARY KEY', 'SESSION TEXT', 'SESSION_DATE TEXT', 'SPEAKER_ID TEXT'] + ['%s TEXT' %(column) for column in STATEMENT_LIST_COLUMNS]
+    connection.execute('CREATE TABLE statements (%s)' %(', '.join(columns)))
+    connection.executemany('INSERT INTO statements VALUES (%s)' %(', '.join('?' * len(columns))), rows)
+    for column in ('SL', 'NAMES_MATCHING', 'SESSION_DATE', 'SESSION'):
+      connection.execute('CREATE INDEX idx_%s ON statements (%s)' %(column.lower(), column))
+    connection.commit()
+  finally:
+    connection.close()
+  os.replace(tmp, path)
+##### END OF FUNCTION DECLARATION
+
+
+
+def detect_statement_list_format(path):
+  """ Determine format of statement list from the first bytes of the file.
+
+  Returns:
+    list_format (str) -- One of 'parquet', 'pickle', 'sqlite' or 'csv'.
+
+  """
+  with open(path, 'rb') as fl:
+    magic = fl.read(len(SQLITE_MAGIC))
+  if magic == SQLITE_MAGIC:
+    return 'sqlite'
+  if magic[:4] == b'PAR1':
+    return 'parquet'
+  if magic[:1] == b'\x80':
+    return 'pickle'
+  return 'csv'
+##### END OF FUNCTION DECLARATION
+
+
+
+def load_statement_list(path, columns=None):
+  """ Load statement list from a file in any of the formats written by function save_statement_list().
+
+  Arguments:
+    path (str) -- Path of statement list.
+    columns (list) -- Names of columns to be loaded (the index UNIQUE_ID is always loaded); None loads all columns.
+      In CSV files, all values are loaded as strings.
+
+  Returns:
+    speaker_list (:obj: 'pandas.DataFrame') -- The statement list, with columns SL and NAMES_MATCHING as categoricals.
+
+  """
+  import pandas as pd
+  list_format = detect_statement_list_format(path)
+  if list_format == 'csv':
+    with open(path, 'rt', encoding='utf-8') as fl:
+      header = fl.readline().rstrip('\n').split('\t')
+    usecols = None if columns is None else [0] + [header.index(column) for column in columns]
+    speaker_list = pd.read_csv(path, sep='\t', dtype=str, index_col=0, usecols=usecols)
+  elif list_format == 'sqlite':
+    selected = STATEMENT_LIST_COLUMNS if columns is None else columns
+    store = StatementStore(path)
+    try:
+      speaker_list = pd.read_sql_query('SELECT UNIQUE_ID, %s FROM statements ORDER BY rowid' %(', '.join(selected)), store.connection, index_col='UNIQUE_ID')
+    finally:
+      store.close()
+    for column in speaker_list.columns:
+      if column in COUNTER_COLUMNS:
+        speaker_list[column] = [json.loads(counter) for counter in speaker_list[column]]
+  elif list_format == 'pickle':
+    speaker_list = pd.read_pickle(path)
+    if columns is not None:
+      speaker_list = speaker_list[list(columns)]
+  else:
+    import pyarrow.parquet as pq
+    index_column = pq.read_schema(path).names[0]
+    table = pq.read_table(path, columns=None if columns is None else [index_column] + list(columns))
+    speaker_list = table.to_pandas().set_index(index_column)
+    for column in speaker_list.columns:
+      if column in COUNTER_COLUMNS:
+        speaker_list[column] = [dict(counter) for counter in speaker_list[column]]
+
+  return speaker_list.astype({column: 'category' for column in CATEGORICAL_COLUMNS if column in speaker_list.columns})
+##### END OF FUNCTION DECLARATION
@@ -0,0 +1,78 @@
+'''
+Single-pass scanner for XML metadata tags in EuroParl source files.
+
+Fewer than 1% of all lines in EuroParl source files are metadata tags. Function scan_tag(line) therefore first checks
+cheaply whether a line starts with '<' (callers looping over many lines can do so before calling scan_tag) and only matches tag lines against one combined regex pattern, which retrieves
+chapter IDs, speaker IDs, speaker names and language codes in one go and returns them as TagRecord.
+
+Usage:
+
+  tag = scan_tag('<SPEAKER ID="158" LANGUAGE="DE" NAME="Hans Müller">')
+  tag.kind, tag.ID, tag.name, tag.language # ('SPEAKER', '158', 'Hans Müller', 'DE')
+
+'''
+
+import re
+from collections import namedtuple
+
+
+##############################################
+########## DEFINE COMBINED REGEX PATTERN FOR METADATA TAGS
+# Named groups:
+#   chapter  -- ID of <CHAPTER> tag
+#   speaker  -- ID of <SPEAKER> tag (optional x captures inserted language IDs)
+#   space    -- space following speaker ID; extraction functions only match speaker tags of this form
+#   language -- first LANGUAGE attribute with two-letter code, if any
+#   name     -- first NAME attribute, if any
+speakerIDPattern = r'SPEAKER ID="?(?P<speaker>x?\d+(?:_\d{3})?)"?'
+tagPattern = re.compile(r'<(?:CHAPTER ID="?(?P<chapter>[\d_]+)"?'
+                        r'|' + speakerIDPattern + r'(?P<space> )?'
+                        r'(?=(?:.*?LANGUAGE="(?P<language>\w{2})")?)'
+                        r'(?=(?:.*?NAME="(?P<name>[^"]*)")?))')
+# Speaker tags opening extractable speaker turns (speaker ID followed by a space), without attributes.
+# Used by the extraction functions, which look up group 1 (the speaker ID) in a set of wanted speaker IDs; this is equivalent to
+# searching regex pattern <SPEAKER ID="?(id1|id2|...)"? but does not depend on the number of wanted IDs.
+speakerTurnPattern = re.compile(r'<' + speakerIDPattern + r' ')
+##### DEFINITION OF REGEX-PATTERNS COMPLETED
+############################################
+
+# kind: 'CHAPTER' or 'SPEAKER'; ID: chapter or speaker ID; name, language: attributes of speaker tags or None;
+# extractable: True if speaker ID is followed by a space, i.e. if the speaker turn can be retrieved by the extraction functions
+TagRecord = namedtuple('TagRecord', ['kind', 'ID', 'name', 'language', 'extractable'])
+
+
+
+def scan_tag(line):
+  """ Retrieve metadata from a chapter or speaker tag.
+
+  Arguments:
+    line (str) -- Stripped line of EuroParl source file.
+
+  Returns:
+    tag (:obj: 'TagRecord') -- Metadata of the tag, or None if line is no chapter or speaker tag.
+
+  """
+  if line[:1] != '<': # Cheaper than str.startswith()
+    return None
+  match = tagPattern.match(line)
+  if match is None:
+    return None
+  chapter, speaker, space, language, name = match.groups()
+  if chapter is not None:
+    return TagRecord('CHAPTER', chapter, None, None, False)
+  return TagRecord('SPEAKER', speaker, name, language, space is not None)
+##### END OF FUNCTION DECLARATION
+
+
+
+def is_metadata_tag(line):
+  """ Check whether stripped line is an XML metadata tag other than a paragraph mark (equivalent to regex ^<[^P].*>$). """
+  return len(line) > 2 and line[0] == '<' and line[1] != 'P' and line[-1] == '>'
+##### END OF FUNCTION DECLARATION
+
+
+
+def is_xml_line(line):
+  """ Check whether stripped line consists of an XML tag, including paragraph marks (equivalent to regex ^<.+>$). """
+  return len(line) > 2 and line[0] == '<' and line[-1] == '>'
+##### END OF FUNCTION DECLARATION